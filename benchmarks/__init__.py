@@ -0,0 +1,7 @@
+"""
+benchmarks
+Benchmarks y herramientas de comparación del Normalizador de Leads
+
+Ejecutar desde la raíz del proyecto, por ejemplo:
+    python -m benchmarks.bench_url_categorizer
+"""
@@ -0,0 +1,156 @@
+"""
+bench_arranque.py
+Costo de arranque de las estructuras de reglas: construirlas desde config y el
+diccionario contra cargarlas de un snapshot en disco (pickle o marshal) más la
+firma (hash de config.py y del diccionario) que un snapshot necesita para saber
+si sigue vigente
+
+Con estas mediciones se decidió no implementar el snapshot: construir es más
+rápido en todos los tamaños. La decisión y los números están en README.md.
+
+Uso:
+    python -m benchmarks.bench_arranque [entradas_por_seccion ...]    (por defecto 1000 20000 100000)
+"""
+
+import hashlib
+import marshal
+import os
+import pickle
+import subprocess
+import sys
+
+from src import config
+from src.clasificador_grados import ClasificadorGrados
+from src.form_mapper import FormMapper
+from src.indice_canonico import IndiceCanonico
+from src.url_categorizer import URLCategorizer
+
+from .corpus import generar_diccionario
+from .generador_leads import cargar_diccionario
+from .utilidades import LoggerSilencioso, medir, formatear_tiempo
+
+
+TAMANIOS = [1_000, 20_000, 100_000]
+
+# Atributos que no forman parte de las reglas (se reciben al construir)
+ATRIBUTOS_EXTERNOS = {'config', 'logger', 'metricas'}
+
+
+def estado_serializable(objeto):
+    """
+    Atributos del objeto que se pueden guardar en un snapshot (sin config,
+    logger ni contadores de métricas, que se vuelven a enlazar al cargar)
+    """
+    estado = {}
+    for nombre, valor in vars(objeto).items():
+        if nombre in ATRIBUTOS_EXTERNOS:
+            continue
+        try:
+            pickle.dumps(valor)
+        except (TypeError, pickle.PicklingError, AttributeError):
+            continue
+        estado[nombre] = valor
+    return estado
+
+
+def restaurar(clase, estado):
+    """Objeto de la clase con el estado del snapshot, sin pasar por __init__"""
+    objeto = clase.__new__(clase)
+    objeto.__dict__.update(estado)
+    return objeto
+
+
+def firma(diccionario):
+    """Hash de config.py y del contenido del diccionario (la clave del snapshot)"""
+    h = hashlib.sha256()
+    with open(config.__file__, 'rb') as f:
+        h.update(f.read())
+    for nombre, seccion in diccionario.items():
+        h.update(nombre.encode('utf-8'))
+        h.update('\x00'.join(f"{k}\x01{v}" for k, v in seccion.items()).encode('utf-8'))
+    return h.hexdigest()
+
+
+def medir_estructura(nombre, construir, clase, diccionario, repeticiones):
+    """
+    Construcción contra carga del snapshot de una estructura
+
+    Returns:
+        Tupla (nombre, construir, pickle, marshal o None, bytes del snapshot)
+    """
+    t_construir, objeto = medir(construir, repeticiones)
+    estado = estado_serializable(objeto)
+    t_firma, _ = medir(lambda: firma(diccionario), repeticiones)
+
+    datos_pickle = pickle.dumps(estado, protocol=pickle.HIGHEST_PROTOCOL)
+    t_pickle, _ = medir(lambda: restaurar(clase, pickle.loads(datos_pickle)), repeticiones)
+
+    # marshal solo admite tipos básicos (sin patrones compilados ni objetos)
+    try:
+        datos_marshal = marshal.dumps(estado)
+    except ValueError:
+        t_marshal = None
+    else:
+        t_marshal, _ = medir(lambda: restaurar(clase, marshal.loads(datos_marshal)), repeticiones)
+        t_marshal += t_firma
+
+    return nombre, t_construir, t_pickle + t_firma, t_marshal, len(datos_pickle)
+
+
+def estructuras(diccionario):
+    """(nombre, función que construye, clase) de cada estructura de reglas"""
+    logger = LoggerSilencioso()
+    return [
+        ('URLCategorizer', lambda: URLCategorizer(config, logger), URLCategorizer),
+        ('FormMapper', lambda: FormMapper(config, logger), FormMapper),
+        ('ClasificadorGrados', lambda: ClasificadorGrados(config, logger), ClasificadorGrados),
+        ('IndiceCanonico colegios', lambda: IndiceCanonico(diccionario['colegios']), IndiceCanonico),
+    ]
+
+
+def medir_diccionario(titulo, diccionario, repeticiones):
+    """Imprime la tabla de una configuración del diccionario"""
+    entradas = sum(len(seccion) for seccion in diccionario.values())
+    print(f"\n{titulo} ({entradas:,} entradas)")
+    print(f"  {'Estructura':<26}{'construir':>11}{'pickle+firma':>14}{'marshal+firma':>15}{'snapshot':>11}")
+
+    for nombre, construir, clase in estructuras(diccionario):
+        nombre, t_construir, t_pickle, t_marshal, tamanio = medir_estructura(
+            nombre, construir, clase, diccionario, repeticiones
+        )
+        marshal_txt = formatear_tiempo(t_marshal) if t_marshal is not None else '-'
+        print(f"  {nombre:<26}{formatear_tiempo(t_construir):>11}{formatear_tiempo(t_pickle):>14}"
+              f"{marshal_txt:>15}{tamanio / 1024:>9.0f} KB")
+
+
+def tiempo_import(modulo, repeticiones=5):
+    """Mejor tiempo de un intérprete nuevo que importa el módulo (incluye el arranque de Python)"""
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    comando = [sys.executable, '-c', f"import time; t = time.perf_counter(); import {modulo}; print(time.perf_counter() - t)"]
+    return min(
+        float(subprocess.run(comando, cwd=raiz, capture_output=True, text=True, check=True).stdout)
+        for _ in range(repeticiones)
+    )
+
+
+def main():
+    tamanios = [int(valor) for valor in sys.argv[1:]] or TAMANIOS
+
+    print("Arranque: construir las reglas contra cargarlas de un snapshot")
+    print(f"  import src.config (intérprete nuevo): {formatear_tiempo(tiempo_import('src.config'))}")
+
+    diccionario_file = os.path.abspath(config.DICCIONARIO_FILE)
+    if os.path.exists(diccionario_file):
+        medir_diccionario("Diccionario real", cargar_diccionario(diccionario_file), repeticiones=20)
+
+    for entradas in tamanios:
+        medir_diccionario(f"Diccionario sintético de {entradas:,} por sección",
+                          generar_diccionario(entradas), repeticiones=5)
+
+    print("\nUn snapshot solo conviene si 'pickle+firma' o 'marshal+firma' es menor que 'construir'")
+    print("Decisión vigente: sin snapshot (ver benchmarks/README.md)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+bench_diccionario.py
+Benchmark de carga y guardado del diccionario de normalizaciones:
+json.load/json.dump completos contra carga perezosa por sección y
+escritura solo de las secciones que cambiaron
+
+Uso:
+    python -m benchmarks.bench_diccionario [entradas_por_seccion]
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+from src import diccionario_codec
+from src.diccionario_manager import DiccionarioManager
+
+from .corpus import generar_diccionario
+from .utilidades import LoggerSilencioso, medir, formatear_tiempo
+
+
+def cargar_original(archivo):
+    """Carga completa como lo hacía DiccionarioManager antes"""
+    with open(archivo, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def guardar_original(archivo, diccionario):
+    """Guardado completo como lo hacía DiccionarioManager antes"""
+    with open(archivo, 'w', encoding='utf-8') as f:
+        json.dump(diccionario, indent=2, ensure_ascii=False, fp=f)
+
+
+def nuevo_manager(carpeta, archivo):
+    """DiccionarioManager sin journal ni backups de por medio"""
+    return DiccionarioManager(archivo, os.path.join(carpeta, 'backups'), LoggerSilencioso())
+
+
+def cargar_colegios(carpeta, archivo):
+    """Carga perezosa usando solo la sección colegios"""
+    diccionario = nuevo_manager(carpeta, archivo).cargar_diccionario()
+    return len(diccionario['colegios'])
+
+
+def cargar_todo(carpeta, archivo):
+    """Carga perezosa accediendo a todas las secciones"""
+    diccionario = nuevo_manager(carpeta, archivo).cargar_diccionario()
+    return sum(len(diccionario[seccion]) for seccion in diccionario)
+
+
+def guardar_con_cambios(carpeta, archivo, cambios):
+    """Carga, agrega entradas en colegios y serializa/escribe (sin backup)"""
+    diccionario = nuevo_manager(carpeta, archivo).cargar_diccionario()
+    for i in range(cambios):
+        diccionario['colegios'][f'colegio nuevo {i}'] = 'Colegio Nuevo'
+
+    def escribir():
+        datos = diccionario_codec.serializar_diccionario(diccionario)
+        with open(archivo + '.nuevo', 'wb') as f:
+            f.write(datos)
+        return datos
+
+    return medir(escribir)
+
+
+def main():
+    entradas = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    codec = 'orjson' if diccionario_codec.orjson is not None else 'json (stdlib)'
+    diccionario = generar_diccionario(entradas)
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        archivo = os.path.join(carpeta, 'diccionario.json')
+        guardar_original(archivo, diccionario)
+        tamanio = os.path.getsize(archivo) / 1e6
+
+        print(f"Diccionario sintético: {entradas:,} entradas x 4 secciones ({tamanio:.1f} MB), codec: {codec}")
+
+        t_carga, _ = medir(lambda: cargar_original(archivo))
+        t_colegios, _ = medir(lambda: cargar_colegios(carpeta, archivo))
+        t_todo, _ = medir(lambda: cargar_todo(carpeta, archivo))
+
+        t_guardado, _ = medir(lambda: guardar_original(archivo + '.original', diccionario))
+        t_cambios, datos = guardar_con_cambios(carpeta, archivo, 50)
+
+        manager = nuevo_manager(carpeta, archivo)
+        sin_cambios = manager.cargar_diccionario()
+        t_sin_cambios, _ = medir(lambda: manager.guardar_diccionario(sin_cambios))
+
+        # El resultado debe ser idéntico a json.dump con los mismos cambios
+        for i in range(50):
+            diccionario['colegios'][f'colegio nuevo {i}'] = 'Colegio Nuevo'
+        esperado = json.dumps(diccionario, indent=2, ensure_ascii=False).encode('utf-8')
+        diferencias = 0 if datos == esperado else 1
+
+    print("  Carga")
+    print(f"    json.load completo:            {formatear_tiempo(t_carga)}")
+    print(f"    perezosa, solo colegios:       {formatear_tiempo(t_colegios)}  (x{t_carga / t_colegios:.1f})")
+    print(f"    perezosa, las 4 secciones:     {formatear_tiempo(t_todo)}  (x{t_carga / t_todo:.1f})")
+    print("  Guardado")
+    print(f"    json.dump completo:            {formatear_tiempo(t_guardado)}")
+    print(f"    50 cambios en colegios:        {formatear_tiempo(t_cambios)}  (x{t_guardado / t_cambios:.1f})")
+    print(f"    sin cambios (se omite):        {formatear_tiempo(t_sin_cambios)}")
+    print(f"  Archivo distinto de json.dump: {diferencias}")
+
+    return diferencias
+
+
+if __name__ == "__main__":
+    sys.exit(main())
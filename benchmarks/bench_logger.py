@@ -0,0 +1,84 @@
+"""
+bench_logger.py
+Benchmark del Logger: abrir/escribir/cerrar el archivo por mensaje (original)
+contra el archivo abierto con escritura por lotes en un hilo aparte, y costo
+de los mensajes DEBUG según a qué destinos llegan
+
+Uso:
+    python -m benchmarks.bench_logger [cantidad_mensajes]
+"""
+
+import contextlib
+import os
+import sys
+import tempfile
+import time
+
+from src.logger import Logger
+
+from .referencia import LoggerReferencia
+from .utilidades import formatear_tiempo
+
+
+def registrar(logger, mensajes):
+    """Registra los mensajes y devuelve el tiempo que tardaron las llamadas a log()"""
+    inicio = time.perf_counter()
+    for mensaje in mensajes:
+        logger.log(mensaje)
+    return time.perf_counter() - inicio
+
+
+def registrar_debug(logger, colegios):
+    """Registra un detalle DEBUG por colegio y devuelve el tiempo de las llamadas"""
+    inicio = time.perf_counter()
+    for i, colegio in enumerate(colegios):
+        logger.debug("   ✅ Fuzzy match: '%s' → '%s' (%s%%)", colegio, colegio.title(), 90 + i % 10)
+    return time.perf_counter() - inicio
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    mensajes = [f"   ✅ Fuzzy match: 'colegio {i}' → 'Colegio Canónico {i % 500}' ({90 + i % 10}%)" for i in range(cantidad)]
+
+    with tempfile.TemporaryDirectory() as carpeta, open(os.devnull, 'w', encoding='utf-8') as nulo:
+        with contextlib.redirect_stdout(nulo):
+            archivo_original = os.path.join(carpeta, 'original.log')
+            t_original = registrar(LoggerReferencia(archivo_original), mensajes)
+
+            archivo_nuevo = os.path.join(carpeta, 'nuevo.log')
+            logger = Logger(archivo_nuevo, max_bytes=0)
+            t_llamadas = registrar(logger, mensajes)
+            inicio = time.perf_counter()
+            logger.cerrar()
+            t_cierre = time.perf_counter() - inicio
+
+            colegios = [f"colegio {i}" for i in range(cantidad)]
+            logger = Logger(os.path.join(carpeta, 'debug.log'), nivel='DEBUG', max_bytes=0)
+            t_debug_consola = registrar_debug(logger, colegios)
+            logger.silenciar()
+            t_debug_archivo = registrar_debug(logger, colegios)
+            logger.cerrar()
+            logger = Logger(os.path.join(carpeta, 'info.log'), nivel='INFO', nivel_consola='INFO', max_bytes=0)
+            t_debug_descartado = registrar_debug(logger, colegios)
+            logger.cerrar()
+
+        with open(archivo_original, encoding='utf-8') as f:
+            lineas_original = sum(1 for _ in f)
+        with open(archivo_nuevo, encoding='utf-8') as f:
+            lineas_nuevo = sum(1 for _ in f)
+
+    print(f"{cantidad:,} mensajes (consola redirigida a {os.devnull})")
+    print(f"  Original (abrir/escribir/cerrar): {formatear_tiempo(t_original)}")
+    print(f"  Con hilo escritor:                {formatear_tiempo(t_llamadas)}  (x{t_original / t_llamadas:.1f})")
+    print(f"    + vaciar al cerrar:             {formatear_tiempo(t_cierre)}")
+    print(f"  Líneas en el archivo: {lineas_original:,} / {lineas_nuevo:,}")
+    print("  debug() con formato estilo %:")
+    print(f"    consola + archivo:              {formatear_tiempo(t_debug_consola)}")
+    print(f"    solo archivo (modo silencioso): {formatear_tiempo(t_debug_archivo)}")
+    print(f"    descartado (nivel INFO):        {formatear_tiempo(t_debug_descartado)}")
+
+    return 0 if lineas_original == lineas_nuevo == cantidad else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+bench_memoria_diccionario.py
+Memoria del diccionario de normalizaciones cargado: json.load (un objeto
+string por cada valor) contra secciones con la tabla de valores compartida
+
+Uso:
+    python -m benchmarks.bench_memoria_diccionario [entradas_por_seccion]
+"""
+
+import gc
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from src.diccionario_manager import DiccionarioManager
+
+from .corpus import generar_diccionario
+from .utilidades import LoggerSilencioso
+
+
+def medir_memoria(cargar):
+    """
+    Memoria que queda asignada por el resultado de cargar()
+
+    Returns:
+        Tupla (bytes_retenidos, pico_en_bytes, resultado)
+    """
+    gc.collect()
+    tracemalloc.start()
+    resultado = cargar()
+    gc.collect()
+    retenidos, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retenidos, pico, resultado
+
+
+def cargar_original(archivo):
+    """Carga completa como lo hacía DiccionarioManager antes"""
+    with open(archivo, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def cargar_compacto(carpeta, archivo):
+    """Carga con DiccionarioManager accediendo a todas las secciones"""
+    manager = DiccionarioManager(archivo, os.path.join(carpeta, 'backups'), LoggerSilencioso())
+    diccionario = manager.cargar_diccionario()
+    for seccion in diccionario:
+        diccionario[seccion]
+    return manager, diccionario
+
+
+def formatear_mb(cantidad):
+    return f"{cantidad / 2**20:.1f} MB"
+
+
+def main():
+    entradas = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    diccionario = generar_diccionario(entradas)
+    distintos = {seccion: len(set(valores.values())) for seccion, valores in diccionario.items()}
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        archivo = os.path.join(carpeta, 'diccionario.json')
+        with open(archivo, 'w', encoding='utf-8') as f:
+            json.dump(diccionario, indent=2, ensure_ascii=False, fp=f)
+        del diccionario
+
+        print(f"Diccionario sintético: {entradas:,} entradas x 4 secciones ({os.path.getsize(archivo) / 2**20:.1f} MB en disco)")
+        print("  Valores distintos: " + ", ".join(f"{s} {n:,}" for s, n in distintos.items()))
+
+        original, pico_original, _ = medir_memoria(lambda: cargar_original(archivo))
+        compacto, pico_compacto, (manager, _) = medir_memoria(lambda: cargar_compacto(carpeta, archivo))
+
+    print(f"  json.load:              {formatear_mb(original)}  (pico {formatear_mb(pico_original)})")
+    print(f"  tabla de valores:       {formatear_mb(compacto)}  (pico {formatear_mb(pico_compacto)}, x{original / compacto:.2f})")
+    print(f"  Valores en la tabla: {len(manager.tabla_valores):,}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
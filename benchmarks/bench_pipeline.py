@@ -0,0 +1,211 @@
+"""
+bench_pipeline.py
+Benchmark escalable del normalizador con exports sintéticos de HubSpot:
+procesar_leads de punta a punta (con el tiempo de cada etapa) y cada
+normalizador por separado, con Claude simulado (sin red ni API key)
+
+Uso:
+    python -m benchmarks.bench_pipeline [filas ...]    (por defecto 1000 100000 1000000)
+"""
+
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+from unittest import mock
+
+import pandas as pd
+
+from src import config
+from src import normalizador
+
+from .generador_leads import cargar_diccionario, escribir_export
+from .utilidades import ClienteClaudeSimulado, formatear_tiempo
+
+
+TAMANIOS = [1_000, 100_000, 1_000_000]
+
+
+def preparar_carpeta(carpeta, export, diccionario_file):
+    """Carpeta de trabajo con el export en datos/ y una copia limpia del diccionario"""
+    os.makedirs(os.path.join(carpeta, 'datos'), exist_ok=True)
+    shutil.copy(export, os.path.join(carpeta, config.INPUT_FILE))
+    if os.path.exists(diccionario_file):
+        shutil.copy(diccionario_file, os.path.join(carpeta, config.DICCIONARIO_FILE))
+
+
+@contextlib.contextmanager
+def entorno_aislado(carpeta):
+    """
+    Corre el normalizador dentro de carpeta, sin salida en consola y sin abrir
+    SharePoint ni el explorador de archivos al terminar
+    """
+    anterior = os.getcwd()
+    os.chdir(carpeta)
+    try:
+        with open(os.devnull, 'w', encoding='utf-8') as nulo, contextlib.redirect_stdout(nulo), \
+                mock.patch('webbrowser.open'), \
+                mock.patch('subprocess.Popen'), \
+                mock.patch.object(normalizador, 'time'):
+            yield
+    finally:
+        os.chdir(anterior)
+
+
+def nuevo_normalizador(clase=None):
+    """
+    NormalizadorLeads (o una clase con la misma interfaz) con Claude simulado
+
+    Args:
+        clase: Clase a instanciar (por defecto normalizador.NormalizadorLeads)
+    """
+    normalizador_leads = (clase or normalizador.NormalizadorLeads)()
+    normalizador_leads.normalizador_claude.client = ClienteClaudeSimulado()
+    return normalizador_leads
+
+
+def correr_pipeline(carpeta):
+    """
+    procesar_leads completo (sin validación interactiva)
+
+    Returns:
+        Tupla (segundos de inicialización, segundos de procesar_leads,
+        etapas medidas, llamadas a Claude)
+    """
+    with entorno_aislado(carpeta):
+        inicio = time.perf_counter()
+        normalizador_leads = nuevo_normalizador()
+        t_inicio = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        normalizador_leads.procesar_leads(modo_validacion=False)
+        t_proceso = time.perf_counter() - inicio
+        normalizador_leads.logger.cerrar()
+
+    return (t_inicio, t_proceso, normalizador_leads.instrumentacion.etapas,
+            normalizador_leads.normalizador_claude.client.llamadas)
+
+
+def normalizar_colegios(normalizador_leads, df):
+    """Colegios únicos y luego por fila, como en procesar_leads"""
+    for colegio in df['___COLEGIO_UNIFICADO___'].unique():
+        if colegio and str(colegio).strip():
+            normalizador_leads.normalizar_colegio(colegio, modo_validacion=False)
+    return df['___COLEGIO_UNIFICADO___'].apply(lambda x: normalizador_leads.normalizar_colegio(x, modo_validacion=False))
+
+
+def normalizar_grados(normalizador_leads, df):
+    """Grados con el clasificador (una vez por valor distinto)"""
+    return normalizador_leads.clasificador_grados.normalizar_serie(
+        df['___GRADO_UNIFICADO___'], normalizador_leads.diccionario,
+        normalizador_leads.normalizaciones_nuevas, modo_validacion=False
+    )
+
+
+def normalizar_telefonos(normalizador_leads, df):
+    """Teléfonos fila por fila"""
+    return df['Phone Number'].apply(normalizador_leads.normalizar_telefono)
+
+
+def resolver_formularios(normalizador_leads, df):
+    """Primer formulario de cada fila y su carrera"""
+    formularios = df['Associated Form Submission'].apply(normalizador_leads.form_mapper.extraer_primer_form)
+    return normalizador_leads.form_mapper.resolver_formularios(
+        formularios, normalizador_leads.diccionario,
+        normalizador_leads.formularios_nuevos, modo_interactivo=False
+    )
+
+
+def categorizar_urls(normalizador_leads, df):
+    """First y Last Page Seen juntas"""
+    return normalizador_leads.url_categorizer.categorizar_columnas(
+        [df['First Page Seen'], df['Last Page Seen']], normalizador_leads.diccionario,
+        normalizador_leads.urls_nuevas, modo_interactivo=False
+    )
+
+
+NORMALIZADORES = [
+    ('Colegios', normalizar_colegios),
+    ('Grados', normalizar_grados),
+    ('Teléfonos', normalizar_telefonos),
+    ('Formularios', resolver_formularios),
+    ('URLs', categorizar_urls),
+]
+
+
+def correr_aislados(carpeta):
+    """
+    Cada normalizador por separado, con cachés frías (un NormalizadorLeads
+    nuevo por normalizador, con el diccionario recién copiado)
+
+    Returns:
+        {nombre: segundos}
+    """
+    tiempos = {}
+    with entorno_aislado(carpeta):
+        df = pd.read_csv(config.INPUT_FILE, encoding='utf-8')
+        for nombre, funcion in NORMALIZADORES:
+            normalizador_leads = nuevo_normalizador()
+            normalizador_leads.logger.silenciar()
+            datos = normalizador_leads.unificar_columnas(df.copy())
+
+            inicio = time.perf_counter()
+            funcion(normalizador_leads, datos)
+            tiempos[nombre] = time.perf_counter() - inicio
+            normalizador_leads.logger.cerrar()
+    return tiempos
+
+
+def por_segundo(filas, segundos):
+    """Filas por segundo, legible"""
+    return f"{filas / segundos:,.0f} filas/s" if segundos else '-'
+
+
+def medir_tamanio(filas, diccionario, diccionario_file):
+    """Genera el export de un tamaño y corre las dos mediciones"""
+    with tempfile.TemporaryDirectory(prefix='bench_pipeline_') as carpeta:
+        export = os.path.join(carpeta, 'hubspot_export.csv')
+        inicio = time.perf_counter()
+        escribir_export(export, filas, diccionario)
+        t_generar = time.perf_counter() - inicio
+
+        carpeta_pipeline = os.path.join(carpeta, 'pipeline')
+        carpeta_aislados = os.path.join(carpeta, 'aislados')
+        preparar_carpeta(carpeta_pipeline, export, diccionario_file)
+        preparar_carpeta(carpeta_aislados, export, diccionario_file)
+
+        t_inicio, t_proceso, etapas, llamadas = correr_pipeline(carpeta_pipeline)
+        aislados = correr_aislados(carpeta_aislados)
+
+    print(f"\n{filas:,} leads (export generado en {formatear_tiempo(t_generar)})")
+    print(f"  Inicialización:  {formatear_tiempo(t_inicio)}")
+    print(f"  procesar_leads:  {formatear_tiempo(t_proceso)}  ({por_segundo(filas, t_proceso)}, {llamadas:,} llamadas a Claude)")
+    for etapa in etapas:
+        print(f"    {etapa.nombre:<22}{formatear_tiempo(etapa.reloj):>10}")
+    print("  Normalizadores por separado (cachés frías):")
+    for nombre, segundos in aislados.items():
+        print(f"    {nombre:<22}{formatear_tiempo(segundos):>10}  ({por_segundo(filas, segundos)})")
+
+    return t_proceso, aislados
+
+
+def main():
+    tamanios = [int(valor) for valor in sys.argv[1:]] or TAMANIOS
+    diccionario_file = os.path.abspath(config.DICCIONARIO_FILE)
+    diccionario = cargar_diccionario(diccionario_file)
+
+    print("Benchmark del pipeline con exports sintéticos (Claude simulado)")
+
+    resultados = {filas: medir_tamanio(filas, diccionario, diccionario_file) for filas in tamanios}
+
+    print("\nResumen (procesar_leads completo):")
+    for filas, (t_proceso, _) in resultados.items():
+        print(f"  {filas:>10,} leads: {formatear_tiempo(t_proceso):>10}  ({por_segundo(filas, t_proceso)})")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,343 @@
+"""
+bench_regresion.py
+Micro-benchmarks de regresión de las funciones calientes de normalización:
+cada función corre sobre un corpus fijo (con semilla) y un diccionario
+congelado, y el tiempo por llamada se compara con la línea base guardada en
+lineas_base.json. Falla (código de salida 1) si alguna función es más lenta
+que la línea base por encima de la tolerancia. No usa red ni Claude.
+
+Las líneas base se guardan relativas a una carga de calibración fija, para
+que sean comparables entre máquinas de distinta velocidad.
+
+La misma verificación corre con pytest (tests/test_regresion.py), opcional
+porque tarda y depende del ritmo de la máquina:
+
+Uso:
+    python -m benchmarks.bench_regresion [casos ...] [--tolerancia 1.5] [--repeticiones 7]
+    python -m benchmarks.bench_regresion --guardar      (actualiza las líneas base)
+    python -m pytest tests/test_regresion.py --regresion
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from unittest import mock
+
+from src import config
+from src.diccionario_codec import serializar_json
+from src.url_categorizer import URLCategorizer
+
+from .bench_pipeline import entorno_aislado, nuevo_normalizador
+from .corpus import generar_diccionario, generar_urls
+from .generador_leads import colegio_nuevo, ensuciar, formulario_compuesto, telefonos
+from .utilidades import formatear_tiempo, medir
+
+
+LINEAS_BASE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lineas_base.json')
+
+# Más lento que la línea base por encima de este factor = regresión
+TOLERANCIA = 1.5
+
+# Veces que se vuelve a medir un caso fuera de tolerancia antes de darlo por regresión
+CONFIRMACIONES = 2
+
+SEMILLA = 2024
+
+
+def calibrar():
+    """Tiempo de una carga fija de Python puro (strings y dicts) en esta máquina"""
+    texto = ' Colegio Evangélico La Patria, Jornada Matutina 2025 '
+
+    def carga():
+        vistos = {}
+        total = 0
+        for i in range(20_000):
+            limpio = texto.strip().lower().replace(' ', '_')
+            vistos[limpio[i % 40:]] = i
+            total += len(limpio.split('_'))
+        return total
+
+    return medir(carga, repeticiones=7)[0]
+
+
+def diccionario_congelado():
+    """Diccionario sintético fijo (no depende del diccionario del proyecto)"""
+    diccionario = generar_diccionario(1000, semilla=SEMILLA)
+    diccionario['colegios'].update(config.COLEGIOS_CONOCIDOS)
+    diccionario['grados'].update({grado.lower(): grado for grado in config.GRADOS_OPCIONES})
+    return diccionario
+
+
+def corpus_fijo(diccionario):
+    """Entradas de cada caso, siempre las mismas para una misma versión de config"""
+    rng = random.Random(SEMILLA)
+
+    colegios = list(diccionario['colegios'])
+    colegios = [ensuciar(colegio, rng) for colegio in rng.sample(colegios, 600)]
+    colegios += [colegio_nuevo(rng) for _ in range(200)]
+    colegios += [ensuciar(universidad, rng) for universidad in rng.choices(list(config.UNIVERSIDADES_GT), k=100)]
+    colegios += rng.choices(config.RESPUESTAS_INVALIDAS, k=100)
+    rng.shuffle(colegios)
+
+    grados = list(diccionario['grados'])
+    grados = [ensuciar(grado, rng) for grado in rng.choices(grados, k=800)]
+    grados += rng.choices(['4to', 'quinto', 'segundo basico', '5to bach', 'Universidad', 'ya me gradué', 'xxx', '3'], k=200)
+    rng.shuffle(grados)
+
+    formularios = list(diccionario['formularios']) + list(config.MAPEO_FORMULARIOS)
+    formularios = [formulario_compuesto(form.title(), rng) for form in rng.choices(formularios, k=10_000)]
+
+    return {
+        'colegios': colegios,
+        'grados': grados,
+        'urls': generar_urls(2000, semilla=SEMILLA),
+        'formularios': formularios,
+        'telefonos': telefonos(rng, 20_000),
+    }
+
+
+def caso_fuzzy_match(normalizador_leads, corpus):
+    """Validadores.fuzzy_match contra la sección colegios (índice ya construido)"""
+    validadores = normalizador_leads.validadores
+    diccionario = normalizador_leads.diccionario
+    textos = corpus['colegios']
+    validadores.fuzzy_match('colegio', 'colegios', diccionario)
+
+    def preparar():
+        return lambda: [validadores.fuzzy_match(texto, 'colegios', diccionario) for texto in textos]
+    return preparar, len(textos)
+
+
+def caso_buscar_universidad_conocida(normalizador_leads, corpus):
+    """Validadores.buscar_universidad_conocida"""
+    validadores = normalizador_leads.validadores
+    textos = corpus['colegios']
+
+    def preparar():
+        return lambda: [validadores.buscar_universidad_conocida(texto) for texto in textos]
+    return preparar, len(textos)
+
+
+def caso_normalizar_grado(normalizador_leads, corpus):
+    """NormalizadorLeads.normalizar_grado (sección grados restaurada en cada repetición)"""
+    grados_base = dict(normalizador_leads.diccionario['grados'])
+    grados = corpus['grados']
+
+    def preparar():
+        normalizador_leads.diccionario['grados'] = dict(grados_base)
+        normalizador_leads.normalizaciones_nuevas = []
+        return lambda: [normalizador_leads.normalizar_grado(grado, modo_validacion=False) for grado in grados]
+    return preparar, len(grados)
+
+
+def caso_categorizar_url(normalizador_leads, corpus):
+    """URLCategorizer.categorizar_url con caché fría (categorizador nuevo en cada repetición)"""
+    urls_base = dict(normalizador_leads.diccionario['urls'])
+    urls = corpus['urls']
+
+    def preparar():
+        categorizador = URLCategorizer(config, normalizador_leads.logger, normalizador_leads.metricas)
+        diccionario = {'urls': dict(urls_base)}
+        return lambda: [categorizador.categorizar_url(url, diccionario, [], modo_interactivo=False) for url in urls]
+    return preparar, len(urls)
+
+
+def caso_extraer_primer_form(normalizador_leads, corpus):
+    """FormMapper.extraer_primer_form"""
+    form_mapper = normalizador_leads.form_mapper
+    formularios = corpus['formularios']
+
+    def preparar():
+        return lambda: [form_mapper.extraer_primer_form(form) for form in formularios]
+    return preparar, len(formularios)
+
+
+def caso_normalizar_telefono(normalizador_leads, corpus):
+    """NormalizadorLeads.normalizar_telefono"""
+    numeros = corpus['telefonos']
+
+    def preparar():
+        return lambda: [normalizador_leads.normalizar_telefono(numero) for numero in numeros]
+    return preparar, len(numeros)
+
+
+CASOS = {
+    'fuzzy_match': caso_fuzzy_match,
+    'buscar_universidad_conocida': caso_buscar_universidad_conocida,
+    'normalizar_grado': caso_normalizar_grado,
+    'categorizar_url': caso_categorizar_url,
+    'extraer_primer_form': caso_extraer_primer_form,
+    'normalizar_telefono': caso_normalizar_telefono,
+}
+
+
+def medir_caso(preparar, llamadas, repeticiones):
+    """Mejor tiempo por llamada (la preparación de cada repetición no se mide)"""
+    preparar()()
+    mejor = None
+    for _ in range(repeticiones):
+        correr = preparar()
+        inicio = time.perf_counter()
+        correr()
+        duracion = time.perf_counter() - inicio
+        if mejor is None or duracion < mejor:
+            mejor = duracion
+    return mejor / llamadas
+
+
+def correr_casos(nombres, repeticiones):
+    """
+    Corre los casos pedidos con un NormalizadorLeads sobre el diccionario congelado
+
+    Returns:
+        {caso: segundos por llamada}
+    """
+    diccionario = diccionario_congelado()
+    corpus = corpus_fijo(diccionario)
+    resultados = {}
+
+    with tempfile.TemporaryDirectory(prefix='bench_regresion_') as carpeta:
+        with open(os.path.join(carpeta, config.DICCIONARIO_FILE), 'wb') as f:
+            f.write(serializar_json(diccionario))
+
+        # Sin logs DEBUG: se mide la función, no el registro de cada decisión
+        with entorno_aislado(carpeta), \
+                mock.patch.object(config, 'LOG_NIVEL', 'INFO'), \
+                mock.patch.object(config, 'LOG_NIVEL_CONSOLA', 'INFO'):
+            normalizador_leads = nuevo_normalizador()
+            for nombre in nombres:
+                preparar, llamadas = CASOS[nombre](normalizador_leads, corpus)
+                resultados[nombre] = medir_caso(preparar, llamadas, repeticiones)
+            normalizador_leads.logger.cerrar()
+
+    return resultados
+
+
+def cargar_lineas_base():
+    """Líneas base guardadas ({} si todavía no hay)"""
+    if not os.path.exists(LINEAS_BASE_FILE):
+        return {}
+    with open(LINEAS_BASE_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def guardar_lineas_base(resultados, calibracion):
+    """Guarda los tiempos medidos como nuevas líneas base (conserva los casos no medidos)"""
+    lineas_base = cargar_lineas_base()
+    casos = lineas_base.get('casos', {})
+    for nombre, segundos in resultados.items():
+        casos[nombre] = {
+            'segundos_por_llamada': segundos,
+            'relativo': segundos / calibracion,
+        }
+
+    lineas_base = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'calibracion_s': calibracion,
+        'casos': dict(sorted(casos.items())),
+    }
+    with open(LINEAS_BASE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(lineas_base, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+
+def comparar(resultados, casos_base, calibracion):
+    """{caso: (segundos, esperado, ratio)} de los casos con línea base"""
+    comparacion = {}
+    for nombre, segundos in resultados.items():
+        base = casos_base.get(nombre)
+        if base is not None:
+            esperado = base['relativo'] * calibracion
+            comparacion[nombre] = (segundos, esperado, segundos / esperado)
+    return comparacion
+
+
+def verificar(nombres, tolerancia=TOLERANCIA, repeticiones=7):
+    """
+    Mide los casos y los compara con las líneas base; un caso fuera de
+    tolerancia se vuelve a medir antes de declararlo regresión
+
+    Returns:
+        Tupla (resultados, comparacion, calibracion): {caso: segundos por llamada},
+        {caso: (segundos, esperado, ratio)} de los casos con línea base y la
+        calibración de esta máquina
+    """
+    # La calibración se toma antes y después, por si la máquina cambia de ritmo en el medio
+    calibracion = calibrar()
+    resultados = correr_casos(nombres, repeticiones)
+    calibracion = min(calibracion, calibrar())
+
+    casos_base = cargar_lineas_base().get('casos', {})
+    comparacion = comparar(resultados, casos_base, calibracion)
+
+    for _ in range(CONFIRMACIONES):
+        sospechosos = [nombre for nombre, (_, _, ratio) in comparacion.items() if ratio > tolerancia]
+        if not sospechosos:
+            break
+        for nombre, segundos in correr_casos(sospechosos, repeticiones).items():
+            resultados[nombre] = min(resultados[nombre], segundos)
+        comparacion = comparar(resultados, casos_base, calibracion)
+
+    return resultados, comparacion, calibracion
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks de regresión del normalizador")
+    parser.add_argument('casos', nargs='*', help=f"Casos a correr (por defecto todos): {', '.join(CASOS)}")
+    parser.add_argument('--guardar', action='store_true', help="Guardar los tiempos como nuevas líneas base")
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA,
+                        help=f"Factor máximo de lentitud aceptado (por defecto {TOLERANCIA})")
+    parser.add_argument('--repeticiones', type=int, default=7, help="Repeticiones por caso (se toma la mejor)")
+    args = parser.parse_args()
+
+    desconocidos = [nombre for nombre in args.casos if nombre not in CASOS]
+    if desconocidos:
+        parser.error(f"casos desconocidos: {', '.join(desconocidos)}")
+
+    nombres = args.casos or list(CASOS)
+
+    if args.guardar:
+        # La calibración se toma antes y después, por si la máquina cambia de ritmo en el medio
+        calibracion = calibrar()
+        resultados = correr_casos(nombres, args.repeticiones)
+        calibracion = min(calibracion, calibrar())
+        guardar_lineas_base(resultados, calibracion)
+        for nombre, segundos in resultados.items():
+            print(f"  {nombre:<30}{formatear_tiempo(segundos):>12} por llamada")
+        print(f"✅ Líneas base guardadas en {LINEAS_BASE_FILE}")
+        return 0
+
+    resultados, comparacion, calibracion = verificar(nombres, args.tolerancia, args.repeticiones)
+
+    print(f"Calibración de esta máquina: {formatear_tiempo(calibracion)} (tolerancia x{args.tolerancia})")
+    print(f"  {'Caso':<30}{'Actual':>12}{'Esperado':>12}{'Ratio':>8}")
+
+    regresiones = []
+    for nombre, segundos in resultados.items():
+        if nombre not in comparacion:
+            print(f"  {nombre:<30}{formatear_tiempo(segundos):>12}{'-':>12}{'-':>8}  (sin línea base)")
+            continue
+
+        _, esperado, ratio = comparacion[nombre]
+        estado = '❌' if ratio > args.tolerancia else '✅'
+        print(f"  {nombre:<30}{formatear_tiempo(segundos):>12}{formatear_tiempo(esperado):>12}{ratio:>7.2f}x  {estado}")
+        if ratio > args.tolerancia:
+            regresiones.append(nombre)
+
+    if regresiones:
+        print(f"❌ Regresiones: {', '.join(regresiones)}")
+        return 1
+
+    print("✅ Sin regresiones")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""
+bench_url_categorizer.py
+Benchmark del categorizador de URLs compilado contra la implementación original
+
+Uso:
+    python -m benchmarks.bench_url_categorizer [cantidad_urls]
+"""
+
+import sys
+
+from src import config
+from src.url_categorizer import URLCategorizer
+
+from .corpus import generar_urls
+from .referencia import categorizar_url_referencia
+from .utilidades import LoggerSilencioso, medir, formatear_tiempo
+
+
+def correr_referencia(urls):
+    """Categoriza el corpus con la implementación original"""
+    diccionario = {'urls': {}}
+    return [categorizar_url_referencia(url, diccionario, config) for url in urls]
+
+
+def correr_compilado(urls, categorizador=None):
+    """Categoriza el corpus con el motor compilado (caché nueva si no se pasa categorizador)"""
+    if categorizador is None:
+        categorizador = URLCategorizer(config, LoggerSilencioso())
+    diccionario = {'urls': {}}
+    return [
+        categorizador.categorizar_url(url, diccionario, [], modo_interactivo=False)
+        for url in urls
+    ]
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    urls = generar_urls(cantidad)
+
+    print(f"Corpus sintético: {len(urls):,} URLs ({len(set(urls)):,} distintas)")
+
+    t_referencia, esperado = medir(lambda: correr_referencia(urls))
+    t_compilado, obtenido = medir(lambda: correr_compilado(urls))
+
+    categorizador = URLCategorizer(config, LoggerSilencioso())
+    correr_compilado(urls, categorizador)
+    t_cache, obtenido_cache = medir(lambda: correr_compilado(urls, categorizador))
+
+    diferencias = sum(1 for a, b in zip(esperado, obtenido) if a != b)
+    diferencias += sum(1 for a, b in zip(esperado, obtenido_cache) if a != b)
+
+    print(f"  Original:                {formatear_tiempo(t_referencia)}")
+    print(f"  Compilado (caché fría):  {formatear_tiempo(t_compilado)}  (x{t_referencia / t_compilado:.1f})")
+    print(f"  Compilado (caché tibia): {formatear_tiempo(t_cache)}  (x{t_referencia / t_cache:.1f})")
+    print(f"  Diferencias de resultado: {diferencias}")
+
+    return 1 if diferencias else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
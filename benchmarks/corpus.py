@@ -0,0 +1,119 @@
+"""
+corpus.py
+Generadores de corpus sintéticos (con semilla) para los benchmarks
+"""
+
+import random
+
+from src import config
+
+
+HOSTS_BRIDGE = ['https://uvgbridge.gt', 'https://www.uvgbridge.gt', 'http://uvgbridge.gt']
+
+PAGINAS_SIN_CARRERA = ['', '/', '/blog/noticias', '/contacto/', '/gracias-ok/', '/thank-you/', '/eventos/open-house']
+
+URLS_EXTERNAS = [
+    'https://www.facebook.com/542664828938598/publishing_tools/?section=lead_ads_forms',
+    'https://l.instagram.com/',
+    'https://www.google.com/search?q=uvg+bridge',
+    'https://fb.com/',
+]
+
+CAMPANIAS = [
+    'lic%2badministracion%2b01',
+    'promoting%2bform%2blic%2bmarketing',
+    'ing%2badministracion%2bcampa%25c3%25b1a%2b02',
+    '120230213798330227',
+    'open%2bhouse',
+]
+
+
+def _parametros_tracking(rng):
+    """Arma un query string con parámetros de tracking aleatorios"""
+    parametros = [
+        f"utm_source={rng.choice(['facebook', 'an', 'ig', 'google'])}",
+        f"utm_medium={rng.choice(['paid', 'cpc', 'social'])}",
+        f"utm_campaign={rng.choice(CAMPANIAS)}",
+    ]
+    if rng.random() < 0.6:
+        parametros.append(f"fbclid=iw{rng.getrandbits(64):x}_aem_{rng.getrandbits(32):x}")
+    if rng.random() < 0.4:
+        parametros.append(f"hsa_acc={rng.randint(10**14, 10**15)}&hsa_cam={rng.randint(10**17, 10**18)}")
+    rng.shuffle(parametros)
+    return '&'.join(parametros)
+
+
+def _carrera_en_tracking(rng, patrones):
+    """
+    Sufijo que nombra una carrera solo en un parámetro que la clave canónica
+    descarta, o en el fragmento (los patrones se buscan en la URL original)
+    """
+    patron = rng.choice(patrones).strip('/-')
+    return rng.choice([f"?utm_content={patron}", f"?hsa_src={patron}", f"#{patron}"])
+
+
+def generar_urls(cantidad, semilla=42):
+    """
+    Genera URLs con forma de First/Last Page Seen de HubSpot
+
+    Args:
+        cantidad: Número de URLs a generar
+        semilla: Semilla del generador aleatorio
+
+    Returns:
+        Lista de URLs (con repetidos, como en un export real)
+    """
+    rng = random.Random(semilla)
+    # Generador aparte para no cambiar el resto de la secuencia de URLs
+    rng_tracking = random.Random(semilla + 1)
+    patrones = [patron for lista in config.URL_PATTERNS.values() for patron in lista]
+    urls = []
+
+    for _ in range(cantidad):
+        tipo = rng.random()
+
+        if tipo < 0.55:
+            patron = rng.choice(patrones).strip('/-')
+            url = f"{rng.choice(HOSTS_BRIDGE)}/{patron}-{rng.choice(['', 'de-empresas', '2025'])}/"
+        elif tipo < 0.8:
+            url = rng.choice(HOSTS_BRIDGE) + rng.choice(PAGINAS_SIN_CARRERA)
+            if rng_tracking.random() < 0.2:
+                url += _carrera_en_tracking(rng_tracking, patrones)
+        else:
+            url = rng.choice(URLS_EXTERNAS)
+
+        if rng.random() < 0.7:
+            url += ('&' if '?' in url else '?') + _parametros_tracking(rng)
+
+        if rng.random() < 0.1:
+            url = url.upper()
+
+        urls.append(url)
+
+    return urls
+
+
+def generar_diccionario(entradas_por_seccion, semilla=42):
+    """
+    Genera un diccionario de normalizaciones con la forma del real
+
+    Args:
+        entradas_por_seccion: Número de entradas de cada sección
+        semilla: Semilla del generador aleatorio
+
+    Returns:
+        Diccionario {'colegios', 'grados', 'urls', 'formularios'}
+    """
+    rng = random.Random(semilla)
+    carreras = list(config.URL_PATTERNS)
+    urls = generar_urls(entradas_por_seccion, semilla)
+    diccionario = {'colegios': {}, 'grados': {}, 'urls': {}, 'formularios': {}}
+
+    for i in range(entradas_por_seccion):
+        canonico = f"Colegio Sintético {rng.randint(1, entradas_por_seccion // 5 + 1)}"
+        diccionario['colegios'][f"{canonico.lower()} variante {i}"] = canonico
+        diccionario['grados'][f"{rng.randint(1, 6)}to grado {i}"] = rng.choice(['4to. Diversificado', '5to. Diversificado', 'Graduado'])
+        diccionario['urls'][f"{urls[i].lower()}#{i}"] = rng.choice(carreras + ['Otro'])
+        diccionario['formularios'][f"form lic {i} ñandú"] = rng.choice(carreras)
+
+    return diccionario
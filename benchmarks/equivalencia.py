@@ -0,0 +1,549 @@
+"""
+equivalencia.py
+Arnés de equivalencia (golden output) para motores optimizados: corre el
+normalizador de referencia y un motor candidato sobre el mismo export, con
+el mismo diccionario congelado y Claude simulado, compara cada columna de
+datos_limpios.csv fila por fila (y el diccionario resultante), agrupa las
+diferencias por etapa y regla, y reporta la aceleración
+
+La referencia por defecto es el normalizador anterior a las optimizaciones
+(REFERENCIA_BASE): se extrae esa revisión con git archive y se corre en un
+proceso aparte, con su propio paquete src. Así el arnés detecta cuando el
+árbol actual se aparta del comportamiento original, en vez de comparar el
+código actual consigo mismo.
+
+Referencia y candidato son 'git:<revisión>' o una clase 'paquete.modulo:Clase'
+con la interfaz de NormalizadorLeads (constructor sin argumentos y
+procesar_leads(modo_validacion=False)), p. ej. una subclase que reemplaza
+alguna etapa por una versión vectorizada.
+
+Uso:
+    python -m benchmarks.equivalencia [--filas 10000]                (árbol actual contra la base)
+    python -m benchmarks.equivalencia --candidato paquete.modulo:Clase
+    python -m benchmarks.equivalencia --referencia src.normalizador:NormalizadorLeads --candidato paquete.modulo:Clase
+    python -m benchmarks.equivalencia --csv datos/hubspot_export.csv --reporte equivalencia.json
+"""
+
+import argparse
+import functools
+import hashlib
+import importlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+import pandas as pd
+
+from src import config
+from src import normalizador
+
+from .bench_pipeline import entorno_aislado, nuevo_normalizador
+from .generador_leads import escribir_export
+from .referencia import fuzzy_match_referencia
+from .utilidades import formatear_tiempo
+
+
+# Normalizador anterior a las optimizaciones (commit base del repositorio)
+REFERENCIA_BASE = 'git:914bd41'
+CANDIDATO_ACTUAL = 'src.normalizador:NormalizadorLeads'
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Arranque del proceso de ejecutar_revision: los benchmarks siempre salen de
+# este árbol (aunque la revisión tenga los suyos) y el paquete src de la revisión
+ARRANQUE_REVISION = """
+import runpy, sys
+raiz, checkout = sys.argv[1:3]
+sys.path[:0] = [raiz]
+import benchmarks
+sys.path[0] = checkout
+sys.argv = ['equivalencia'] + sys.argv[3:]
+runpy.run_module('benchmarks.equivalencia', run_name='__main__', alter_sys=True)
+"""
+
+# Cambios de comportamiento deliberados respecto a REFERENCIA_BASE: las diferencias
+# de estas (etapa, regla) se reportan aparte y no cuentan contra la equivalencia
+DIFERENCIAS_ESPERADAS = {
+    ('Colegios', 'fuzzy_a_otro'): "'Otro' ya no es destino del fuzzy match (índice de valores canónicos)",
+}
+
+# Etapa que decide las entradas de cada sección del diccionario
+SECCIONES_ETAPA = {
+    'colegios': 'Colegios',
+    'grados': 'Grados',
+    'urls': 'URLs',
+    'formularios': 'Formularios',
+}
+
+# Etapa que produce cada columna de datos_limpios.csv
+COLUMNAS_ETAPA = {
+    'Colegio Actual': 'Colegios',
+    'Grado Académico': 'Grados',
+    'Phone Number': 'Teléfonos',
+    'Associated Form Submission': 'Formularios',
+    'Carrera de Interés': 'Carrera de Interés',
+    'First Page Seen': 'URLs',
+    'Last Page Seen': 'URLs',
+}
+
+
+def cargar_clase(especificacion):
+    """Clase a partir de 'paquete.modulo:Clase'"""
+    modulo, _, nombre = especificacion.partition(':')
+    if not nombre:
+        raise ValueError(f"El candidato debe tener la forma 'paquete.modulo:Clase': '{especificacion}'")
+    return getattr(importlib.import_module(modulo), nombre)
+
+
+def sha256(datos):
+    return hashlib.sha256(datos).hexdigest()
+
+
+def preparar_carpeta(carpeta, export, diccionario_bytes):
+    """Carpeta de trabajo con el export y el diccionario congelado"""
+    os.makedirs(os.path.join(carpeta, 'datos'), exist_ok=True)
+    shutil.copy(export, os.path.join(carpeta, config.INPUT_FILE))
+    with open(os.path.join(carpeta, config.DICCIONARIO_FILE), 'wb') as f:
+        f.write(diccionario_bytes)
+
+
+def extraer_revision(revision, destino):
+    """Extrae el árbol de una revisión de git en destino (sin tocar el directorio de trabajo)"""
+    archivo = subprocess.run(['git', 'archive', '--format=tar', revision], cwd=RAIZ,
+                             capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archivo)) as tar:
+        tar.extractall(destino)
+
+
+def ejecutar_motor(carpeta, clase):
+    """
+    Corre procesar_leads de un motor en su carpeta
+
+    Returns:
+        Diccionario con el diccionario final, los segundos de procesar_leads
+        y los tiempos por etapa
+    """
+    with entorno_aislado(carpeta):
+        normalizador_leads = nuevo_normalizador(clase)
+        inicio = time.perf_counter()
+        normalizador_leads.procesar_leads(modo_validacion=False)
+        segundos = time.perf_counter() - inicio
+        if hasattr(normalizador_leads.logger, 'cerrar'):
+            # El logger de la base escribe cada mensaje al momento
+            normalizador_leads.logger.cerrar()
+
+        diccionario = {seccion: dict(normalizador_leads.diccionario[seccion]) for seccion in normalizador_leads.diccionario}
+
+    instrumentacion = getattr(normalizador_leads, 'instrumentacion', None)
+    return {
+        'clase': f"{type(normalizador_leads).__module__}.{type(normalizador_leads).__name__}",
+        'diccionario': diccionario,
+        'segundos': segundos,
+        'etapas': {etapa.nombre: etapa.reloj for etapa in instrumentacion.etapas} if instrumentacion else {},
+    }
+
+
+def ejecutar_revision(carpeta, revision, checkout):
+    """
+    Corre el normalizador de una revisión extraída en un proceso aparte: el
+    paquete src se importa del checkout y los benchmarks de este árbol
+
+    Returns:
+        Lo mismo que ejecutar_motor
+    """
+    resultado_file = os.path.join(carpeta, 'motor.json')
+    entorno = dict(os.environ)
+    # Claude va simulado: sin API key la revisión no construye el cliente real
+    entorno.pop('ANTHROPIC_API_KEY', None)
+    subprocess.run([sys.executable, '-c', ARRANQUE_REVISION, RAIZ, checkout, '--ejecutar', carpeta, resultado_file],
+                   cwd=checkout, env=entorno, stdin=subprocess.DEVNULL, check=True)
+
+    with open(resultado_file, 'r', encoding='utf-8') as f:
+        resultado = json.load(f)
+    resultado['clase'] = f"{resultado['clase']} @ {revision}"
+    return resultado
+
+
+def correr_motor(carpeta, motor, temporal):
+    """
+    Corre un motor ('git:<revisión>' o 'paquete.modulo:Clase') en su carpeta
+
+    Returns:
+        Diccionario con la salida (DataFrame de texto), el diccionario final,
+        los segundos de procesar_leads y los tiempos por etapa
+    """
+    if motor.startswith('git:'):
+        revision = motor[len('git:'):]
+        checkout = os.path.join(temporal, f'git_{revision}')
+        if not os.path.isdir(checkout):
+            extraer_revision(revision, checkout)
+        resultado = ejecutar_revision(carpeta, revision, checkout)
+    else:
+        resultado = ejecutar_motor(carpeta, cargar_clase(motor))
+
+    resultado['salida'] = pd.read_csv(os.path.join(carpeta, config.OUTPUT_FILE), dtype=str,
+                                      keep_default_na=False, encoding='utf-8-sig')
+    return resultado
+
+
+class ExplicadorReglas:
+    """
+    Indica qué regla de la referencia decide cada valor, partiendo del
+    diccionario congelado (la primera decisión, antes de que la corrida
+    agregue entradas nuevas)
+    """
+
+    def __init__(self, normalizador_leads, entrada, colegios_referencia=None):
+        """
+        Args:
+            normalizador_leads: NormalizadorLeads de referencia sin correr (diccionario congelado)
+            entrada: DataFrame del export original
+            colegios_referencia: Colegios del diccionario final de la referencia (el
+                                 fuzzy original también compara contra las claves
+                                 que agregó la misma corrida)
+        """
+        self.normalizador = normalizador_leads
+        self.diccionario = normalizador_leads.diccionario
+        self.entrada = normalizador_leads.unificar_columnas(entrada.copy())
+        self.colegios_congelados = dict(self.diccionario['colegios'])
+        self.colegios_referencia = colegios_referencia or {}
+        self.fuzzy_otro = {}
+
+    def original(self, columna, fila):
+        """Valor de entrada que dio origen a la celda"""
+        columna_entrada = {
+            'Colegio Actual': '___COLEGIO_UNIFICADO___',
+            'Grado Académico': '___GRADO_UNIFICADO___',
+        }.get(columna, columna)
+        if columna_entrada not in self.entrada.columns or fila >= len(self.entrada):
+            return ''
+        valor = self.entrada[columna_entrada].iloc[fila]
+        return '' if pd.isna(valor) else str(valor)
+
+    def regla(self, columna, fila):
+        """Nombre de la regla que resuelve la celda en la referencia"""
+        return self.regla_valor(COLUMNAS_ETAPA.get(columna), self.original(columna, fila))
+
+    def regla_valor(self, etapa, valor):
+        """Nombre de la regla que resuelve un valor de entrada en una etapa"""
+        valor = valor.strip()
+
+        if etapa == 'Colegios':
+            if not valor:
+                return 'vacio'
+            _, metodo = self.normalizador.validar_colegio_localmente(valor)
+            if metodo:
+                return metodo
+            if self.fuzzy_a_otro(valor):
+                return 'fuzzy_a_otro'
+            return 'sigla_ambigua' if self.normalizador.validadores.es_sigla_ambigua(valor) else 'claude'
+
+        if etapa == 'Grados':
+            if not valor:
+                return 'vacio'
+            if valor in self.diccionario['grados']:
+                return 'diccionario'
+            return self.normalizador.clasificador_grados.clasificar(valor)[1]
+
+        if etapa == 'URLs':
+            if not valor:
+                return 'vacio'
+            # Mismo orden que categorizar_url: reglas sobre la URL original y
+            # recién después el diccionario, con la clave canónica
+            categorizador = self.normalizador.url_categorizer
+            categoria, patron, es_bridge = categorizador.clasificar_automatico(valor.lower())
+            if patron is not None:
+                return f"patron '{patron}'"
+            if categoria is not None:
+                return 'caso_otro' if categoria == 'Otro' else 'bridge_principal'
+            urls = categorizador.urls_diccionario(self.diccionario)
+            if urls is not None and categorizador.canonicalizar_url(valor.lower()) in urls:
+                return 'diccionario'
+            return 'bridge_sin_patron' if es_bridge else 'sin_patron'
+
+        if etapa == 'Carrera de Interés':
+            return 'carrera_csv' if valor and valor != 'nan' else 'formulario'
+
+        if etapa == 'Formularios':
+            return 'vacio' if not valor else 'primer_formulario'
+
+        if etapa == 'Teléfonos':
+            return 'vacio' if not valor else 'ultimos_8_digitos'
+
+        return 'sin_transformacion'
+
+    def fuzzy_a_otro(self, valor):
+        """
+        Indica si el fuzzy match original lleva el valor a 'Otro' (comparaba
+        contra todas las claves, incluidas las que van a 'Otro')
+        """
+        if valor not in self.fuzzy_otro:
+            agregadas = {clave: destino for clave, destino in self.colegios_referencia.items()
+                         if clave != valor and clave not in self.colegios_congelados}
+            self.fuzzy_otro[valor] = (fuzzy_match_referencia(valor, self.colegios_congelados) == 'Otro'
+                                      or fuzzy_match_referencia(valor, agregadas) == 'Otro')
+        return self.fuzzy_otro[valor]
+
+    def urls_comparables(self, urls):
+        """
+        Sección de URLs en una forma común a todas las versiones: la original
+        guarda la URL tal cual y también lo que resuelven los patrones; la
+        actual guarda la clave canónica y solo lo que no tiene regla
+        """
+        categorizador = self.normalizador.url_categorizer
+        return {
+            categorizador.canonicalizar_url(url.lower()): categoria
+            for url, categoria in urls.items()
+            if categorizador.clasificar_automatico(url.lower())[0] is None
+        }
+
+
+def agregar_ejemplo(grupos, etapa, regla, ejemplo, max_ejemplos):
+    """Cuenta una diferencia en {etapa: {regla: {'cantidad', 'ejemplos'}}}"""
+    grupo = grupos.setdefault(etapa, {}).setdefault(regla, {'cantidad': 0, 'ejemplos': []})
+    grupo['cantidad'] += 1
+    if len(grupo['ejemplos']) < max_ejemplos:
+        grupo['ejemplos'].append(ejemplo)
+
+
+def comparar_salidas(referencia, candidato, explicador, max_ejemplos, esperadas=()):
+    """
+    Compara las salidas celda por celda
+
+    Args:
+        esperadas: (etapa, regla) de los cambios deliberados (ver DIFERENCIAS_ESPERADAS)
+
+    Returns:
+        Diccionario con columnas faltantes/sobrantes, filas de cada salida y
+        {etapa: {regla: {'cantidad', 'ejemplos'}}} para las diferencias y para
+        las diferencias esperadas
+    """
+    comparacion = {
+        'columnas_faltantes': [col for col in referencia.columns if col not in candidato.columns],
+        'columnas_sobrantes': [col for col in candidato.columns if col not in referencia.columns],
+        'filas': {'referencia': len(referencia), 'candidato': len(candidato)},
+        'celdas_distintas': 0,
+        'filas_distintas': 0,
+        'diferencias': {},
+        'celdas_esperadas': 0,
+        'esperadas': {},
+    }
+
+    filas = min(len(referencia), len(candidato))
+    filas_distintas = set()
+    for columna in referencia.columns:
+        if columna not in candidato.columns:
+            continue
+        esperado = referencia[columna].iloc[:filas].reset_index(drop=True)
+        obtenido = candidato[columna].iloc[:filas].reset_index(drop=True)
+        distintas = (esperado != obtenido).to_numpy().nonzero()[0]
+
+        etapa = COLUMNAS_ETAPA.get(columna, 'Sin transformación')
+        for fila in distintas:
+            fila = int(fila)
+            regla = explicador.regla(columna, fila)
+            ejemplo = {
+                'fila': fila,
+                'columna': columna,
+                'original': explicador.original(columna, fila),
+                'referencia': esperado[fila],
+                'candidato': obtenido[fila],
+            }
+            if (etapa, regla) in esperadas:
+                comparacion['celdas_esperadas'] += 1
+                agregar_ejemplo(comparacion['esperadas'], etapa, regla, ejemplo, max_ejemplos)
+            else:
+                comparacion['celdas_distintas'] += 1
+                filas_distintas.add(fila)
+                agregar_ejemplo(comparacion['diferencias'], etapa, regla, ejemplo, max_ejemplos)
+
+    comparacion['filas_distintas'] = len(filas_distintas)
+    return comparacion
+
+
+def comparar_diccionarios(referencia, candidato, explicador, max_ejemplos, esperadas=()):
+    """
+    Claves con distinto valor (o ausentes en uno). Las URLs se comparan en su
+    forma común (ver ExplicadorReglas.urls_comparables)
+
+    Returns:
+        Tupla ({seccion: {'cantidad', 'ejemplos'}}, {seccion: {regla: {'cantidad', 'ejemplos'}}})
+        con las diferencias y las diferencias esperadas
+    """
+    diferencias = {}
+    diferencias_esperadas = {}
+    for seccion in sorted(set(referencia) | set(candidato)):
+        esperado = referencia.get(seccion, {})
+        obtenido = candidato.get(seccion, {})
+        if seccion == 'urls':
+            esperado, obtenido = explicador.urls_comparables(esperado), explicador.urls_comparables(obtenido)
+
+        claves = [clave for clave in esperado.keys() | obtenido.keys() if esperado.get(clave) != obtenido.get(clave)]
+        claves.sort()
+        for clave in claves:
+            ejemplo = {'clave': clave, 'referencia': esperado.get(clave), 'candidato': obtenido.get(clave)}
+            regla = explicador.regla_valor(SECCIONES_ETAPA.get(seccion), clave)
+            if (SECCIONES_ETAPA.get(seccion), regla) in esperadas:
+                agregar_ejemplo(diferencias_esperadas, seccion, regla, ejemplo, max_ejemplos)
+            else:
+                agregar_ejemplo(diferencias, seccion, None, ejemplo, max_ejemplos)
+
+    return {seccion: grupos[None] for seccion, grupos in diferencias.items()}, diferencias_esperadas
+
+
+def mostrar_reporte(reporte):
+    """Imprime el resumen de la comparación"""
+    referencia = reporte['referencia']
+    candidato = reporte['candidato']
+    comparacion = reporte['comparacion']
+
+    print(f"Corpus: {reporte['corpus']['filas']:,} leads  (sha256 {reporte['corpus']['sha256'][:12]})")
+    print(f"Diccionario congelado: sha256 {reporte['diccionario_sha256'][:12]}")
+    print(f"  Referencia: {referencia['clase']:<45}{formatear_tiempo(referencia['segundos']):>10}")
+    print(f"  Candidato:  {candidato['clase']:<45}{formatear_tiempo(candidato['segundos']):>10}")
+    print(f"  Aceleración: x{reporte['aceleracion']:.2f}")
+
+    if reporte['aceleracion_por_etapa']:
+        print(f"  {'Etapa':<24}{'Referencia':>12}{'Candidato':>12}{'Aceleración':>13}")
+        for etapa, (t_referencia, t_candidato, aceleracion) in reporte['aceleracion_por_etapa'].items():
+            print(f"  {etapa:<24}{formatear_tiempo(t_referencia):>12}{formatear_tiempo(t_candidato):>12}{aceleracion:>12.2f}x")
+
+    for clave, titulo in (('columnas_faltantes', 'Columnas que faltan en el candidato'),
+                          ('columnas_sobrantes', 'Columnas de más en el candidato')):
+        if comparacion[clave]:
+            print(f"❌ {titulo}: {', '.join(comparacion[clave])}")
+    if comparacion['filas']['referencia'] != comparacion['filas']['candidato']:
+        print(f"❌ Filas: referencia {comparacion['filas']['referencia']:,}, candidato {comparacion['filas']['candidato']:,}")
+
+    if comparacion['celdas_distintas']:
+        print(f"❌ {comparacion['celdas_distintas']:,} celdas distintas en {comparacion['filas_distintas']:,} filas")
+        for etapa, reglas in comparacion['diferencias'].items():
+            for regla, grupo in sorted(reglas.items(), key=lambda item: -item[1]['cantidad']):
+                print(f"  {etapa} / {regla}: {grupo['cantidad']:,}")
+                for ejemplo in grupo['ejemplos']:
+                    print(f"      fila {ejemplo['fila']} [{ejemplo['columna']}] '{ejemplo['original']}': "
+                          f"'{ejemplo['referencia']}' ≠ '{ejemplo['candidato']}'")
+
+    for seccion, grupo in reporte['diccionario_diferencias'].items():
+        print(f"❌ Diccionario '{seccion}': {grupo['cantidad']:,} claves distintas")
+        for ejemplo in grupo['ejemplos']:
+            print(f"      '{ejemplo['clave']}': {ejemplo['referencia']!r} ≠ {ejemplo['candidato']!r}")
+
+    for esperada in reporte['diferencias_esperadas']:
+        etapa, regla = esperada['etapa'], esperada['regla']
+        celdas = comparacion['esperadas'].get(etapa, {}).get(regla, {'cantidad': 0})['cantidad']
+        claves = sum(grupos.get(regla, {'cantidad': 0})['cantidad']
+                     for seccion, grupos in reporte['diccionario_esperadas'].items()
+                     if SECCIONES_ETAPA.get(seccion) == etapa)
+        if celdas or claves:
+            print(f"ℹ️ Cambio esperado ({esperada['motivo']}): {etapa} / {regla}: "
+                  f"{celdas:,} celdas, {claves:,} claves del diccionario")
+
+    if reporte['equivalentes']:
+        print("✅ Salidas idénticas")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Equivalencia de salida entre el normalizador de referencia y un motor candidato")
+    parser.add_argument('--referencia', default=REFERENCIA_BASE,
+                        help="Motor de referencia 'git:<revisión>' o 'paquete.modulo:Clase' "
+                             f"(por defecto {REFERENCIA_BASE}, el normalizador antes de las optimizaciones)")
+    parser.add_argument('--candidato', default=CANDIDATO_ACTUAL,
+                        help=f"Motor candidato, con el mismo formato (por defecto {CANDIDATO_ACTUAL}, el árbol actual)")
+    parser.add_argument('--csv', default=None, help="Export a usar (por defecto se genera uno sintético)")
+    parser.add_argument('--filas', type=int, default=10_000, help="Leads del export sintético")
+    parser.add_argument('--semilla', type=int, default=42, help="Semilla del export sintético")
+    parser.add_argument('--diccionario', default=config.DICCIONARIO_FILE, help="Diccionario a congelar")
+    parser.add_argument('--ejemplos', type=int, default=5, help="Ejemplos por grupo de diferencias")
+    parser.add_argument('--reporte', default=None, help="Ruta donde guardar el reporte JSON")
+    parser.add_argument('--ejecutar', nargs=2, metavar=('CARPETA', 'RESULTADO'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.ejecutar:
+        # Proceso aparte de ejecutar_revision: corre el NormalizadorLeads del src importado.
+        # La base normaliza los grados con .apply(self.normalizar_grado), sin pasarle
+        # modo_validacion, y pregunta por los vacíos aun sin validación: sin consola
+        # se corre con las respuestas del modo sin validación
+        carpeta, resultado_file = args.ejecutar
+        clase = normalizador.NormalizadorLeads
+        clase = type(clase.__name__, (clase,), {
+            '__module__': clase.__module__,
+            'normalizar_grado': functools.partialmethod(clase.normalizar_grado, modo_validacion=False),
+        })
+        with open(resultado_file, 'w', encoding='utf-8') as f:
+            json.dump(ejecutar_motor(carpeta, clase), f, ensure_ascii=False)
+        return 0
+
+    with open(args.diccionario, 'rb') as f:
+        diccionario_bytes = f.read()
+    esperadas = DIFERENCIAS_ESPERADAS if args.referencia == REFERENCIA_BASE else {}
+
+    with tempfile.TemporaryDirectory(prefix='equivalencia_') as carpeta:
+        export = args.csv
+        if export is None:
+            export = os.path.join(carpeta, 'hubspot_export.csv')
+            escribir_export(export, args.filas, json.loads(diccionario_bytes), args.semilla)
+        with open(export, 'rb') as f:
+            export_sha256 = sha256(f.read())
+
+        resultados = {}
+        for nombre, motor in (('referencia', args.referencia), ('candidato', args.candidato)):
+            carpeta_motor = os.path.join(carpeta, nombre)
+            preparar_carpeta(carpeta_motor, export, diccionario_bytes)
+            resultados[nombre] = correr_motor(carpeta_motor, motor, carpeta)
+
+        # Las reglas se explican con un normalizador del árbol actual sobre el diccionario congelado
+        carpeta_explicador = os.path.join(carpeta, 'explicador')
+        preparar_carpeta(carpeta_explicador, export, diccionario_bytes)
+        with entorno_aislado(carpeta_explicador):
+            normalizador_leads = nuevo_normalizador()
+            normalizador_leads.logger.silenciar()
+            entrada = pd.read_csv(config.INPUT_FILE, encoding='utf-8')
+            referencia, candidato = resultados['referencia'], resultados['candidato']
+            explicador = ExplicadorReglas(normalizador_leads, entrada, referencia['diccionario'].get('colegios'))
+            comparacion = comparar_salidas(referencia['salida'], candidato['salida'], explicador, args.ejemplos, esperadas)
+            diccionario_diferencias, diccionario_esperadas = comparar_diccionarios(
+                referencia['diccionario'], candidato['diccionario'], explicador, args.ejemplos, esperadas)
+            normalizador_leads.logger.cerrar()
+
+    reporte = {
+        'corpus': {'archivo': args.csv, 'filas': comparacion['filas']['referencia'], 'sha256': export_sha256},
+        'diccionario_sha256': sha256(diccionario_bytes),
+        'referencia': {clave: referencia[clave] for clave in ('clase', 'segundos', 'etapas')},
+        'candidato': {clave: candidato[clave] for clave in ('clase', 'segundos', 'etapas')},
+        'aceleracion': referencia['segundos'] / candidato['segundos'] if candidato['segundos'] else 0.0,
+        'aceleracion_por_etapa': {
+            etapa: (t_referencia, candidato['etapas'][etapa],
+                    t_referencia / candidato['etapas'][etapa] if candidato['etapas'][etapa] else 0.0)
+            for etapa, t_referencia in referencia['etapas'].items() if etapa in candidato['etapas']
+        },
+        'comparacion': comparacion,
+        'diccionario_diferencias': diccionario_diferencias,
+        'diferencias_esperadas': [
+            {'etapa': etapa, 'regla': regla, 'motivo': motivo} for (etapa, regla), motivo in esperadas.items()
+        ],
+        'diccionario_esperadas': diccionario_esperadas,
+    }
+    reporte['equivalentes'] = not (
+        comparacion['celdas_distintas'] or comparacion['columnas_faltantes'] or comparacion['columnas_sobrantes']
+        or comparacion['filas']['referencia'] != comparacion['filas']['candidato'] or diccionario_diferencias
+    )
+
+    mostrar_reporte(reporte)
+
+    if args.reporte:
+        with open(args.reporte, 'w', encoding='utf-8') as f:
+            json.dump(reporte, f, indent=2, ensure_ascii=False)
+        print(f"📄 Reporte: {args.reporte}")
+
+    return 0 if reporte['equivalentes'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
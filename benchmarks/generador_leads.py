@@ -0,0 +1,294 @@
+"""
+generador_leads.py
+Generador (con semilla) de exports de HubSpot sintéticos para los benchmarks
+
+Las columnas tienen los mismos nombres que el export real (incluida la columna
+'Grado Académico' duplicada) y los valores salen del diccionario de
+normalizaciones: sus claves son las variantes que ya aparecieron en exports
+reales, y sobre ellas se agrega ruido (mayúsculas, tildes, espacios, errores
+de tipeo) y respuestas nuevas que obligan a pasar por las reglas y por Claude.
+
+Uso:
+    python -m benchmarks.generador_leads [filas] [ruta_salida] [semilla]
+"""
+
+import csv
+import json
+import os
+import random
+import sys
+import unicodedata
+
+from src import config
+
+from .corpus import generar_urls
+
+
+# Encabezados del export, en el orden de HubSpot ('Grado Académico' va dos veces)
+ENCABEZADOS = [
+    'Record ID', 'First Name', 'Last Name', 'Email', 'Phone Number',
+    'Colegio Actual', 'En qué colegio estudias actualmente?',
+    'Grado Académico', 'Grado Académico',
+    'Carrera de Interés', 'Associated Form Submission',
+    'First Page Seen', 'Last Page Seen', 'Create Date',
+]
+
+NOMBRES = ['María', 'José', 'Ana', 'Luis', 'Sofía', 'Diego', 'Andrea', 'Carlos', 'Gabriela', 'Javier']
+APELLIDOS = ['López', 'García', 'Pérez', 'Hernández', 'Morales', 'Castillo', 'Rodríguez', 'Juárez', 'Cifuentes']
+DOMINIOS = ['gmail.com', 'hotmail.com', 'yahoo.com', 'outlook.com', 'uvg.edu.gt']
+
+# Nombres para colegios que no están en el diccionario
+PALABRAS_COLEGIO = ['San', 'Santa', 'Nuevo', 'Valle', 'Monte', 'Sagrado', 'Americano', 'Evangélico', 'Mixto', 'Bilingüe']
+NOMBRES_COLEGIO = ['Belén', 'Esperanza', 'Jerusalén', 'Montessori', 'Cervantes', 'Altamira', 'Las Rosas', 'El Prado']
+
+FORMATOS_TELEFONO = ['+502 {a}-{b}', '(502) {a} {b}', '502{a}{b}', '{a}-{b}', '{a}{b}', '+502{a}{b}', '{a} {b}']
+
+
+def quitar_tildes(texto):
+    """Quita tildes y diéresis (como escribe mucha gente en formularios)"""
+    return ''.join(c for c in unicodedata.normalize('NFKD', texto) if not unicodedata.combining(c))
+
+
+def ensuciar(texto, rng):
+    """
+    Aplica a un texto una o dos alteraciones como las de un formulario real
+
+    Args:
+        texto: Texto original
+        rng: Generador aleatorio
+
+    Returns:
+        Texto alterado
+    """
+    for _ in range(rng.randint(1, 2)):
+        tipo = rng.random()
+        if tipo < 0.25:
+            texto = rng.choice([str.lower, str.upper, str.title])(texto)
+        elif tipo < 0.45:
+            texto = quitar_tildes(texto)
+        elif tipo < 0.6:
+            texto = rng.choice(['  ', ' ', '']) + texto.replace(' ', rng.choice(['  ', ' '])) + rng.choice([' ', '', '.'])
+        elif len(texto) > 4:
+            # Error de tipeo: letra omitida, repetida o dos letras intercambiadas
+            i = rng.randrange(1, len(texto) - 1)
+            error = rng.random()
+            if error < 0.33:
+                texto = texto[:i] + texto[i + 1:]
+            elif error < 0.66:
+                texto = texto[:i] + texto[i] + texto[i:]
+            else:
+                texto = texto[:i - 1] + texto[i] + texto[i - 1] + texto[i + 1:]
+    return texto
+
+
+def pesos_zipf(cantidad, exponente=1.1):
+    """Pesos decrecientes: pocos valores muy repetidos y una cola larga, como en los exports"""
+    return [1 / (rango + 1) ** exponente for rango in range(cantidad)]
+
+
+def elegir(rng, valores, cantidad, vacios=0.0, nuevos=0.0, ensuciar_valor=None):
+    """
+    Elige cantidad valores de un vocabulario con distribución de Zipf
+
+    Args:
+        rng: Generador aleatorio
+        valores: Vocabulario (el orden define qué valores son los más frecuentes)
+        cantidad: Número de valores a generar
+        vacios: Proporción de celdas vacías
+        nuevos: Proporción de valores alterados con ensuciar_valor (casi todos distintos)
+        ensuciar_valor: Función (valor, rng) para los valores nuevos
+
+    Returns:
+        Lista de valores
+    """
+    valores = list(valores)
+    rng.shuffle(valores)
+    elegidos = rng.choices(valores, weights=pesos_zipf(len(valores)), k=cantidad)
+
+    for i in range(cantidad):
+        sorteo = rng.random()
+        if sorteo < vacios:
+            elegidos[i] = ''
+        elif sorteo < vacios + nuevos and ensuciar_valor is not None:
+            elegidos[i] = ensuciar_valor(elegidos[i], rng)
+    return elegidos
+
+
+def colegio_nuevo(rng):
+    """Nombre de colegio que no está en el diccionario (lo resuelven las reglas o Claude)"""
+    prefijo = rng.choice(config.PATRONES_COLEGIO + ['', ''])
+    nombre = f"{rng.choice(PALABRAS_COLEGIO)} {rng.choice(NOMBRES_COLEGIO)}"
+    if rng.random() < 0.3:
+        nombre += f" {rng.randint(1, 99)}"
+    return f"{prefijo.title()} {nombre}".strip()
+
+
+def vocabularios(diccionario, rng):
+    """
+    Vocabulario de cada columna a partir del diccionario y de config
+
+    Returns:
+        Diccionario {columna: lista de valores}, con los más frecuentes primero
+    """
+    colegios = list(diccionario.get('colegios', {}))
+    colegios += [clave for clave in config.COLEGIOS_CONOCIDOS if clave not in diccionario.get('colegios', {})]
+    colegios += [ensuciar(colegio, rng) for colegio in colegios[:len(colegios) // 2]]
+    colegios += [colegio_nuevo(rng) for _ in range(max(len(colegios) // 5, 50))]
+    colegios += [rng.choice([str.lower, str.title])(respuesta) for respuesta in config.RESPUESTAS_INVALIDAS]
+
+    grados = list(diccionario.get('grados', {})) + config.GRADOS_OPCIONES
+    grados += [ensuciar(grado, rng) for grado in grados]
+    grados += ['4to', 'quinto', 'segundo basico', '5to bach', 'Universidad', 'ya me gradué', 'trabajo']
+
+    formularios = list(diccionario.get('formularios', {})) + list(config.MAPEO_FORMULARIOS)
+    formularios = [rng.choice([str.title, str.lower, str.capitalize])(form) for form in formularios]
+    formularios += ['UVG Bridge contacto', 'Open House 2025', 'Form Maestrías 01']
+
+    urls = list(diccionario.get('urls', {})) + generar_urls(400, semilla=rng.getrandbits(32))
+
+    return {
+        'colegios': colegios,
+        'grados': grados,
+        'formularios': formularios,
+        'carreras': list(config.MAPEO_CARRERAS_CSV) + ['marketing', 'Administración de Empresas', 'otra cosa'],
+        'urls': urls,
+    }
+
+
+def formulario_compuesto(formulario, rng):
+    """Valor de Associated Form Submission: a veces con .elementor-form o varios formularios"""
+    sorteo = rng.random()
+    if sorteo < 0.3:
+        return f".elementor-form, {formulario}"
+    if sorteo < 0.45:
+        return f"{formulario}; {rng.choice(['.elementor-form', 'Otro', 'waiting'])}"
+    return formulario
+
+
+def telefonos(rng, cantidad):
+    """Números de 8 dígitos con los formatos que se ven en el export"""
+    resultado = []
+    for _ in range(cantidad):
+        if rng.random() < 0.08:
+            resultado.append('')
+            continue
+        numero = str(20000000 + int(rng.random() * 60000000))
+        resultado.append(rng.choice(FORMATOS_TELEFONO).format(a=numero[:4], b=numero[4:]))
+    return resultado
+
+
+def generar_columnas(filas, diccionario, semilla=42):
+    """
+    Genera las columnas de un export de HubSpot sintético
+
+    Args:
+        filas: Número de leads
+        diccionario: Diccionario de normalizaciones (de él salen los valores y su ruido)
+        semilla: Semilla del generador aleatorio
+
+    Returns:
+        Lista de columnas (listas de valores) en el orden de ENCABEZADOS
+    """
+    rng = random.Random(semilla)
+    vocabulario = vocabularios(diccionario, rng)
+
+    # Colegio: casi siempre en una sola de las dos preguntas
+    colegios = elegir(rng, vocabulario['colegios'], filas, vacios=0.04, nuevos=0.01,
+                      ensuciar_valor=ensuciar)
+    colegio_actual, colegio_pregunta = [], []
+    for colegio in colegios:
+        if rng.random() < 0.65:
+            colegio_actual.append(colegio)
+            colegio_pregunta.append('')
+        else:
+            colegio_actual.append('')
+            colegio_pregunta.append(colegio)
+
+    # Grado: la primera columna tiene prioridad, la segunda completa los vacíos
+    grados = elegir(rng, vocabulario['grados'], filas, vacios=0.1, nuevos=0.005, ensuciar_valor=ensuciar)
+    grado_1, grado_2 = [], []
+    for grado in grados:
+        if rng.random() < 0.5:
+            grado_1.append(grado)
+            grado_2.append('')
+        else:
+            grado_1.append('')
+            grado_2.append(grado)
+
+    formularios = [
+        formulario_compuesto(form, rng) if form else ''
+        for form in elegir(rng, vocabulario['formularios'], filas, vacios=0.15)
+    ]
+    carreras = elegir(rng, vocabulario['carreras'], filas, vacios=0.8)
+    primera = elegir(rng, vocabulario['urls'], filas, vacios=0.03)
+    ultima = [
+        url if rng.random() < 0.4 else otra
+        for url, otra in zip(primera, elegir(rng, vocabulario['urls'], filas, vacios=0.05))
+    ]
+
+    nombres = rng.choices(NOMBRES, k=filas)
+    apellidos = rng.choices(APELLIDOS, k=filas)
+    usuarios = {(n, a): f"{quitar_tildes(n).lower()}.{quitar_tildes(a).lower()}" for n in NOMBRES for a in APELLIDOS}
+    correos = [
+        f"{usuarios[nombre, apellido]}{i}@{dominio}"
+        for i, (nombre, apellido, dominio) in enumerate(zip(nombres, apellidos, rng.choices(DOMINIOS, k=filas)))
+    ]
+
+    # Fecha de creación: un minuto al azar de 2025 (meses de 28 días para no validar fechas)
+    fechas = []
+    for _ in range(filas):
+        dia, minuto = divmod(int(rng.random() * 12 * 28 * 24 * 60), 24 * 60)
+        mes, dia = divmod(dia, 28)
+        fechas.append(f"2025-{mes + 1:02d}-{dia + 1:02d} {minuto // 60:02d}:{minuto % 60:02d}")
+
+    return [
+        [str(100000 + i) for i in range(filas)], nombres, apellidos, correos, telefonos(rng, filas),
+        colegio_actual, colegio_pregunta,
+        grado_1, grado_2,
+        carreras, formularios,
+        primera, ultima, fechas,
+    ]
+
+
+def escribir_export(ruta, filas, diccionario, semilla=42):
+    """
+    Escribe un export sintético como CSV (con la columna 'Grado Académico' duplicada,
+    igual que HubSpot; pandas la lee como 'Grado Académico.1')
+
+    Args:
+        ruta: Ruta del CSV
+        filas: Número de leads
+        diccionario: Diccionario de normalizaciones
+        semilla: Semilla del generador aleatorio
+    """
+    columnas = generar_columnas(filas, diccionario, semilla)
+
+    carpeta = os.path.dirname(ruta)
+    if carpeta:
+        os.makedirs(carpeta, exist_ok=True)
+    with open(ruta, 'w', encoding='utf-8', newline='') as f:
+        escritor = csv.writer(f)
+        escritor.writerow(ENCABEZADOS)
+        escritor.writerows(zip(*columnas))
+
+
+def cargar_diccionario(ruta=config.DICCIONARIO_FILE):
+    """Diccionario de normalizaciones del proyecto (vacío si todavía no existe)"""
+    if not os.path.exists(ruta):
+        return {}
+    with open(ruta, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    ruta = sys.argv[2] if len(sys.argv) > 2 else config.INPUT_FILE
+    semilla = int(sys.argv[3]) if len(sys.argv) > 3 else 42
+
+    escribir_export(ruta, filas, cargar_diccionario(), semilla)
+    print(f"✅ Export sintético: {filas:,} leads en {ruta} (semilla {semilla})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
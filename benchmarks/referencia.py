@@ -0,0 +1,99 @@
+"""
+referencia.py
+Implementaciones de referencia (versión por fila original) usadas para
+comparar resultados y tiempos contra los motores optimizados
+"""
+
+import re
+from datetime import datetime
+from urllib.parse import unquote
+
+import pandas as pd
+from rapidfuzz import fuzz
+
+
+def categorizar_url_referencia(url, diccionario, config):
+    """
+    Categorización de URLs original (sin modo interactivo ni logs)
+    Recorre todos los patrones de todas las carreras sobre la URL original y la decodificada
+    """
+    if not url or pd.isna(url):
+        return "Otro"
+
+    url_str = str(url).strip().lower()
+
+    if not url_str:
+        return "Otro"
+
+    if 'urls' in diccionario and url_str in diccionario['urls']:
+        return diccionario['urls'][url_str]
+
+    url_decoded = unquote(url_str)
+
+    patterns = config.URL_PATTERNS
+
+    for carrera, patrones_carrera in patterns.items():
+        for patron in patrones_carrera:
+            if patron in url_str or patron in url_decoded:
+                if 'urls' not in diccionario:
+                    diccionario['urls'] = {}
+                diccionario['urls'][url_str] = carrera
+                return carrera
+
+    for caso in config.URL_CASOS_OTRO:
+        if caso in url_decoded:
+            return 'Otro'
+
+    if 'uvgbridge.gt' in url_decoded:
+        tiene_carrera = False
+        for patrones_carrera in patterns.values():
+            if any(patron in url_decoded for patron in patrones_carrera):
+                tiene_carrera = True
+                break
+
+        if not tiene_carrera:
+            if re.search(r'uvgbridge\.gt/?(\?|$)', url_decoded):
+                return 'Bridge Principal'
+
+    return 'Otro'
+
+
+def fuzzy_match_referencia(texto, diccionario_cat):
+    """
+    Fuzzy matching original: compara contra todas las claves de la sección
+    (incluidas las que van a 'Otro') y devuelve el valor de la mejor si supera 88
+    """
+    texto_limpio = str(texto).strip().lower()
+
+    mejor_match = None
+    mejor_score = 0
+
+    for key in diccionario_cat.keys():
+        score = fuzz.ratio(texto_limpio, key.lower())
+        if score > mejor_score:
+            mejor_score = score
+            mejor_match = key
+
+    if mejor_score > 88:
+        return diccionario_cat[mejor_match]
+
+    return None
+
+
+class LoggerReferencia:
+    """Logger original: abre, escribe y cierra el archivo en cada mensaje"""
+
+    def __init__(self, log_file):
+        self.log_file = log_file
+
+    def log(self, mensaje):
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        log_msg = f"[{timestamp}] {mensaje}"
+
+        print(mensaje)
+
+        try:
+            with open(self.log_file, 'a', encoding='utf-8') as f:
+                f.write(log_msg + '\n')
+        except Exception as e:
+            print(f"⚠️ Error al escribir log: {e}")
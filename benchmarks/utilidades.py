@@ -0,0 +1,99 @@
+"""
+utilidades.py
+Utilidades compartidas por los benchmarks
+"""
+
+import threading
+import time
+
+
+class LoggerSilencioso:
+    """Logger que descarta todos los mensajes (mismo API que src.logger.Logger)"""
+
+    def log(self, mensaje):
+        """Descarta el mensaje"""
+        pass
+
+    def debug(self, mensaje, *args):
+        """Descarta el mensaje sin formatearlo"""
+        pass
+
+
+def medir(funcion, repeticiones=3):
+    """
+    Ejecuta una función varias veces y devuelve el mejor tiempo
+
+    Args:
+        funcion: Función sin argumentos a medir
+        repeticiones: Cantidad de ejecuciones
+
+    Returns:
+        Tupla (mejor_tiempo_en_segundos, resultado_de_la_ultima_ejecucion)
+    """
+    mejor = None
+    resultado = None
+
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        duracion = time.perf_counter() - inicio
+        if mejor is None or duracion < mejor:
+            mejor = duracion
+
+    return mejor, resultado
+
+
+def formatear_tiempo(segundos):
+    """Formatea una duración en la unidad más legible"""
+    if segundos < 1e-3:
+        return f"{segundos * 1e6:.1f} µs"
+    if segundos < 1:
+        return f"{segundos * 1e3:.1f} ms"
+    return f"{segundos:.2f} s"
+
+
+class _Objeto:
+    """Objeto con atributos (para imitar las respuestas del SDK de Anthropic)"""
+
+    def __init__(self, **atributos):
+        self.__dict__.update(atributos)
+
+
+class ClienteClaudeSimulado:
+    """
+    Reemplazo sin red de anthropic.Anthropic para los benchmarks: responde
+    client.messages.create() de forma determinista a partir del texto que
+    está entre comillas en el prompt, con una latencia opcional
+    """
+
+    def __init__(self, latencia=0.0):
+        """
+        Args:
+            latencia: Segundos que tarda cada respuesta (0 = inmediata)
+        """
+        self.latencia = latencia
+        self.llamadas = 0
+        self.lock = threading.Lock()
+        self.messages = _Objeto(create=self.crear_mensaje)
+
+    def responder(self, prompt):
+        """Respuesta simulada: el texto entre comillas con formato de título, u 'Otro'"""
+        inicio = prompt.find('"')
+        fin = prompt.find('"', inicio + 1)
+        texto = prompt[inicio + 1:fin].strip() if inicio != -1 and fin != -1 else ''
+        if not texto or sum(map(ord, texto)) % 5 == 0:
+            return 'Otro'
+        return ' '.join(texto.split()).title()
+
+    def crear_mensaje(self, model=None, max_tokens=None, messages=(), **kwargs):
+        """Mismo contrato que client.messages.create() (se puede llamar desde varios hilos)"""
+        with self.lock:
+            self.llamadas += 1
+        if self.latencia:
+            time.sleep(self.latencia)
+        prompt = messages[-1]['content'] if messages else ''
+        respuesta = self.responder(prompt)
+        return _Objeto(
+            content=[_Objeto(type='text', text=respuesta)],
+            usage=_Objeto(input_tokens=len(prompt) // 4, output_tokens=max(len(respuesta) // 4, 1)),
+        )
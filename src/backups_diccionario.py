@@ -0,0 +1,355 @@
+"""
+backups_diccionario.py
+Backups incrementales (deltas) del diccionario de normalizaciones
+
+Cada versión guardada es una snapshot completa ('base') o solo las claves
+agregadas, modificadas y eliminadas respecto a la anterior ('delta').
+Los contenidos se guardan comprimidos y direccionados por su hash SHA-256
+en backups/objetos/, y backups/indice_backups.json lleva la cadena de versiones
+con el hash de cada sección resultante para poder verificarla.
+
+Los deltas salen de los cambios que registró la ejecución: al guardar solo se
+serializan y hashean las secciones tocadas, y el archivo anterior se reconoce
+por el hash de sus bytes sin parsearlo.
+
+Uso:
+    python -m src.backups_diccionario listar
+    python -m src.backups_diccionario verificar
+    python -m src.backups_diccionario restaurar "2025-03-01 18:00" --destino restaurado.json
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+
+
+INDICE_FILE = 'indice_backups.json'
+OBJETOS_DIR = 'objetos'
+FORMATO_FECHA = '%Y-%m-%d %H:%M:%S'
+
+
+def serializar(contenido):
+    """Serialización canónica (claves ordenadas) para que el hash no dependa del orden"""
+    return json.dumps(contenido, sort_keys=True, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def hash_seccion(entradas):
+    """Hash SHA-256 de una sección"""
+    return hashlib.sha256(serializar(entradas)).hexdigest()
+
+
+def hash_estado(diccionario):
+    """Hash SHA-256 de cada sección del diccionario: {seccion: hash}"""
+    return {seccion: hash_seccion(entradas) for seccion, entradas in diccionario.items()}
+
+
+def estado_coincide(diccionario, estado):
+    """Compara el diccionario con el estado registrado en una versión"""
+    if isinstance(estado, str):
+        # Índices anteriores: un solo hash del diccionario completo
+        return hashlib.sha256(serializar(diccionario)).hexdigest() == estado
+    return hash_estado(diccionario) == estado
+
+
+def aplicar_delta(diccionario, delta):
+    """Aplica un delta sobre el diccionario (en el lugar)"""
+    for seccion, cambios in delta.items():
+        if cambios is None:
+            diccionario.pop(seccion, None)
+            continue
+        entradas = diccionario.setdefault(seccion, {})
+        for clave in cambios['-']:
+            entradas.pop(clave, None)
+        entradas.update(cambios['+'])
+    return diccionario
+
+
+def contar_cambios(delta):
+    """Cantidad de claves tocadas por un delta"""
+    return sum(len(c['+']) + len(c['-']) if c is not None else 1 for c in delta.values())
+
+
+class BackupsDiccionario:
+    """Cadena de backups base + deltas con restauración y verificación"""
+
+    def __init__(self, backup_dir, logger, deltas_por_base=30, retencion_dias=365):
+        """
+        Inicializa el almacén de backups
+
+        Args:
+            backup_dir: Carpeta de backups
+            logger: Instancia de Logger para registrar mensajes
+            deltas_por_base: Deltas seguidos antes de guardar una nueva snapshot completa
+                             (acota el costo de restaurar)
+            retencion_dias: Antigüedad máxima de las cadenas que se conservan
+        """
+        self.backup_dir = backup_dir
+        self.logger = logger
+        self.deltas_por_base = deltas_por_base
+        self.retencion_dias = retencion_dias
+        self.indice_file = os.path.join(backup_dir, INDICE_FILE)
+        self.objetos_dir = os.path.join(backup_dir, OBJETOS_DIR)
+
+    # ---------------------------------------------------------------
+    # Índice y objetos
+    # ---------------------------------------------------------------
+
+    def cargar_indice(self):
+        """Lista de versiones, de la más antigua a la más reciente"""
+        if not os.path.exists(self.indice_file):
+            return []
+        with open(self.indice_file, 'r', encoding='utf-8') as f:
+            return json.load(f)['versiones']
+
+    def guardar_indice(self, versiones):
+        """Reemplaza el índice de forma atómica"""
+        temporal = self.indice_file + '.tmp'
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump({'versiones': versiones}, indent=2, ensure_ascii=False, fp=f)
+        os.replace(temporal, self.indice_file)
+
+    def ruta_objeto(self, hash_objeto):
+        return os.path.join(self.objetos_dir, f'{hash_objeto}.json.gz')
+
+    def guardar_objeto(self, contenido):
+        """
+        Guarda un contenido direccionado por su hash (si ya existe no se reescribe)
+
+        Returns:
+            Hash SHA-256 del contenido
+        """
+        datos = serializar(contenido)
+        hash_objeto = hashlib.sha256(datos).hexdigest()
+        ruta = self.ruta_objeto(hash_objeto)
+
+        if not os.path.exists(ruta):
+            os.makedirs(self.objetos_dir, exist_ok=True)
+            temporal = ruta + '.tmp'
+            with gzip.open(temporal, 'wb') as f:
+                f.write(datos)
+            os.replace(temporal, ruta)
+
+        return hash_objeto
+
+    def leer_objeto(self, hash_objeto):
+        """Lee un objeto verificando que su contenido coincida con el hash"""
+        with gzip.open(self.ruta_objeto(hash_objeto), 'rb') as f:
+            datos = f.read()
+
+        if hashlib.sha256(datos).hexdigest() != hash_objeto:
+            raise ValueError(f"Objeto dañado: {hash_objeto}")
+
+        return json.loads(datos)
+
+    # ---------------------------------------------------------------
+    # Respaldo
+    # ---------------------------------------------------------------
+
+    def respaldar(self, datos_anteriores, datos_nuevos, nuevo, delta):
+        """
+        Registra la nueva versión del diccionario
+
+        Args:
+            datos_anteriores: Contenido del archivo antes de guardar (b'' si no existía)
+            datos_nuevos: Contenido que se va a escribir
+            nuevo: Diccionario que se va a guardar (solo se leen las secciones del delta)
+            delta: Cambios respecto a datos_anteriores, con el formato de
+                   aplicar_delta (None en una sección = sección eliminada)
+        """
+        versiones = self.cargar_indice()
+        fecha = datetime.now().strftime(FORMATO_FECHA)
+        archivo = hashlib.sha256(datos_nuevos).hexdigest()
+
+        # Si el archivo no es el que dejó la última versión registrada (primer
+        # respaldo, edición manual o índice de una versión anterior) se guarda
+        # primero una base del archivo
+        if datos_anteriores:
+            archivo_anterior = hashlib.sha256(datos_anteriores).hexdigest()
+            if not versiones or versiones[-1].get('archivo') != archivo_anterior:
+                anterior = json.loads(datos_anteriores)
+                versiones.append(self.nueva_version(fecha, 'base', anterior, hash_estado(anterior), archivo_anterior))
+
+        if versiones and not delta:
+            versiones[-1]['archivo'] = archivo
+            self.guardar_indice(versiones)
+            self.logger.log("💾 Backup: sin cambios desde la última versión")
+            return
+
+        if not versiones or 'archivo' not in versiones[-1] or self.deltas_desde_base(versiones) >= self.deltas_por_base:
+            contenido = json.loads(datos_nuevos)
+            versiones.append(self.nueva_version(fecha, 'base', contenido, hash_estado(contenido), archivo))
+            self.logger.log(f"💾 Backup completo (base) creado: {versiones[-1]['objeto'][:12]}")
+        else:
+            estado = dict(versiones[-1]['estado'])
+            for seccion, cambios in delta.items():
+                if cambios is None:
+                    estado.pop(seccion, None)
+                else:
+                    estado[seccion] = hash_seccion(nuevo[seccion])
+
+            version = self.nueva_version(fecha, 'delta', delta, estado, archivo)
+            version['cambios'] = contar_cambios(delta)
+            versiones.append(version)
+            self.logger.log(f"💾 Backup incremental creado: {version['cambios']} cambios ({version['objeto'][:12]})")
+
+        versiones = self.aplicar_retencion(versiones)
+        self.guardar_indice(versiones)
+        self.limpiar_objetos(versiones)
+
+    def nueva_version(self, fecha, tipo, contenido, estado, archivo):
+        return {'fecha': fecha, 'tipo': tipo, 'objeto': self.guardar_objeto(contenido),
+                'estado': estado, 'archivo': archivo}
+
+    def deltas_desde_base(self, versiones):
+        """Deltas registrados después de la última base"""
+        cantidad = 0
+        for version in reversed(versiones):
+            if version['tipo'] == 'base':
+                break
+            cantidad += 1
+        return cantidad
+
+    # ---------------------------------------------------------------
+    # Restauración y verificación
+    # ---------------------------------------------------------------
+
+    def reconstruir(self, versiones, posicion):
+        """Reconstruye la versión en la posición dada desde su base más cercana"""
+        inicio = posicion
+        while versiones[inicio]['tipo'] != 'base':
+            inicio -= 1
+
+        diccionario = self.leer_objeto(versiones[inicio]['objeto'])
+        for version in versiones[inicio + 1:posicion + 1]:
+            aplicar_delta(diccionario, self.leer_objeto(version['objeto']))
+
+        if not estado_coincide(diccionario, versiones[posicion]['estado']):
+            raise ValueError(f"La versión del {versiones[posicion]['fecha']} no coincide con su hash")
+
+        return diccionario
+
+    def restaurar(self, fecha=None):
+        """
+        Diccionario tal como estaba en una fecha
+
+        Args:
+            fecha: 'YYYY-MM-DD[ HH:MM[:SS]]'. Se usa la última versión guardada
+                   hasta ese momento. None = la versión más reciente.
+
+        Returns:
+            Tupla (diccionario, version)
+        """
+        versiones = self.cargar_indice()
+        candidatas = [i for i, v in enumerate(versiones) if fecha is None or v['fecha'][:len(fecha)] <= fecha]
+        if not candidatas:
+            raise ValueError(f"No hay backups anteriores a {fecha}")
+
+        posicion = candidatas[-1]
+        return self.reconstruir(versiones, posicion), versiones[posicion]
+
+    def verificar(self):
+        """
+        Comprueba que todos los objetos existan, coincidan con su hash y que
+        cada versión se reconstruya con el estado registrado
+
+        Returns:
+            Lista de problemas encontrados (vacía si todo está bien)
+        """
+        versiones = self.cargar_indice()
+        problemas = []
+        diccionario = None
+
+        for version in versiones:
+            try:
+                contenido = self.leer_objeto(version['objeto'])
+            except (OSError, ValueError) as e:
+                problemas.append(f"{version['fecha']}: {e}")
+                diccionario = None
+                continue
+
+            if version['tipo'] == 'base':
+                diccionario = contenido
+            elif diccionario is None:
+                problemas.append(f"{version['fecha']}: delta sin base válida")
+                continue
+            else:
+                aplicar_delta(diccionario, contenido)
+
+            if not estado_coincide(diccionario, version['estado']):
+                problemas.append(f"{version['fecha']}: el estado reconstruido no coincide")
+
+        return problemas
+
+    # ---------------------------------------------------------------
+    # Retención
+    # ---------------------------------------------------------------
+
+    def aplicar_retencion(self, versiones):
+        """Descarta cadenas completas (base + deltas) más antiguas que la retención"""
+        limite = (datetime.now() - timedelta(days=self.retencion_dias)).strftime(FORMATO_FECHA)
+        bases = [i for i, v in enumerate(versiones) if v['tipo'] == 'base']
+
+        # Primera cadena que todavía tiene versiones dentro de la ventana
+        # (la cadena más reciente se conserva siempre)
+        corte = bases[-1] if bases else 0
+        for i, inicio in enumerate(bases):
+            fin = bases[i + 1] if i + 1 < len(bases) else len(versiones)
+            if versiones[fin - 1]['fecha'] >= limite:
+                corte = inicio
+                break
+
+        if corte:
+            self.logger.log(f"🗑️ Backups: {corte} versiones fuera de la retención de {self.retencion_dias} días")
+        return versiones[corte:]
+
+    def limpiar_objetos(self, versiones):
+        """Elimina objetos que ya no referencia ninguna versión"""
+        if not os.path.isdir(self.objetos_dir):
+            return
+
+        referenciados = {f"{v['objeto']}.json.gz" for v in versiones}
+        for nombre in os.listdir(self.objetos_dir):
+            if nombre not in referenciados:
+                os.remove(os.path.join(self.objetos_dir, nombre))
+
+
+def main():
+    """Línea de comandos: listar, verificar o restaurar backups"""
+    from . import config
+    from .logger import Logger
+
+    parser = argparse.ArgumentParser(description='Backups del diccionario de normalizaciones')
+    parser.add_argument('accion', choices=['listar', 'verificar', 'restaurar'])
+    parser.add_argument('fecha', nargs='?', help="Restaurar la versión vigente en 'YYYY-MM-DD[ HH:MM[:SS]]'")
+    parser.add_argument('--destino', default='diccionario_restaurado.json')
+    args = parser.parse_args()
+
+    logger = Logger(config.LOG_FILE, nivel=config.LOG_NIVEL, max_bytes=config.LOG_MAX_BYTES,
+                    archivos_rotados=config.LOG_ARCHIVOS_ROTADOS)
+    backups = BackupsDiccionario(config.BACKUP_DIR, logger,
+                                 config.BACKUP_DELTAS_POR_BASE, config.BACKUP_RETENCION_DIAS)
+
+    if args.accion == 'listar':
+        for version in backups.cargar_indice():
+            detalle = f"{version['cambios']} cambios" if version['tipo'] == 'delta' else 'snapshot completa'
+            print(f"{version['fecha']}  {version['tipo']:<5}  {version['objeto'][:12]}  {detalle}")
+
+    elif args.accion == 'verificar':
+        problemas = backups.verificar()
+        for problema in problemas:
+            logger.log(f"❌ {problema}")
+        if not problemas:
+            logger.log(f"✅ {len(backups.cargar_indice())} versiones verificadas")
+
+    else:
+        diccionario, version = backups.restaurar(args.fecha)
+        with open(args.destino, 'w', encoding='utf-8') as f:
+            json.dump(diccionario, indent=2, ensure_ascii=False, fp=f)
+        logger.log(f"♻️ Versión del {version['fecha']} restaurada en {args.destino}")
+
+
+if __name__ == '__main__':
+    main()
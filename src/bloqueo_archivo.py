@@ -0,0 +1,89 @@
+"""
+bloqueo_archivo.py
+Bloqueos de archivo entre procesos (fcntl en Linux/macOS, msvcrt en Windows)
+"""
+
+import os
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+def intentar_bloqueo(archivo):
+    """
+    Intenta tomar un bloqueo exclusivo sin esperar
+
+    Args:
+        archivo: Archivo abierto (el bloqueo dura mientras siga abierto o hasta liberar_bloqueo)
+
+    Returns:
+        True si se obtuvo el bloqueo, False si lo tiene otro proceso
+    """
+    try:
+        if fcntl is not None:
+            fcntl.flock(archivo.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            archivo.seek(0)
+            msvcrt.locking(archivo.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def liberar_bloqueo(archivo):
+    """Libera un bloqueo tomado con intentar_bloqueo"""
+    if fcntl is not None:
+        fcntl.flock(archivo.fileno(), fcntl.LOCK_UN)
+    else:
+        archivo.seek(0)
+        msvcrt.locking(archivo.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class BloqueoArchivo:
+    """
+    Bloqueo exclusivo (advisory) sobre un archivo .lock, para usar con 'with'.
+    Solo lo respetan los procesos que también lo piden.
+    """
+
+    def __init__(self, ruta, logger=None, timeout=120, intervalo=0.1):
+        """
+        Args:
+            ruta: Ruta del archivo de bloqueo (se crea si no existe)
+            logger: Instancia opcional de Logger para avisar si hay que esperar
+            timeout: Segundos máximos de espera antes de lanzar TimeoutError
+            intervalo: Segundos entre intentos
+        """
+        self.ruta = ruta
+        self.logger = logger
+        self.timeout = timeout
+        self.intervalo = intervalo
+        self.archivo = None
+
+    def __enter__(self):
+        self.archivo = open(self.ruta, 'a+b')
+        limite = time.monotonic() + self.timeout
+        avisado = False
+
+        while not intentar_bloqueo(self.archivo):
+            if time.monotonic() >= limite:
+                self.archivo.close()
+                self.archivo = None
+                raise TimeoutError(f"No se pudo bloquear {self.ruta} en {self.timeout} s")
+            if not avisado and self.logger is not None:
+                self.logger.log(f"⏳ Esperando a que otra ejecución libere {os.path.basename(self.ruta)}...")
+                avisado = True
+            time.sleep(self.intervalo)
+
+        return self
+
+    def __exit__(self, *args):
+        try:
+            liberar_bloqueo(self.archivo)
+        finally:
+            self.archivo.close()
+            self.archivo = None
+        return False
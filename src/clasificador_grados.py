@@ -0,0 +1,255 @@
+"""
+clasificador_grados.py
+Clasificador de grados académicos con patrones precompilados
+"""
+
+import re
+
+import pandas as pd
+
+from .metricas import RegistroMetricas
+from .validadores import validar_grado_manual
+
+
+# Grados por número extraído del texto
+GRADOS_BASICO = {
+    1: "1ro. Básico",
+    2: "2do. Básico",
+    3: "3ro. Básico",
+}
+
+GRADOS_DIVERSIFICADO = {
+    4: "4to. Diversificado",
+    5: "5to. Diversificado",
+    6: "6to. Diversificado",
+    7: "7mo. Diversificado",
+}
+
+# Clave de diccionario['grados'] con la clasificación manual de los grados
+# vacíos (también es como se muestran en la validación manual)
+CLAVE_GRADO_VACIO = "(vacío)"
+
+# Sufijo que se agrega en normalizaciones_nuevas según la regla aplicada
+SUFIJOS_REGLA = {
+    'basura': ' (basura)',
+    'default': ' (default)',
+}
+
+
+def compilar_keywords(keywords):
+    """
+    Compila una lista de keywords en un solo patrón.
+    Un search() equivale a any(keyword in texto for keyword in keywords).
+    """
+    return re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+
+
+class ClasificadorGrados:
+    """Clasificador de grados académicos"""
+
+    def __init__(self, config, logger, metricas=None):
+        """
+        Inicializa el clasificador y precompila sus patrones
+
+        Args:
+            config: Módulo de configuración con constantes
+            logger: Instancia de Logger para registrar mensajes
+            metricas: RegistroMetricas donde contar aciertos del diccionario
+        """
+        self.config = config
+        self.logger = logger
+        self.metricas = metricas if metricas is not None else RegistroMetricas()
+        self.nivel_diccionario = self.metricas.nivel_cache('grados_diccionario')
+
+        # Quitar tildes y guiones bajos en una sola pasada
+        self.tabla_normalizacion = str.maketrans('áéíóúñ_', 'aeioun ')
+
+        self.re_graduado = compilar_keywords(config.KEYWORDS_GRADUADO)
+        self.re_universitario = compilar_keywords(config.KEYWORDS_UNIVERSITARIO)
+        self.re_diversificado = compilar_keywords(config.KEYWORDS_DIVERSIFICADO)
+        self.re_basico = compilar_keywords(config.KEYWORDS_BASICO)
+        self.re_basura = compilar_keywords(config.PATRONES_BASURA)
+
+        self.re_ordinal = re.compile(r'(\d+)(to|mo|ro|do)\.?')
+        self.re_digito = re.compile(r'\b([1-7])\b')
+        self.re_codigo_basura = re.compile(r'^[a-z]{2,}[0-9]{2,}$')
+
+        # Se conserva el orden del config: gana el primer número que aparezca en la lista
+        self.numeros_texto = tuple(config.NUMEROS_TEXTO.items())
+        self.simbolos = frozenset('-._ /\\|()[]{}')
+
+    def normalizar_texto(self, grado_str):
+        """Pasa a minúsculas, quita tildes y reemplaza guiones bajos por espacios"""
+        return grado_str.lower().translate(self.tabla_normalizacion)
+
+    def es_basura(self, texto):
+        """Detecta valores basura o de prueba sin sentido (texto ya normalizado)"""
+        texto_str = texto.strip()
+
+        if not texto_str:
+            return False
+
+        if self.re_basura.search(texto_str):
+            return True
+
+        if self.re_codigo_basura.match(texto_str):
+            return True
+
+        if len(set(texto_str)) <= 2 and len(texto_str) >= 3:
+            return True
+
+        if texto_str.isdigit() and len(texto_str) > 4:
+            return True
+
+        if all(c in self.simbolos for c in texto_str):
+            return True
+
+        return False
+
+    def extraer_numero(self, grado_normalizado):
+        """Extrae el número de grado: ordinal → número en texto → dígito suelto"""
+        match_ordinal = self.re_ordinal.search(grado_normalizado)
+        if match_ordinal:
+            return int(match_ordinal.group(1))
+
+        for texto_num, digito in self.numeros_texto:
+            if texto_num in grado_normalizado:
+                return int(digito)
+
+        match_digito = self.re_digito.search(grado_normalizado)
+        if match_digito:
+            return int(match_digito.group(1))
+
+        return None
+
+    def clasificar(self, grado_str):
+        """
+        Clasifica un grado (ya sin espacios al inicio/final) sin consultar al usuario
+
+        Args:
+            grado_str: Texto del grado, no vacío
+
+        Returns:
+            Tupla (resultado, regla). La regla 'numero_sin_contexto' indica un
+            1-3 sin contexto de básico: el resultado es la suposición por defecto
+            y el llamador decide si pedir validación manual.
+        """
+        grado_normalizado = self.normalizar_texto(grado_str)
+
+        # Graduado Universitario / Diversificado explícitos
+        if 'graduado' in grado_normalizado:
+            if 'universitario' in grado_normalizado:
+                return "Graduado Universitario", 'graduado_universitario'
+            if 'diversificado' in grado_normalizado:
+                return "Graduado Diversificado", 'graduado_diversificado'
+
+        # Graduación implícita (finalizado, terminado, egresado)
+        if self.re_graduado.search(grado_normalizado):
+            return "Graduado Diversificado", 'graduacion_implicita'
+
+        # Estudiante universitario
+        if self.re_universitario.search(grado_normalizado):
+            return "Estudiante Universitario", 'universitario'
+
+        # Clasificar por número
+        num = self.extraer_numero(grado_normalizado)
+
+        if num in GRADOS_BASICO:
+            if self.re_basico.search(grado_normalizado):
+                return GRADOS_BASICO[num], 'numero_basico'
+            return GRADOS_BASICO[num], 'numero_sin_contexto'
+
+        if num in GRADOS_DIVERSIFICADO:
+            return GRADOS_DIVERSIFICADO[num], 'numero_diversificado'
+
+        # Diversificado sin número
+        if self.re_diversificado.search(grado_normalizado):
+            return "5to. Diversificado", 'keyword_diversificado'
+
+        # Valores basura
+        if self.es_basura(grado_normalizado):
+            return "5to. Diversificado", 'basura'
+
+        return "5to. Diversificado", 'default'
+
+    def normalizar(self, grado, diccionario, normalizaciones_nuevas, modo_validacion=True):
+        """
+        Normaliza un grado y guarda la decisión en diccionario['grados']
+
+        Args:
+            grado: Valor del grado (puede ser nulo o vacío)
+            diccionario: Diccionario de normalizaciones
+            normalizaciones_nuevas: Lista donde registrar las normalizaciones nuevas
+            modo_validacion: Si True, pregunta al usuario en casos ambiguos
+
+        Returns:
+            Grado normalizado
+        """
+        if grado is None or pd.isna(grado) or not str(grado).strip():
+            return self.normalizar_vacio(diccionario, normalizaciones_nuevas, modo_validacion)
+
+        grado_str = str(grado).strip()
+
+        en_diccionario = grado_str in diccionario['grados']
+        self.nivel_diccionario[en_diccionario]()
+        if en_diccionario:
+            return diccionario['grados'][grado_str]
+
+        resultado, regla = self.clasificar(grado_str)
+
+        if regla == 'numero_sin_contexto':
+            if not modo_validacion:
+                # Sin modo validación se asume básico (sin reportarlo como nuevo)
+                diccionario['grados'][grado_str] = resultado
+                return resultado
+
+            num = self.extraer_numero(self.normalizar_texto(grado_str))
+            self.logger.log(f"⚠️ Número {num} sin contexto - solicitando clasificación manual")
+            resultado = validar_grado_manual(grado_str, self.config.GRADOS_OPCIONES, self.logger)
+
+        diccionario['grados'][grado_str] = resultado
+        normalizaciones_nuevas.append(f"Grado: {grado_str} → {resultado}{SUFIJOS_REGLA.get(regla, '')}")
+        return resultado
+
+    def normalizar_vacio(self, diccionario, normalizaciones_nuevas, modo_validacion=True):
+        """
+        Clasifica los grados nulos o vacíos: 'Sin especificar' sin modo
+        validación; con validación se pregunta una sola vez y la respuesta se
+        guarda en diccionario['grados'][CLAVE_GRADO_VACIO] para las próximas
+        ejecuciones con validación (sin validación no se lee)
+        """
+        if not modo_validacion:
+            return "Sin especificar"
+
+        guardado = diccionario['grados'].get(CLAVE_GRADO_VACIO)
+        if guardado is not None:
+            return guardado
+
+        self.logger.log("⚠️ Valor nulo/vacío detectado - solicitando clasificación manual")
+        resultado = validar_grado_manual(CLAVE_GRADO_VACIO, self.config.GRADOS_OPCIONES, self.logger)
+        diccionario['grados'][CLAVE_GRADO_VACIO] = resultado
+        normalizaciones_nuevas.append(f"Grado: {CLAVE_GRADO_VACIO} → {resultado}")
+        return resultado
+
+    def normalizar_serie(self, serie, diccionario, normalizaciones_nuevas, modo_validacion=True):
+        """
+        Normaliza una columna de grados tomando una sola decisión por valor distinto
+        (los nulos y vacíos forman un único grupo)
+
+        Args:
+            serie: Serie con los grados originales
+            diccionario: Diccionario de normalizaciones
+            normalizaciones_nuevas: Lista donde registrar las normalizaciones nuevas
+            modo_validacion: Si True, pregunta al usuario en casos ambiguos
+
+        Returns:
+            Serie de grados normalizados con el mismo índice
+        """
+        codigos, unicos = pd.factorize(serie.fillna('').astype(str).str.strip())
+
+        resultados = [
+            self.normalizar(grado, diccionario, normalizaciones_nuevas, modo_validacion)
+            for grado in unicos
+        ]
+
+        return pd.Series(resultados, dtype=object).take(codigos).set_axis(serie.index)
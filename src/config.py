@@ -19,6 +19,63 @@ OUTPUT_FILE = 'datos/datos_limpios.csv'
 LOG_FILE = 'logs/ejecucion.log'
 BACKUP_DIR = 'backups'
 
+# Niveles de log ('DEBUG' = decisiones por elemento, 'INFO' = resúmenes de etapa,
+# 'WARNING' = avisos y errores): el archivo guarda todo y la consola los
+# resúmenes. Rotación del archivo (comprimido en .1.gz, .2.gz...) y modo
+# silencioso: con más leads que LOG_FILAS_MODO_SILENCIOSO la consola solo muestra
+# avisos hasta el resumen final
+LOG_NIVEL = os.getenv('LOG_NIVEL', 'DEBUG')
+LOG_NIVEL_CONSOLA = os.getenv('LOG_NIVEL_CONSOLA', 'INFO')
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_ARCHIVOS_ROTADOS = 5
+LOG_FILAS_MODO_SILENCIOSO = 5000
+
+# Carpeta de perfiles cProfile por etapa (python main.py --profile)
+PERFIL_DIR = 'perfiles'
+
+# Métricas de cada ejecución: reporte JSON (uno por ejecución) y archivo para el
+# textfile collector de Prometheus (se reemplaza en cada ejecución)
+METRICAS_DIR = 'metricas'
+METRICAS_PROMETHEUS = os.path.join(METRICAS_DIR, 'normalizador.prom')
+
+# Resolución local de colegios únicos (reglas y fuzzy match) en un pool de
+# procesos: cantidad de procesos (0 o 1 = en serie) y mínimo de colegios
+# únicos para que valga la pena arrancar el pool
+COLEGIOS_PROCESOS = int(os.getenv('COLEGIOS_PROCESOS', '0'))
+COLEGIOS_MIN_PARALELO = 2000
+
+# Etapas de procesar_leads que corren a la vez (ver etapas.py): hilos del pool
+# (0 = todas en serie) y procesos para las etapas de cálculo puro como los
+# teléfonos (0 o 1 = corren en el pool de hilos; conviene con exports grandes)
+ETAPAS_HILOS = int(os.getenv('ETAPAS_HILOS', '4'))
+ETAPAS_PROCESOS = int(os.getenv('ETAPAS_PROCESOS', '0'))
+
+# Consultas a Claude de los colegios que se lanzan a la vez, en segundo plano,
+# apenas se leen los datos (0 = una por una, cuando les toca). Desactivado por
+# defecto: una consulta anticipada se paga aunque el colegio termine resuelto
+# por una respuesta anterior del diccionario. Con --profile no se anticipa
+CLAUDE_HILOS = int(os.getenv('CLAUDE_HILOS', '0'))
+
+# Costo aproximado de la API de Claude (USD por millón de tokens)
+CLAUDE_COSTO_MILLON_TOKENS = 3
+
+# Backups incrementales del diccionario: cada cuántos deltas se guarda una
+# snapshot completa y cuántos días se conservan
+BACKUP_DELTAS_POR_BASE = 30
+BACKUP_RETENCION_DIAS = 365
+
+# Almacenamiento del diccionario: 'json' (archivo único) o 'sqlite' (tabla por sección)
+DICCIONARIO_BACKEND = os.getenv('DICCIONARIO_BACKEND', 'json')
+DICCIONARIO_DB = 'diccionario_normalizaciones.db'
+
+# Journal de cambios del diccionario (backend 'json'): cada entrada nueva se
+# escribe al momento (para recuperarla si la ejecución se corta) y al terminar
+# se compacta en el archivo base. El fsync a disco va por tandas: cada tantas
+# entradas o cada tantos segundos, lo que llegue primero
+JOURNAL_FILE = 'diccionario_normalizaciones.journal'
+JOURNAL_FSYNC_ENTRADAS = 100
+JOURNAL_FSYNC_SEGUNDOS = 1.0
+
 # Universidades guatemaltecas conocidas
 UNIVERSIDADES_GT = {
     'usac': 'Universidad de San Carlos de Guatemala (USAC)',
@@ -531,6 +588,17 @@ URL_CASOS_OTRO = [
     'form_uvg_bridge'
 ]
 
+# Parámetros de tracking que se quitan al canonicalizar URLs (prefijos y nombres exactos)
+URL_PREFIJOS_TRACKING = ['utm_', 'hsa_', '_hs', '__hs']
+URL_PARAMETROS_TRACKING = [
+    'fbclid', 'gclid', 'gbraid', 'wbraid', 'dclid', 'msclkid', 'igshid',
+    'hsctatracking', 'mc_cid', 'mc_eid', '_ga', '_gl',
+]
+
+# Parámetros de tracking que SÍ se conservan: el nombre de campaña de los
+# anuncios de Facebook es lo que permite identificar la carrera
+URL_PARAMETROS_CONSERVAR = ['utm_campaign']
+
 
 def crear_carpetas():
     """Crea las carpetas necesarias si no existen"""
@@ -0,0 +1,120 @@
+"""
+consultas_anticipadas.py
+Resolución local de los colegios únicos y consultas a Claude de los que
+quedan sin resolver, lanzadas en segundo plano antes de que procesar_leads
+llegue a cada colegio. Así el operador responde las preguntas (grados,
+formularios, URLs y validación de colegios) mientras la API trabaja.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from rapidfuzz import fuzz, process
+
+from .resolucion_paralela import resolver_en_procesos, resolver_en_serie
+
+
+# Mismo criterio que el fuzzy match del diccionario (Validadores.buscar_fuzzy):
+# un colegio tan parecido a otro ya consultado probablemente se resuelva con
+# esa respuesta al llegar su turno, así que no se consulta por adelantado
+UMBRAL_PARECIDO = 88
+
+
+class ConsultasAnticipadas:
+    """
+    Resultados anticipados por colegio único. normalizar_colegio los usa en el
+    orden original y vuelve a mirar el diccionario actualizado, así que una
+    consulta anticipada solo se usa si el colegio sigue sin resolverse al
+    llegar su turno (si no, se descarta).
+    """
+
+    def __init__(self, normalizador_claude, validadores, logger, hilos):
+        """
+        Args:
+            normalizador_claude: Instancia de NormalizadorClaude
+            validadores: Instancia de Validadores (para las siglas ambiguas)
+            logger: Instancia de Logger para registrar mensajes
+            hilos: Consultas a Claude a la vez (0 = no anticipar consultas)
+        """
+        self.normalizador_claude = normalizador_claude
+        self.validadores = validadores
+        self.logger = logger
+        self.hilos = hilos
+        self.pool = None
+        self.seccion = None
+        self.modificaciones = 0
+        self.locales = {}
+        self.consultas = {}
+
+    def iniciar(self, colegios, seccion, procesos=0, min_paralelo=0):
+        """
+        Resuelve localmente los colegios (contra la sección tal como está) y
+        lanza en segundo plano las consultas a Claude de los que no se resolvieron
+
+        Args:
+            colegios: Colegios únicos ya limpios, sin repetir
+            seccion: Sección de colegios del diccionario
+            procesos: Procesos para la resolución local (0 o 1 = en este hilo)
+            min_paralelo: Mínimo de colegios para usar los procesos
+        """
+        self.seccion = seccion
+        self.modificaciones = getattr(seccion, 'modificaciones', 0)
+        if procesos > 1 and len(colegios) >= min_paralelo:
+            self.logger.log(f"⚙️ Resolución local en {procesos} procesos")
+            self.locales = resolver_en_procesos(colegios, seccion, procesos)
+        else:
+            self.locales = resolver_en_serie(colegios, seccion)
+
+        pendientes = [
+            colegio for colegio in colegios
+            if self.sin_resolver(self.locales[colegio]) and not self.validadores.es_sigla_ambigua(colegio)
+        ]
+        if not pendientes or not self.hilos or not self.normalizador_claude.client:
+            return self
+
+        self.pool = ThreadPoolExecutor(max_workers=self.hilos, thread_name_prefix='claude')
+        consultados = []
+        for colegio in pendientes:
+            texto = colegio.lower()
+            if consultados and process.extractOne(texto, consultados, scorer=fuzz.ratio,
+                                                  score_cutoff=UMBRAL_PARECIDO) is not None:
+                continue
+            consultados.append(texto)
+            self.consultas[colegio] = self.pool.submit(self.normalizador_claude.normalizar_con_claude,
+                                                       colegio, 'colegio', texto_si_falla=False)
+
+        self.logger.log(f"🤖 Consultando a Claude en segundo plano: {len(self.consultas)} de "
+                        f"{len(pendientes)} colegios pendientes ({self.hilos} a la vez)")
+        return self
+
+    @staticmethod
+    def sin_resolver(local):
+        """Si el resultado local no resolvió el colegio (ni por reglas ni por fuzzy)"""
+        return local is not None and local[0] is None and local[2][0] is None
+
+    def local(self, colegio_str):
+        """
+        Resultado local anticipado (ver resolver_localmente) o None. Si desde
+        entonces cambió el valor de alguna clave de la sección, el fuzzy match
+        anticipado ya no sirve de base: se descarta solo ese (previo_fuzzy=None,
+        búsqueda completa) y se conserva lo que dieron las reglas, que no
+        dependen del diccionario.
+        """
+        local = self.locales.get(colegio_str)
+        if local is None or getattr(self.seccion, 'modificaciones', 0) == self.modificaciones:
+            return local
+        valor, metodo, _, mensajes = local
+        return valor, metodo, None, mensajes
+
+    def consulta(self, colegio_str):
+        """
+        Consulta a Claude anticipada o None; se entrega una sola vez. El Future
+        da el valor normalizado, o None si la llamada falló
+        """
+        return self.consultas.pop(colegio_str, None)
+
+    def cerrar(self):
+        """Cancela las consultas que no se usaron y espera las que están en curso"""
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
+        self.consultas = {}
@@ -0,0 +1,254 @@
+"""
+diccionario_codec.py
+Lectura y escritura rápida del diccionario de normalizaciones
+
+Usa orjson si está instalado (misma salida que json.dump con indent=2) y si no
+la librería estándar. El archivo se guarda con cada sección de primer nivel
+en su propia línea ('  "colegios": {'), lo que permite ubicar cada sección
+sin parsear el resto y cargarla recién cuando se usa.
+"""
+
+import json
+import threading
+from collections.abc import MutableMapping
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def cargar_json(datos):
+    """Parsea bytes JSON"""
+    if orjson is not None:
+        return orjson.loads(datos)
+    return json.loads(datos)
+
+
+def serializar_json(contenido):
+    """Serializa con indent=2 sin escapar caracteres no ASCII (bytes UTF-8)"""
+    if orjson is not None:
+        return orjson.dumps(contenido, option=orjson.OPT_INDENT_2)
+    return json.dumps(contenido, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def ubicar_secciones(datos):
+    """
+    Ubica el valor de cada sección de primer nivel dentro del archivo
+
+    Args:
+        datos: Contenido del archivo (bytes)
+
+    Returns:
+        Diccionario ordenado {seccion: (inicio, fin)} con los rangos de bytes,
+        o None si el archivo no tiene el formato esperado (p. ej. saltos de
+        línea CRLF o JSON compacto) y hay que parsearlo completo
+    """
+    datos_sin_final = datos.rstrip()
+    if not datos.startswith(b'{\n  "') or not datos_sin_final.endswith(b'\n}'):
+        return None
+
+    # Las claves de primer nivel son las únicas líneas con exactamente 2
+    # espacios antes de la comilla (los strings JSON no contienen saltos de línea)
+    inicios = []
+    posicion = 1
+    while posicion != -1:
+        inicios.append(posicion)
+        posicion = datos.find(b'\n  "', posicion + 1, len(datos_sin_final))
+
+    ubicaciones = {}
+    for i, inicio in enumerate(inicios):
+        separador = datos.find(b'": ', inicio)
+        if separador == -1:
+            return None
+        try:
+            nombre = json.loads(datos[inicio + 3:separador + 1])
+        except ValueError:
+            return None
+
+        # El valor termina en la coma antes de la siguiente sección, o en el '}' final
+        fin = inicios[i + 1] - 1 if i + 1 < len(inicios) else len(datos_sin_final) - 2
+        ubicaciones[nombre] = (separador + 3, fin)
+
+    return ubicaciones
+
+
+def serializar_diccionario(diccionario):
+    """
+    Serializa el diccionario completo con el formato de json.dump(indent=2).
+    Las secciones sin cambios de un DiccionarioPerezoso se copian tal cual
+    del archivo original, sin volver a serializarlas.
+    """
+    partes = []
+    for nombre in diccionario:
+        cuerpo = None
+        if isinstance(diccionario, DiccionarioPerezoso):
+            cuerpo = diccionario.bytes_originales(nombre)
+        if cuerpo is None:
+            cuerpo = serializar_json(diccionario[nombre]).replace(b'\n', b'\n  ')
+        partes.append(b'  ' + serializar_json(nombre) + b': ' + cuerpo)
+
+    return b'{\n' + b',\n'.join(partes) + b'\n}'
+
+
+class DiccionarioPerezoso(MutableMapping):
+    """
+    Diccionario de secciones que parsea cada sección recién en el primer acceso
+    y recuerda cuáles cambiaron para no reescribir las demás.
+    Solo guarda en bytes las secciones que todavía no se cargaron.
+    La primera carga de cada sección va bajo un lock: las etapas y las
+    consultas anticipadas pueden pedir la misma sección desde varios hilos.
+    """
+
+    def __init__(self, datos, ubicaciones, fabrica, firma=None):
+        """
+        Args:
+            datos: Contenido del archivo (bytes)
+            ubicaciones: Resultado de ubicar_secciones(datos)
+            fabrica: Función (nombre, entradas) que construye la sección en memoria
+                     (p. ej. SeccionDiccionario, que lleva registro de los cambios)
+            firma: Identificación del archivo leído (tamaño, fecha, inodo), para
+                   saber al guardar si otro proceso lo reescribió
+        """
+        self.fabrica = fabrica
+        self.firma = firma
+        self.datos = datos
+        self.ubicaciones = dict(ubicaciones)
+        self.en_archivo = set(ubicaciones)
+        self.orden = list(ubicaciones)
+        self.secciones = {}
+        self.reemplazadas = set()
+        self.eliminadas = set()
+        self.bloqueo = threading.Lock()
+
+    @classmethod
+    def desde_dict(cls, contenido, fabrica, firma=None):
+        """
+        Crea el diccionario a partir de contenido ya parseado (todo cuenta como cambio)
+
+        Args:
+            contenido: Diccionario {seccion: entradas}
+            fabrica, firma: Igual que en el constructor
+        """
+        diccionario = cls(b'', {}, fabrica, firma)
+        for nombre, entradas in contenido.items():
+            diccionario[nombre] = fabrica(nombre, entradas)
+        return diccionario
+
+    def crudo(self, nombre):
+        """Bytes de una sección en el archivo, o None si ya no están disponibles"""
+        if nombre not in self.ubicaciones:
+            return None
+        inicio, fin = self.ubicaciones[nombre]
+        return self.datos[inicio:fin]
+
+    def __getitem__(self, nombre):
+        seccion = self.secciones.get(nombre)
+        if seccion is not None:
+            return seccion
+
+        with self.bloqueo:
+            # Otro hilo pudo cargarla mientras se esperaba el lock
+            if nombre not in self.secciones:
+                crudo = self.crudo(nombre)
+                if crudo is None:
+                    raise KeyError(nombre)
+                self.secciones[nombre] = self.fabrica(nombre, cargar_json(crudo))
+                self.liberar(nombre)
+            return self.secciones[nombre]
+
+    def liberar(self, nombre):
+        """Olvida los bytes de una sección ya cargada; sin secciones pendientes se suelta el archivo"""
+        if nombre in self.reemplazadas:
+            return
+        self.ubicaciones.pop(nombre, None)
+        if not self.ubicaciones:
+            self.datos = b''
+
+    def __setitem__(self, nombre, seccion):
+        if self.secciones.get(nombre) is not seccion:
+            self.reemplazadas.add(nombre)
+        self.secciones[nombre] = seccion
+        if nombre not in self.orden:
+            self.orden.append(nombre)
+
+    def __delitem__(self, nombre):
+        if nombre not in self.orden:
+            raise KeyError(nombre)
+        self.orden.remove(nombre)
+        self.secciones.pop(nombre, None)
+        self.ubicaciones.pop(nombre, None)
+        self.eliminadas.add(nombre)
+
+    def __contains__(self, nombre):
+        # Sin cargar la sección
+        return nombre in self.orden
+
+    def __iter__(self):
+        return iter(list(self.orden))
+
+    def __len__(self):
+        return len(self.orden)
+
+    def cantidad(self, nombre):
+        """
+        Cantidad de entradas de una sección sin cargarla: en el formato de
+        json.dump(indent=2) cada clave de una sección empieza su propia línea
+        con 4 espacios de sangría
+        """
+        if nombre in self.secciones or nombre not in self.ubicaciones:
+            return len(self[nombre]) if nombre in self else 0
+        return self.crudo(nombre).count(b'\n    "')
+
+    def sin_cambios(self, nombre):
+        """Indica si la sección sigue igual que en el archivo"""
+        if nombre in self.reemplazadas or nombre not in self.en_archivo:
+            return False
+        if nombre not in self.secciones:
+            return True
+        seccion = self.secciones[nombre]
+        cambios = getattr(seccion, 'cambios', None)
+        return cambios is not None and not cambios and not seccion.eliminadas
+
+    def hay_cambios(self):
+        """Indica si hay algo que escribir"""
+        return bool(self.eliminadas) or not all(self.sin_cambios(nombre) for nombre in self.orden)
+
+    def cambios_de(self, nombre):
+        """
+        Cambios de esta ejecución en una sección
+
+        Returns:
+            Tupla ({clave: valor} agregadas o modificadas, claves eliminadas,
+            {clave: valor en el archivo} de las claves tocadas)
+        """
+        seccion = self[nombre]
+
+        if nombre not in self.reemplazadas and getattr(seccion, 'cambios', None) is not None:
+            return seccion.cambios, seccion.eliminadas, seccion.originales
+
+        # Sección reemplazada sin registro de cambios: se compara contra el archivo
+        crudo = self.crudo(nombre)
+        original = cargar_json(crudo) if crudo is not None else {}
+        cambios = {clave: valor for clave, valor in seccion.items() if original.get(clave) != valor}
+        eliminadas = {clave for clave in original if clave not in seccion}
+        return cambios, eliminadas, original
+
+    def bytes_originales(self, nombre):
+        """Bytes de la sección en el archivo si no se cargó ni cambió, o None"""
+        if not self.sin_cambios(nombre):
+            return None
+        return self.crudo(nombre)
+
+    def guardado(self, datos, firma):
+        """Toma el contenido recién escrito como nueva base"""
+        ubicaciones = ubicar_secciones(datos) or {}
+        self.firma = firma
+        self.datos = datos
+        self.ubicaciones = {nombre: rango for nombre, rango in ubicaciones.items() if nombre not in self.secciones}
+        if not self.ubicaciones:
+            self.datos = b''
+        self.en_archivo = set(ubicaciones)
+        self.orden = list(ubicaciones)
+        self.reemplazadas = set()
+        self.eliminadas = set()
@@ -0,0 +1,201 @@
+"""
+diccionario_journal.py
+Journal de solo-agregado (write-ahead) para los cambios del diccionario
+"""
+
+import glob
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from .bloqueo_archivo import intentar_bloqueo
+
+
+class JournalDiccionario:
+    """
+    Registra cada entrada nueva del diccionario en una línea JSON en cuanto se crea.
+    Si la ejecución se interrumpe, las entradas se recuperan al cargar; si
+    termina bien, DiccionarioManager las compacta en el archivo base y el
+    journal se borra (solo sirve para recuperarse de un corte).
+
+    Cada línea pasa al sistema operativo al escribirla (sobrevive a que el
+    proceso se corte); el fsync a disco se hace por tandas, cada
+    fsync_entradas entradas o fsync_segundos segundos, así que un corte de
+    luz puede perder como mucho la última tanda.
+
+    Cada proceso escribe su propio archivo (<journal_file>.<pid>) y lo mantiene
+    bloqueado mientras corre: al cargar solo se recuperan los journals que no
+    están bloqueados, es decir, los de ejecuciones que ya terminaron o se cortaron.
+    """
+
+    def __init__(self, journal_file, logger, fsync=True, fsync_entradas=100, fsync_segundos=1.0):
+        """
+        Inicializa el journal
+
+        Args:
+            journal_file: Ruta base del journal (JSON lines); cada proceso usa <ruta>.<pid>
+            logger: Instancia de Logger para registrar mensajes
+            fsync: Si True, fuerza las entradas a disco (no solo al buffer del sistema)
+            fsync_entradas: Entradas escritas entre un fsync y el siguiente
+            fsync_segundos: Segundos máximos entre un fsync y el siguiente
+                            (se revisa al escribir cada entrada)
+        """
+        self.journal_base = journal_file
+        self.journal_file = f'{journal_file}.{os.getpid()}'
+        self.logger = logger
+        self.fsync = fsync
+        self.fsync_entradas = fsync_entradas
+        self.fsync_segundos = fsync_segundos
+        self.lock = threading.Lock()
+        self.archivo = None
+        self.entradas = 0
+        self.sin_sincronizar = 0
+        self.ultimo_fsync = time.monotonic()
+        self.en_lote = False
+        self.adoptados = []
+
+    def abrir(self):
+        """Abre el journal en modo append (se llama al primer registro)"""
+        if self.archivo is None:
+            self.archivo = open(self.journal_file, 'a', encoding='utf-8')
+            intentar_bloqueo(self.archivo)
+
+    def escribir(self, registro):
+        """Agrega un registro (fsync por tandas, ver la clase)"""
+        linea = json.dumps(registro, ensure_ascii=False) + '\n'
+
+        with self.lock:
+            self.abrir()
+            self.archivo.write(linea)
+            self.archivo.flush()
+            self.entradas += 1
+            self.sin_sincronizar += 1
+            if self.fsync and not self.en_lote and (
+                    self.sin_sincronizar >= self.fsync_entradas
+                    or time.monotonic() - self.ultimo_fsync >= self.fsync_segundos):
+                self._fsync()
+
+    def registrar(self, seccion, clave, valor):
+        """Registra una entrada nueva o modificada"""
+        self.escribir({'s': seccion, 'k': clave, 'v': valor})
+
+    def registrar_eliminacion(self, seccion, clave):
+        """Registra la eliminación de una entrada"""
+        self.escribir({'s': seccion, 'k': clave, 'd': 1})
+
+    @contextmanager
+    def lote(self):
+        """
+        Agrupa muchos registros (p. ej. una migración) con un solo fsync al final
+        """
+        self.en_lote = True
+        try:
+            yield self
+        finally:
+            self.en_lote = False
+            self.sincronizar()
+
+    def reproducir(self, diccionario):
+        """
+        Aplica al diccionario las entradas de los journals pendientes (en orden).
+        Los journals recuperados quedan bloqueados por este proceso hasta vaciar().
+
+        Args:
+            diccionario: Diccionario cuyas secciones son SeccionDiccionario
+
+        Returns:
+            Cantidad de registros aplicados
+        """
+        candidatos = [self.journal_base] + glob.glob(glob.escape(self.journal_base) + '.*')
+        candidatos = [ruta for ruta in candidatos if os.path.exists(ruta)]
+        candidatos.sort(key=os.path.getmtime)
+
+        aplicados = 0
+        for ruta in candidatos:
+            archivo = open(ruta, 'r+b')
+            if not intentar_bloqueo(archivo):
+                archivo.close()
+                self.logger.log(f"ℹ️ Journal {os.path.basename(ruta)} en uso por otra ejecución")
+                continue
+
+            aplicados += self.reproducir_archivo(archivo, diccionario)
+            self.adoptados.append((ruta, archivo))
+
+        self.entradas = aplicados
+        return aplicados
+
+    def reproducir_archivo(self, archivo, diccionario):
+        """Aplica las entradas de un journal abierto y corta su cola dañada"""
+        aplicados = 0
+        valido_hasta = 0
+
+        archivo.seek(0)
+        for numero, linea in enumerate(archivo, 1):
+            try:
+                if not linea.endswith(b'\n'):
+                    raise ValueError('línea sin terminar')
+                registro = json.loads(linea)
+            except ValueError:
+                # Última línea a medio escribir si la ejecución se cortó
+                self.logger.log(f"⚠️ Journal: línea {numero} incompleta, se descarta")
+                break
+
+            valido_hasta += len(linea)
+            seccion = diccionario.get(registro['s'])
+            if seccion is None:
+                continue
+
+            if registro.get('d'):
+                seccion.aplicar_eliminacion(registro['k'])
+            else:
+                seccion.aplicar(registro['k'], registro['v'])
+            aplicados += 1
+
+        archivo.truncate(valido_hasta)
+        return aplicados
+
+    def _fsync(self):
+        """Fuerza a disco lo escrito (con self.lock tomado)"""
+        if self.archivo is not None:
+            self.archivo.flush()
+            os.fsync(self.archivo.fileno())
+        self.sin_sincronizar = 0
+        self.ultimo_fsync = time.monotonic()
+
+    def sincronizar(self):
+        """Fuerza a disco lo escrito hasta ahora"""
+        with self.lock:
+            self._fsync()
+
+    def vaciar(self):
+        """Elimina el journal propio y los recuperados después de compactarlos en el archivo base"""
+        with self.lock:
+            if self.archivo is not None:
+                self.archivo.close()
+                self.archivo = None
+            if os.path.exists(self.journal_file):
+                os.remove(self.journal_file)
+
+            for ruta, archivo in self.adoptados:
+                try:
+                    # Borrar antes de soltar el bloqueo (en Windows no se puede: se cierra primero)
+                    os.remove(ruta)
+                    archivo.close()
+                except OSError:
+                    archivo.close()
+                    if os.path.exists(ruta):
+                        os.remove(ruta)
+            self.adoptados = []
+            self.entradas = 0
+
+    def cerrar(self):
+        """Cierra el journal propio y libera los recuperados"""
+        with self.lock:
+            if self.archivo is not None:
+                self.archivo.close()
+                self.archivo = None
+            for _, archivo in self.adoptados:
+                archivo.close()
+            self.adoptados = []
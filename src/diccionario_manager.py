@@ -4,15 +4,26 @@ Gestión del diccionario de normalizaciones con backups
 """
 
 import os
-import json
-import shutil
+import sqlite3
+from contextlib import nullcontext
 from datetime import datetime
 
+from .backups_diccionario import BackupsDiccionario
+from .bloqueo_archivo import BloqueoArchivo
+from .diccionario_codec import (
+    DiccionarioPerezoso, cargar_json, serializar_diccionario, ubicar_secciones
+)
+from .diccionario_sqlite import DiccionarioSQLite, SeccionSQLite, SECCIONES
+from .diccionario_journal import JournalDiccionario
+from .seccion_diccionario import SeccionDiccionario, TablaValores
+
 
 class DiccionarioManager:
     """Manejador del diccionario de normalizaciones"""
     
-    def __init__(self, diccionario_file, backup_dir, logger):
+    def __init__(self, diccionario_file, backup_dir, logger, backend='json', db_file=None,
+                 journal_file=None, journal_fsync=True, journal_fsync_entradas=100,
+                 journal_fsync_segundos=1.0, deltas_por_base=30, retencion_dias=365):
         """
         Inicializa el gestor de diccionario
         
@@ -20,61 +31,378 @@ class DiccionarioManager:
             diccionario_file: Ruta del archivo JSON del diccionario
             backup_dir: Carpeta donde guardar backups
             logger: Instancia de Logger para registrar mensajes
+            backend: 'json' (archivo único) o 'sqlite' (una tabla por sección)
+            db_file: Ruta de la base SQLite (solo con backend 'sqlite')
+            journal_file: Ruta del journal de cambios (solo con backend 'json').
+                          Si es None no se usa journal.
+            journal_fsync: Forzar las entradas del journal a disco (por tandas)
+            journal_fsync_entradas: Entradas del journal entre un fsync y el siguiente
+            journal_fsync_segundos: Segundos máximos entre un fsync y el siguiente
+            deltas_por_base: Backups incrementales entre snapshots completas
+            retencion_dias: Antigüedad máxima de los backups
         """
         self.diccionario_file = diccionario_file
         self.backup_dir = backup_dir
         self.logger = logger
+        self.backend = backend
+        self.db_file = db_file
+        self.almacen = None
+        self.backups = BackupsDiccionario(backup_dir, logger, deltas_por_base, retencion_dias)
+        self.tabla_valores = TablaValores()
+        
+        # Versión del backup restaurada si el archivo no se pudo leer al cargar
+        self.restaurado = None
+        
+        self.journal = None
+        if journal_file and backend != 'sqlite':
+            self.journal = JournalDiccionario(
+                journal_file, logger, fsync=journal_fsync,
+                fsync_entradas=journal_fsync_entradas, fsync_segundos=journal_fsync_segundos
+            )
     
     def cargar_diccionario(self):
         """Carga el diccionario de normalizaciones previas"""
-        if os.path.exists(self.diccionario_file):
-            try:
-                with open(self.diccionario_file, 'r', encoding='utf-8') as f:
-                    diccionario = json.load(f)
-                    if 'urls' not in diccionario:
-                        diccionario['urls'] = {}
-                    if 'formularios' not in diccionario:
-                        diccionario['formularios'] = {}
-                    return diccionario
-            except:
-                pass
-        
-        return {
-            'colegios': {},
-            'grados': {},
-            'urls': {},
-            'formularios': {}
-        }
+        if self.backend == 'sqlite':
+            return self.cargar_diccionario_sqlite()
+        
+        diccionario = self.leer_diccionario()
+        for seccion in SECCIONES:
+            if seccion not in diccionario:
+                diccionario[seccion] = self.crear_seccion(seccion, {})
+        
+        if self.journal is not None:
+            recuperadas = self.journal.reproducir(diccionario)
+            if recuperadas:
+                self.logger.log(f"♻️ Journal: {recuperadas} entradas recuperadas de una ejecución anterior")
+        
+        return diccionario
+    
+    def crear_seccion(self, nombre, entradas):
+        """
+        Sección en memoria que registra sus cambios (y los escribe en el journal, si hay).
+        Los valores repetidos se comparten a través de la tabla de valores.
+        """
+        return SeccionDiccionario(nombre, entradas, self.journal, self.tabla_valores)
+    
+    def leer_diccionario(self):
+        """
+        Abre el archivo JSON sin parsear las secciones: cada una se carga
+        en el primer acceso (si el formato no lo permite, se parsea completo).
+        Si el archivo está dañado se restaura el último backup.
+        """
+        try:
+            datos, firma = self.leer_bytes()
+            return self.abrir_bytes(datos, self.crear_seccion, firma)
+        except (OSError, ValueError) as e:
+            self.logger.log(f"⚠️ No se pudo leer {self.diccionario_file}: {e}")
+            return self.restaurar_backup()
+    
+    def restaurar_backup(self):
+        """
+        Diccionario del último backup, para cuando el archivo no se puede leer.
+        Sin backups se empieza vacío, y al guardar no se sobrescribe el archivo
+        (ver compactar).
+        """
+        try:
+            contenido, version = self.backups.restaurar()
+        except (OSError, ValueError) as e:
+            self.logger.log(f"⚠️ No hay backup que restaurar ({e}): se empieza con el diccionario vacío")
+            return DiccionarioPerezoso.desde_dict({}, self.crear_seccion)
+        
+        self.restaurado = version
+        self.logger.log(f"♻️ Diccionario restaurado del backup del {version['fecha']}")
+        return DiccionarioPerezoso.desde_dict(contenido, self.crear_seccion)
+    
+    def cargar_diccionario_sqlite(self):
+        """
+        Abre el diccionario en SQLite sin cargarlo en memoria.
+        La primera vez importa el JSON existente.
+        """
+        self.almacen = DiccionarioSQLite(self.db_file, self.logger)
+        
+        if self.almacen.esta_vacio() and os.path.exists(self.diccionario_file):
+            self.logger.log(f"🗄️ Base SQLite nueva: importando {self.diccionario_file}")
+            self.almacen.importar_json(self.diccionario_file)
+        
+        return {seccion: SeccionSQLite(self.almacen, seccion) for seccion in SECCIONES}
+    
+    def guardar_diccionario_sqlite(self, diccionario):
+        """
+        Guarda solo las entradas nuevas o modificadas en una transacción,
+        después de una copia de la base en backup_dir (si hay algo que guardar)
+        """
+        secciones = [s for s in diccionario.values() if isinstance(s, SeccionSQLite)]
+        
+        if any(s.cambios or s.eliminadas for s in secciones):
+            self.respaldar_sqlite()
+        
+        total = self.almacen.guardar_cambios(
+            {s.seccion: s.cambios for s in secciones},
+            {s.seccion: s.eliminadas for s in secciones}
+        )
+        
+        for seccion in secciones:
+            seccion.marcar_guardado()
+        
+        self.logger.log(f"✅ Diccionario guardado en SQLite: {total} entradas nuevas o modificadas")
+        for seccion in secciones:
+            self.logger.log(f"   • {len(seccion)} {seccion.seccion}")
+    
+    def respaldar_sqlite(self):
+        """Copia completa de la base (diccionario_backup_<fecha>.sqlite) y limpieza de las viejas"""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        backup_name = f'diccionario_backup_{timestamp}.sqlite'
+        
+        try:
+            os.makedirs(self.backup_dir, exist_ok=True)
+            self.almacen.respaldar(os.path.join(self.backup_dir, backup_name))
+            self.logger.log(f"💾 Backup creado: {backup_name}")
+        except (sqlite3.Error, OSError) as e:
+            self.logger.log(f"⚠️ No se pudo crear backup: {e}")
+        
+        self.limpiar_backups_antiguos()
+    
+    def exportar_json(self, json_file=None):
+        """Exporta la base SQLite al formato JSON actual"""
+        self.almacen.exportar_json(json_file or self.diccionario_file)
+    
+    def leer_bytes(self):
+        """
+        Contenido actual del archivo base
+        
+        Returns:
+            Tupla (bytes, firma) donde firma identifica la versión del archivo
+            (tamaño, fecha de modificación, inodo). (b'', None) si no existe.
+        """
+        if not os.path.exists(self.diccionario_file):
+            return b'', None
+        with open(self.diccionario_file, 'rb') as f:
+            estado = os.fstat(f.fileno())
+            return f.read(), (estado.st_size, estado.st_mtime_ns, estado.st_ino)
+    
+    def abrir_bytes(self, datos, fabrica, firma=None):
+        """DiccionarioPerezoso sobre un contenido ya leído"""
+        ubicaciones = ubicar_secciones(datos)
+        if ubicaciones is not None:
+            return DiccionarioPerezoso(datos, ubicaciones, fabrica, firma)
+        return DiccionarioPerezoso.desde_dict(cargar_json(datos) if datos else {}, fabrica, firma)
+    
+    def escribir_atomico(self, datos):
+        """
+        Escribe en un temporal y lo renombra: nunca queda un archivo a medio escribir
+        
+        Returns:
+            Firma del archivo escrito (ver leer_bytes)
+        """
+        temporal = self.diccionario_file + '.tmp'
+        with open(temporal, 'wb') as f:
+            f.write(datos)
+            f.flush()
+            os.fsync(f.fileno())
+            estado = os.fstat(f.fileno())
+        os.replace(temporal, self.diccionario_file)
+        return estado.st_size, estado.st_mtime_ns, estado.st_ino
+    
+    def fusionar(self, diccionario, datos_disco):
+        """
+        Aplica los cambios de esta ejecución sobre el contenido actual del archivo
+        
+        Args:
+            diccionario: DiccionarioPerezoso cargado al inicio de la ejecución
+            datos_disco: Contenido actual del archivo (bytes)
+        
+        Returns:
+            Tupla (DiccionarioPerezoso combinado, conflictos) donde cada conflicto es
+            (seccion, clave, valor_de_la_otra_ejecucion, valor_conservado).
+            Un conflicto es una clave que esta ejecución y otra cambiaron distinto;
+            se conserva el valor de esta ejecución (o su eliminación).
+        """
+        disco = self.abrir_bytes(datos_disco, lambda nombre, entradas: entradas)
+        conflictos = []
+        
+        for nombre in diccionario:
+            if diccionario.sin_cambios(nombre):
+                continue
+            
+            cambios, eliminadas, original = diccionario.cambios_de(nombre)
+            destino = disco[nombre] if nombre in disco else {}
+            
+            for clave, valor in cambios.items():
+                otro_valor = destino.get(clave)
+                if otro_valor is not None and otro_valor != valor and otro_valor != original.get(clave):
+                    conflictos.append((nombre, clave, otro_valor, valor))
+                destino[clave] = valor
+            
+            for clave in eliminadas:
+                otro_valor = destino.pop(clave, None)
+                if otro_valor is not None and otro_valor != original.get(clave):
+                    conflictos.append((nombre, clave, otro_valor, None))
+            
+            disco[nombre] = destino
+        
+        for nombre in diccionario.eliminadas:
+            if nombre in disco:
+                del disco[nombre]
+        
+        return disco, conflictos
+    
+    def lote(self):
+        """Contexto para cambios masivos: con journal, un solo fsync al final"""
+        if self.journal is None:
+            return nullcontext()
+        return self.journal.lote()
     
     def guardar_diccionario(self, diccionario):
-        """Guarda el diccionario actualizado con backup"""
-        if os.path.exists(self.diccionario_file):
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            backup_name = f'diccionario_backup_{timestamp}.json'
-            backup_path = os.path.join(self.backup_dir, backup_name)
+        """
+        Guarda el diccionario actualizado al terminar la ejecución.
+        Con journal, compacta sus entradas en el archivo base y lo vacía: el
+        journal solo queda en disco si la ejecución se corta antes de llegar acá.
+        """
+        if self.backend == 'sqlite':
+            return self.guardar_diccionario_sqlite(diccionario)
+        
+        self.compactar(diccionario)
+    
+    def compactar(self, diccionario):
+        """
+        Escribe el diccionario en el archivo base (con backup) y vacía el journal.
+        
+        Bajo bloqueo de archivo: si otra ejecución guardó después de la carga,
+        se relee el archivo y se le aplican solo los cambios de esta ejecución
+        (merge-on-write). Las secciones sin cambios se copian sin volver a serializarlas.
+        
+        Si el archivo en disco no se puede leer, se reemplaza solo cuando el
+        diccionario se restauró de un backup (el archivo dañado se conserva
+        en '.danado'); si no, no se sobrescribe y esta ejecución se guarda en '.nuevo'.
+        """
+        if not isinstance(diccionario, DiccionarioPerezoso):
+            diccionario = DiccionarioPerezoso.desde_dict(diccionario, self.crear_seccion)
+        
+        # Sin cambios propios no hay nada que escribir (lo de otras ejecuciones ya está en disco)
+        if not diccionario.hay_cambios():
+            if self.journal is not None:
+                self.journal.vaciar()
+            self.logger.log("✅ Diccionario sin cambios: no se reescribe")
+            return
+        
+        with BloqueoArchivo(self.diccionario_file + '.lock', self.logger):
+            datos_disco, firma_disco = self.leer_bytes()
+            conflictos = []
             
+            if firma_disco == diccionario.firma:
+                resultado = diccionario
+            else:
+                try:
+                    resultado, conflictos = self.fusionar(diccionario, datos_disco)
+                    self.logger.log("🔀 El diccionario cambió en disco desde la carga: combinando con los cambios de esta ejecución")
+                except ValueError as e:
+                    if self.restaurado is None:
+                        self.guardar_aparte(diccionario, e)
+                        return
+                    self.logger.log(f"⚠️ {self.diccionario_file} no se puede leer ({e}): se reemplaza por el backup "
+                                    f"restaurado más los cambios de esta ejecución (copia del dañado en {self.diccionario_file}.danado)")
+                    with open(self.diccionario_file + '.danado', 'wb') as f:
+                        f.write(datos_disco)
+                    # El backup restaurado es la última versión: el delta va sobre ella
+                    resultado, datos_disco = diccionario, b''
+            
+            datos = serializar_diccionario(resultado)
+            
+            # Backup incremental: solo lo que cambió respecto al archivo actual
             try:
-                shutil.copy2(self.diccionario_file, backup_path)
-                self.logger.log(f"💾 Backup creado: {backup_name}")
+                self.backups.respaldar(datos_disco, datos, resultado, self.delta_respaldo(diccionario, resultado))
             except Exception as e:
                 self.logger.log(f"⚠️ No se pudo crear backup: {e}")
             
             self.limpiar_backups_antiguos()
+            
+            firma = self.escribir_atomico(datos)
+            
+            if self.journal is not None:
+                # El archivo base ya contiene todo lo del journal
+                self.journal.vaciar()
+        
+        # Reflejar en memoria lo que agregaron otras ejecuciones
+        if resultado is not diccionario:
+            for nombre in list(diccionario.secciones):
+                seccion = diccionario.secciones[nombre]
+                if isinstance(seccion, SeccionDiccionario) and nombre in resultado:
+                    seccion.recargar(resultado[nombre])
+        
+        for seccion in diccionario.secciones.values():
+            if isinstance(seccion, SeccionDiccionario):
+                seccion.marcar_guardado()
+        diccionario.guardado(datos, firma)
         
-        with open(self.diccionario_file, 'w', encoding='utf-8') as f:
-            json.dump(diccionario, indent=2, ensure_ascii=False, fp=f)
+        for nombre, clave, otro_valor, valor in conflictos:
+            conservado = f"'{valor}'" if valor is not None else 'la eliminación'
+            self.logger.log(f"⚠️ Conflicto en {nombre} '{clave}': otra ejecución guardó '{otro_valor}', se conserva {conservado}")
         
-        total_colegios = len(diccionario.get('colegios', {}))
-        total_urls = len(diccionario.get('urls', {}))
-        total_forms = len(diccionario.get('formularios', {}))
+        total_colegios = diccionario.cantidad('colegios')
+        total_urls = diccionario.cantidad('urls')
+        total_forms = diccionario.cantidad('formularios')
         
         self.logger.log(f"✅ Diccionario guardado:")
         self.logger.log(f"   • {total_colegios} colegios")
         self.logger.log(f"   • {total_urls} URLs")
         self.logger.log(f"   • {total_forms} formularios")
     
+    def guardar_aparte(self, diccionario, error):
+        """
+        El archivo en disco no se puede leer y no hay backup del que partir:
+        no se sobrescribe, y el diccionario de esta ejecución queda en '.nuevo'
+        (el journal, si hay, se conserva)
+        """
+        ruta = self.diccionario_file + '.nuevo'
+        with open(ruta, 'wb') as f:
+            f.write(serializar_diccionario(diccionario))
+        self.logger.log(f"❌ {self.diccionario_file} no se puede leer ({error}) y no hay backup: no se sobrescribe. "
+                        f"El diccionario de esta ejecución quedó en {ruta}")
+    
+    def delta_respaldo(self, diccionario, resultado):
+        """
+        Delta para el backup a partir de los cambios registrados en esta ejecución
+        (sin recorrer ni cargar las secciones que no se tocaron)
+        
+        Args:
+            diccionario: DiccionarioPerezoso de esta ejecución
+            resultado: Lo que se va a escribir (el mismo diccionario o el combinado
+                       con lo que otra ejecución guardó en el archivo)
+        
+        Returns:
+            Diccionario {seccion: {'+': {clave: valor}, '-': [claves]}}; None en
+            las secciones eliminadas
+        """
+        delta = {}
+        
+        for nombre in diccionario:
+            if diccionario.sin_cambios(nombre):
+                continue
+            
+            cambios, eliminadas, original = diccionario.cambios_de(nombre)
+            
+            if resultado is diccionario:
+                # Contra el archivo cargado: se descartan los valores que volvieron al original
+                agregadas = {clave: valor for clave, valor in cambios.items() if original.get(clave) != valor}
+                quitadas = [clave for clave in eliminadas if original.get(clave) is not None]
+            else:
+                seccion = resultado[nombre]
+                agregadas = {clave: seccion[clave] for clave in cambios if clave in seccion}
+                quitadas = [clave for clave in eliminadas if clave not in seccion]
+            
+            if agregadas or quitadas or nombre not in diccionario.en_archivo:
+                delta[nombre] = {'+': agregadas, '-': quitadas}
+        
+        for nombre in diccionario.eliminadas:
+            delta[nombre] = None
+        
+        return delta
+    
     def limpiar_backups_antiguos(self, max_backups=10):
-        """Mantiene solo los últimos N backups"""
+        """
+        Mantiene solo las últimas N copias completas: las del formato anterior
+        (diccionario_backup_*.json) y las de la base SQLite (diccionario_backup_*.sqlite)
+        """
         try:
             backups = [f for f in os.listdir(self.backup_dir) if f.startswith('diccionario_backup_')]
             backups.sort(reverse=True)
@@ -84,4 +412,4 @@ class DiccionarioManager:
                 os.remove(backup_path)
                 self.logger.log(f"🗑️ Backup antiguo eliminado: {backup}")
         except Exception as e:
-            self.logger.log(f"⚠️ Error al limpiar backups: {e}")
\ No newline at end of file
+            self.logger.log(f"⚠️ Error al limpiar backups: {e}")
@@ -0,0 +1,276 @@
+"""
+diccionario_sqlite.py
+Almacenamiento opcional del diccionario de normalizaciones en SQLite
+"""
+
+import json
+import sqlite3
+import threading
+from collections.abc import ItemsView, MutableMapping
+from itertools import islice
+
+
+# Secciones del diccionario (una tabla por sección)
+SECCIONES = ('colegios', 'grados', 'urls', 'formularios')
+
+
+class DiccionarioSQLite:
+    """Almacén SQLite con una tabla indexada por sección del diccionario"""
+
+    def __init__(self, db_file, logger):
+        """
+        Abre (o crea) la base de datos del diccionario
+
+        Args:
+            db_file: Ruta del archivo SQLite
+            logger: Instancia de Logger para registrar mensajes
+        """
+        self.db_file = db_file
+        self.logger = logger
+        self.lock = threading.Lock()
+
+        self.conexion = sqlite3.connect(db_file, check_same_thread=False)
+        self.conexion.execute('PRAGMA journal_mode=WAL')
+        self.conexion.execute('PRAGMA synchronous=NORMAL')
+
+        with self.conexion:
+            for seccion in SECCIONES:
+                # La clave primaria es el índice de las búsquedas puntuales
+                self.conexion.execute(
+                    f'CREATE TABLE IF NOT EXISTS {seccion} '
+                    f'(clave TEXT PRIMARY KEY, valor TEXT NOT NULL) WITHOUT ROWID'
+                )
+
+    def validar_seccion(self, seccion):
+        """Evita armar SQL con nombres de tabla desconocidos"""
+        if seccion not in SECCIONES:
+            raise KeyError(f"Sección desconocida: {seccion}")
+
+    def obtener(self, seccion, clave):
+        """Búsqueda puntual por clave. Retorna el valor o None si no existe"""
+        self.validar_seccion(seccion)
+        with self.lock:
+            fila = self.conexion.execute(
+                f'SELECT valor FROM {seccion} WHERE clave = ?', (clave,)
+            ).fetchone()
+        return fila[0] if fila else None
+
+    def contar(self, seccion):
+        """Cantidad de entradas de una sección"""
+        self.validar_seccion(seccion)
+        with self.lock:
+            return self.conexion.execute(f'SELECT COUNT(*) FROM {seccion}').fetchone()[0]
+
+    def esta_vacio(self):
+        """Indica si ninguna sección tiene entradas"""
+        return all(self.contar(seccion) == 0 for seccion in SECCIONES)
+
+    def items(self, seccion):
+        """Recorre las entradas de una sección sin cargarlas todas en memoria"""
+        self.validar_seccion(seccion)
+        with self.lock:
+            cursor = self.conexion.execute(f'SELECT clave, valor FROM {seccion}')
+
+        while True:
+            with self.lock:
+                filas = cursor.fetchmany(1000)
+            if not filas:
+                break
+            yield from filas
+
+    def claves(self, seccion):
+        """Recorre las claves de una sección"""
+        return (clave for clave, _ in self.items(seccion))
+
+    def guardar_cambios(self, cambios, eliminadas=None):
+        """
+        Upsert transaccional de las entradas nuevas o modificadas
+
+        Args:
+            cambios: Diccionario {seccion: {clave: valor}}
+            eliminadas: Diccionario opcional {seccion: claves a borrar}
+
+        Returns:
+            Cantidad de entradas escritas
+        """
+        eliminadas = eliminadas or {}
+        total = 0
+
+        with self.lock, self.conexion:
+            for seccion, claves in eliminadas.items():
+                self.validar_seccion(seccion)
+                self.conexion.executemany(
+                    f'DELETE FROM {seccion} WHERE clave = ?',
+                    ((clave,) for clave in claves)
+                )
+
+            for seccion, entradas in cambios.items():
+                self.validar_seccion(seccion)
+                self.conexion.executemany(
+                    f'INSERT INTO {seccion} (clave, valor) VALUES (?, ?) '
+                    f'ON CONFLICT(clave) DO UPDATE SET valor = excluded.valor',
+                    entradas.items()
+                )
+                total += len(entradas)
+
+        return total
+
+    def importar_json(self, json_file):
+        """
+        Importa un diccionario en el formato JSON actual
+
+        Returns:
+            Cantidad de entradas importadas
+        """
+        with open(json_file, 'r', encoding='utf-8') as f:
+            diccionario = json.load(f)
+
+        cambios = {seccion: diccionario.get(seccion, {}) for seccion in SECCIONES}
+        total = self.guardar_cambios(cambios)
+        self.logger.log(f"📥 Importadas {total} entradas desde {json_file}")
+        return total
+
+    def exportar_json(self, json_file):
+        """Exporta la base al formato JSON actual (compatible con cargar_diccionario)"""
+        diccionario = {seccion: dict(self.items(seccion)) for seccion in SECCIONES}
+
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(diccionario, indent=2, ensure_ascii=False, fp=f)
+
+        self.logger.log(f"📤 Diccionario exportado a {json_file}")
+
+    def respaldar(self, destino):
+        """Copia consistente de la base en otro archivo (API de backup de SQLite)"""
+        copia = sqlite3.connect(destino)
+        try:
+            with self.lock:
+                self.conexion.backup(copia)
+        finally:
+            copia.close()
+
+    def cerrar(self):
+        """Cierra la conexión"""
+        with self.lock:
+            self.conexion.close()
+
+
+class ItemsSQLite(ItemsView):
+    """items() de una SeccionSQLite: una sola consulta para claves y valores"""
+
+    def __iter__(self):
+        return self._mapping.recorrer_items()
+
+
+class SeccionSQLite(MutableMapping):
+    """
+    Sección del diccionario respaldada por SQLite.
+    Las lecturas son búsquedas puntuales; las escrituras quedan en memoria
+    (cambios / eliminadas) hasta que DiccionarioManager las guarda.
+
+    Se recorre como un dict: primero las claves de la base y al final las
+    nuevas de esta ejecución, en el orden en que llegaron. `modificaciones`
+    cuenta los cambios que no son agregar una clave al final (valor cambiado,
+    eliminación, guardado en la base), igual que SeccionDiccionario.
+    """
+
+    def __init__(self, almacen, seccion):
+        """
+        Args:
+            almacen: Instancia de DiccionarioSQLite
+            seccion: Nombre de la sección (tabla)
+        """
+        self.almacen = almacen
+        self.seccion = seccion
+        self.cambios = {}
+        self.eliminadas = set()
+        self.nuevas = {}
+        self.modificaciones = 0
+        self._leidas = {}
+        self._en_base = almacen.contar(seccion)
+
+    def _guardado(self, clave):
+        """Valor guardado en la base (con caché de lecturas), o None"""
+        if clave not in self._leidas:
+            self._leidas[clave] = self.almacen.obtener(self.seccion, clave)
+        return self._leidas[clave]
+
+    def __getitem__(self, clave):
+        if clave in self.cambios:
+            return self.cambios[clave]
+        valor = None if clave in self.eliminadas else self._guardado(clave)
+        if valor is None:
+            raise KeyError(clave)
+        return valor
+
+    def __contains__(self, clave):
+        if clave in self.cambios:
+            return True
+        return clave not in self.eliminadas and self._guardado(clave) is not None
+
+    def __setitem__(self, clave, valor):
+        if clave in self:
+            if self[clave] == valor:
+                return
+            self.modificaciones += 1
+        elif clave in self.eliminadas:
+            # Clave de la base eliminada en esta ejecución: vuelve a su lugar
+            self.eliminadas.discard(clave)
+            self.modificaciones += 1
+        else:
+            self.nuevas[clave] = None
+        self.cambios[clave] = valor
+
+    def __delitem__(self, clave):
+        if clave not in self:
+            raise KeyError(clave)
+        self.cambios.pop(clave, None)
+        if clave in self.nuevas:
+            del self.nuevas[clave]
+        else:
+            self.eliminadas.add(clave)
+        self.modificaciones += 1
+
+    def __iter__(self):
+        for clave in self.almacen.claves(self.seccion):
+            if clave not in self.eliminadas:
+                yield clave
+        yield from list(self.nuevas)
+
+    def __len__(self):
+        return self._en_base - len(self.eliminadas) + len(self.nuevas)
+
+    def items(self):
+        return ItemsSQLite(self)
+
+    def recorrer_items(self):
+        """(clave, valor) en el orden de __iter__, con una sola consulta a la base"""
+        for clave, valor in self.almacen.items(self.seccion):
+            if clave not in self.eliminadas:
+                yield clave, self.cambios.get(clave, valor)
+        for clave in list(self.nuevas):
+            yield clave, self.cambios[clave]
+
+    def items_desde(self, posicion):
+        """
+        (clave, valor) a partir de una posición del recorrido. Si la posición
+        cae en las claves nuevas de esta ejecución no se consulta la base
+        (p. ej. IndiceCanonico, que solo indexa lo agregado al final).
+        """
+        en_base = self._en_base - len(self.eliminadas)
+        if posicion >= en_base:
+            return [(clave, self.cambios[clave]) for clave in islice(self.nuevas, posicion - en_base, None)]
+        return islice(self.recorrer_items(), posicion, None)
+
+    def marcar_guardado(self):
+        """Limpia los cambios pendientes después de guardarlos en la base"""
+        for clave, valor in self.cambios.items():
+            self._leidas[clave] = valor
+        for clave in self.eliminadas:
+            self._leidas[clave] = None
+        if self.nuevas or self.eliminadas:
+            # En la base las claves quedan ordenadas por clave, no al final
+            self.modificaciones += 1
+        self._en_base = len(self)
+        self.cambios = {}
+        self.eliminadas = set()
+        self.nuevas = {}
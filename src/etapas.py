@@ -0,0 +1,124 @@
+"""
+etapas.py
+Planificador de las etapas de procesar_leads: cada etapa declara de qué etapas
+depende y dónde corre. Las que no preguntan nada al usuario corren a la vez
+(en un pool de hilos, o de procesos si son cálculo puro); las interactivas se
+quedan en el hilo principal, de a una y en el orden en que se declararon.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+
+
+# Dónde corre una etapa
+PRINCIPAL = 'principal'   # Hilo principal (etapas que preguntan al usuario)
+HILOS = 'hilos'           # Pool de hilos (esperas de E/S, p. ej. la API de Claude)
+PROCESOS = 'procesos'     # Pool de procesos (cálculo puro: función y argumentos serializables)
+
+
+def aplicar(funcion, serie):
+    """serie.apply(funcion) en un proceso del pool (funcion debe ser de módulo)"""
+    return serie.apply(funcion)
+
+
+class EtapaPlan:
+    """Etapa declarada en un PlanEtapas"""
+
+    def __init__(self, nombre, funcion, args, depende, en, filas):
+        """
+        Args:
+            nombre: Nombre de la etapa (también el de su medición)
+            funcion: Función de la etapa; recibe args y después el resultado
+                     de cada dependencia, en el orden de depende
+            args: Argumentos fijos de la función
+            depende: Nombres de las etapas que tienen que terminar antes
+            en: PRINCIPAL, HILOS o PROCESOS
+            filas: Filas procesadas (para la medición)
+        """
+        self.nombre = nombre
+        self.funcion = funcion
+        self.args = args
+        self.depende = tuple(depende)
+        self.en = en
+        self.filas = filas
+
+
+class PlanEtapas:
+    """
+    Grafo de etapas con sus dependencias. ejecutar() corre cada etapa en cuanto
+    terminaron las suyas y devuelve los resultados por nombre; quien llama los
+    aplica después (p. ej. las columnas del DataFrame) en un orden fijo.
+    """
+
+    def __init__(self, instrumentacion, hilos=4, procesos=0):
+        """
+        Args:
+            instrumentacion: Instancia de Instrumentacion (mide cada etapa)
+            hilos: Hilos del pool; 0 = todas las etapas en el hilo principal, en orden
+            procesos: Procesos para las etapas PROCESOS; 0 o 1 = corren en el pool de hilos
+        """
+        self.instrumentacion = instrumentacion
+        self.hilos = hilos
+        self.procesos = procesos
+        self.etapas = []
+
+    def agregar(self, nombre, funcion, *args, depende=(), en=HILOS, filas=None):
+        """Declara una etapa (sus dependencias tienen que estar declaradas antes)"""
+        declaradas = {etapa.nombre for etapa in self.etapas}
+        faltantes = [d for d in depende if d not in declaradas]
+        if faltantes:
+            raise ValueError(f"La etapa '{nombre}' depende de etapas no declaradas: {faltantes}")
+        if nombre in declaradas:
+            raise ValueError(f"Etapa repetida: '{nombre}'")
+
+        self.etapas.append(EtapaPlan(nombre, funcion, args, depende, en, filas))
+
+    def correr(self, etapa, resultados, pool_procesos=None):
+        """Corre una etapa midiendo su tiempo (en el hilo actual)"""
+        args = etapa.args + tuple(resultados[d] for d in etapa.depende)
+        with self.instrumentacion.etapa(etapa.nombre, filas=etapa.filas):
+            if etapa.en == PROCESOS and pool_procesos is not None:
+                return pool_procesos.submit(etapa.funcion, *args).result()
+            return etapa.funcion(*args)
+
+    def ejecutar(self):
+        """
+        Corre todas las etapas respetando las dependencias
+
+        Returns:
+            {nombre: resultado de la etapa}
+        """
+        resultados = {}
+        if not self.hilos:
+            for etapa in self.etapas:
+                resultados[etapa.nombre] = self.correr(etapa, resultados)
+            return resultados
+
+        usar_procesos = self.procesos > 1 and any(etapa.en == PROCESOS for etapa in self.etapas)
+        pendientes = list(self.etapas)
+        en_curso = {}
+
+        with ThreadPoolExecutor(max_workers=self.hilos, thread_name_prefix='etapa') as pool_hilos, \
+                (ProcessPoolExecutor(max_workers=self.procesos) if usar_procesos else nullcontext()) as pool_procesos:
+            while pendientes or en_curso:
+                listas = [etapa for etapa in pendientes if all(d in resultados for d in etapa.depende)]
+
+                # Todas las etapas de fondo que ya se pueden correr
+                for etapa in listas:
+                    if etapa.en != PRINCIPAL:
+                        pendientes.remove(etapa)
+                        en_curso[pool_hilos.submit(self.correr, etapa, resultados, pool_procesos)] = etapa
+
+                # Una etapa del hilo principal por vuelta (la primera declarada)
+                principal = next((etapa for etapa in listas if etapa.en == PRINCIPAL), None)
+                if principal is not None:
+                    pendientes.remove(principal)
+                    resultados[principal.nombre] = self.correr(principal, resultados)
+                    continue
+
+                hechas, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+                for futuro in hechas:
+                    etapa = en_curso.pop(futuro)
+                    resultados[etapa.nombre] = futuro.result()
+
+        return resultados
@@ -6,20 +6,39 @@ Mapeo de formularios a carreras
 import pandas as pd
 import re
 
+from .instrumentacion import pedir_entrada
+from .metricas import RegistroMetricas
+
 
 class FormMapper:
     """Mapeador de formularios a carreras"""
     
-    def __init__(self, config, logger):
+    def __init__(self, config, logger, metricas=None):
         """
         Inicializa el mapeador de formularios
         
         Args:
             config: Módulo de configuración con constantes
             logger: Instancia de Logger para registrar mensajes
+            metricas: RegistroMetricas donde contar aciertos de diccionario y caché
         """
         self.config = config
         self.logger = logger
+        self.metricas = metricas if metricas is not None else RegistroMetricas()
+        self.nivel_diccionario = self.metricas.nivel_cache('formularios_diccionario')
+        self.nivel_clasificacion = self.metricas.nivel_cache('formularios_clasificacion')
+        
+        # Claves de MAPEO_FORMULARIOS en orden de precedencia y matcher único
+        self.claves_mapeo = tuple(config.MAPEO_FORMULARIOS.items())
+        self.re_mapeo = re.compile(
+            '(?=(' + '|'.join(re.escape(clave) for clave, _ in self.claves_mapeo) + '))'
+        )
+        self.prioridad_mapeo = {}
+        for posicion, (clave, _) in enumerate(self.claves_mapeo):
+            self.prioridad_mapeo.setdefault(clave, posicion)
+        
+        # Resultado automático por formulario: (carrera o None, es_bridge)
+        self.cache = {}
     
     def extraer_primer_form(self, texto):
         """
@@ -61,27 +80,52 @@ class FormMapper:
         # Si todos los elementos eran .elementor-form
         return "Otro"
     
+    def buscar_en_mapeo(self, form_str):
+        """
+        Busca la primera clave de MAPEO_FORMULARIOS (en orden del config) contenida en el form.
+        El lookahead encuentra coincidencias solapadas; se queda con la de mayor precedencia.
+        """
+        mejor = None
+        for match in self.re_mapeo.finditer(form_str):
+            posicion = self.prioridad_mapeo[match.group(1)]
+            if mejor is None or posicion < mejor:
+                mejor = posicion
+                if mejor == 0:
+                    break
+        
+        if mejor is None:
+            return None
+        return self.claves_mapeo[mejor][1]
+    
     def mapear_form_a_carrera(self, form, diccionario, formularios_nuevos, modo_interactivo=True):
-        """Mapea formulario a carrera"""
+        """Mapea formulario a carrera (cachea aciertos y fallos)"""
         if not form or pd.isna(form) or form == "Otro":
             return None
         
         form_str = str(form).strip().lower()
         
         # Buscar en diccionario de formularios
-        if 'formularios' in diccionario and form_str in diccionario['formularios']:
+        en_diccionario = 'formularios' in diccionario and form_str in diccionario['formularios']
+        self.nivel_diccionario[en_diccionario]()
+        if en_diccionario:
             return diccionario['formularios'][form_str]
         
-        # Buscar en mapeo predefinido
-        for key, carrera in self.config.MAPEO_FORMULARIOS.items():
-            if key in form_str:
-                if 'formularios' not in diccionario:
-                    diccionario['formularios'] = {}
-                diccionario['formularios'][form_str] = carrera
-                return carrera
+        resultado = self.cache.get(form_str)
+        self.nivel_clasificacion[resultado is not None]()
+        if resultado is None:
+            # Buscar en mapeo predefinido; si contiene "uvg bridge" no mapear (ya tiene carrera)
+            resultado = (self.buscar_en_mapeo(form_str), 'bridge' in form_str)
+            self.cache[form_str] = resultado
         
-        # Si contiene "uvg bridge" no mapear (ya tiene carrera)
-        if 'uvg bridge' in form_str or 'bridge' in form_str:
+        carrera, es_bridge = resultado
+        
+        if carrera is not None:
+            if 'formularios' not in diccionario:
+                diccionario['formularios'] = {}
+            diccionario['formularios'][form_str] = carrera
+            return carrera
+        
+        if es_bridge:
             return None
         
         # Si es modo interactivo, preguntar
@@ -90,6 +134,34 @@ class FormMapper:
         
         return None
     
+    def resolver_formularios(self, serie, diccionario, formularios_nuevos, modo_interactivo=True):
+        """
+        Resuelve la carrera de cada formulario distinto de una columna
+        
+        Args:
+            serie: Serie con formularios limpios (salida de extraer_primer_form)
+            diccionario: Diccionario de normalizaciones
+            formularios_nuevos: Lista donde registrar los formularios nuevos
+            modo_interactivo: Si True, pregunta por los formularios no reconocidos
+            
+        Returns:
+            Diccionario {formulario: carrera o None}
+        """
+        formularios_unicos = serie.dropna().unique()
+        formularios_unicos = [f for f in formularios_unicos if f and f != "Otro" and str(f).strip()]
+        
+        self.logger.log(f"Formularios únicos encontrados: {len(formularios_unicos)}")
+        
+        return {
+            form: self.mapear_form_a_carrera(
+                form,
+                diccionario,
+                formularios_nuevos,
+                modo_interactivo=modo_interactivo
+            )
+            for form in formularios_unicos
+        }
+    
     def preguntar_carrera_form(self, form_name, diccionario, formularios_nuevos):
         """Pregunta al usuario a qué carrera pertenece un formulario"""
         print(f"\n{'='*60}")
@@ -105,7 +177,7 @@ class FormMapper:
         print("6. Sin especificar")
         
         while True:
-            respuesta = input("\nSelecciona (1-6): ").strip()
+            respuesta = pedir_entrada("\nSelecciona (1-6): ").strip()
             
             carreras = {
                 '1': 'Administración de Empresas',
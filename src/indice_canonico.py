@@ -0,0 +1,165 @@
+"""
+indice_canonico.py
+Índice inverso de valores canónicos del diccionario (canónico → variantes).
+El fuzzy match compara primero contra los nombres canónicos, que son pocos;
+solo si ninguno supera el umbral sigue con las variantes.
+"""
+
+from itertools import islice
+
+from rapidfuzz import fuzz, process
+
+
+# Valores canónicos que nunca se usan como destino de un fuzzy match
+CANONICOS_EXCLUIDOS = {'Otro'}
+
+
+class IndiceCanonico:
+    """Índice inverso de una sección del diccionario"""
+
+    def __init__(self, seccion, excluidos=None):
+        """
+        Construye el índice a partir de una sección del diccionario
+
+        Args:
+            seccion: Diccionario {variante: valor_canonico}
+            excluidos: Valores canónicos que no se usan como destino de match
+        """
+        self.excluidos = CANONICOS_EXCLUIDOS if excluidos is None else set(excluidos)
+        self._reiniciar(seccion)
+
+    def _reiniciar(self, seccion):
+        """Vacía el índice y lo reconstruye desde cero"""
+        self.variantes = {}
+        self.conteos = {}
+        self.nombres = []
+        self.canonicos = []
+        self.candidatos = []
+        self.destinos = []
+        self._representantes = {}
+        self._id_seccion = id(seccion)
+        self._modificaciones = getattr(seccion, 'modificaciones', 0)
+        self._procesadas = 0
+
+        self.actualizar(seccion)
+
+    def actualizar(self, seccion):
+        """
+        Sincroniza el índice con la sección del diccionario.
+        Las entradas nuevas se agregan al final (los dict conservan el orden
+        de inserción), así que solo se indexa la cola que falta. Si una clave
+        existente cambió de valor o se eliminó (la sección lleva la cuenta en
+        `modificaciones`), el índice se reconstruye para no devolver un
+        canónico viejo.
+        """
+        if (id(seccion) != self._id_seccion or len(seccion) < self._procesadas
+                or getattr(seccion, 'modificaciones', 0) != self._modificaciones):
+            self._reiniciar(seccion)
+            return
+
+        if len(seccion) == self._procesadas:
+            return
+
+        # Las secciones que pueden dar la cola sin recorrer el resto (SeccionSQLite) la dan
+        items_desde = getattr(seccion, 'items_desde', None)
+        if items_desde is not None:
+            nuevas = items_desde(self._procesadas)
+        else:
+            nuevas = islice(seccion.items(), self._procesadas, None)
+
+        for variante, canonico in nuevas:
+            self._agregar(variante, canonico)
+
+        self._procesadas = len(seccion)
+
+    def _agregar(self, variante, canonico):
+        """
+        Registra una variante y, si corresponde, la agrega a la búsqueda: el
+        nombre canónico a los nombres y cada variante distinta (sin repetir
+        mayúsculas ni el nombre canónico) a los candidatos
+        """
+        self.variantes.setdefault(canonico, []).append(variante)
+        self.conteos[canonico] = self.conteos.get(canonico, 0) + 1
+
+        if canonico in self.excluidos:
+            return
+
+        vistos = self._representantes.get(canonico)
+        if vistos is None:
+            vistos = {canonico.lower()}
+            self._representantes[canonico] = vistos
+            self.nombres.append(canonico.lower())
+            self.canonicos.append(canonico)
+
+        variante_lower = variante.lower()
+        if variante_lower in vistos:
+            return
+
+        vistos.add(variante_lower)
+        self.candidatos.append(variante_lower)
+        self.destinos.append((canonico, variante))
+
+    def mejor_match(self, texto_limpio, umbral, previo=None, desde=0):
+        """
+        Busca el canónico más parecido a un texto ya normalizado (minúsculas):
+        primero entre los nombres canónicos y, si ninguno supera el umbral,
+        entre las variantes
+
+        Args:
+            texto_limpio: Texto a comparar
+            umbral: Score mínimo (exclusivo) para aceptar el match
+            previo: Resultado de mejor_match sobre los primeros `desde` candidatos
+            desde: Cantidad de variantes ya comparadas en previo; solo se
+                   comparan las siguientes. Con empate gana previo (igual que
+                   una búsqueda completa, que se queda con el primero). Los
+                   nombres canónicos se comparan siempre: son pocos y uno nuevo
+                   gana a cualquier variante.
+
+        Returns:
+            Tupla (canonico, variante, score) o None si no supera el umbral.
+            variante es None cuando el match fue contra el nombre canónico.
+        """
+        if self.nombres:
+            resultado = process.extractOne(texto_limpio, self.nombres, scorer=fuzz.ratio, score_cutoff=umbral)
+            if resultado is not None and resultado[1] > umbral:
+                return self.canonicos[resultado[2]], None, resultado[1]
+
+        if len(self.candidatos) <= desde:
+            return previo
+
+        corte = umbral if previo is None else max(umbral, previo[2])
+        resultado = process.extractOne(
+            texto_limpio,
+            self.candidatos[desde:] if desde else self.candidatos,
+            scorer=fuzz.ratio,
+            score_cutoff=corte
+        )
+
+        if resultado is None:
+            return previo
+
+        _, score, posicion = resultado
+        if score <= corte:
+            return previo
+
+        canonico, variante = self.destinos[desde + posicion]
+        return canonico, variante, score
+
+    def contar_variantes(self, canonico):
+        """Cantidad de variantes que apuntan a un valor canónico"""
+        return self.conteos.get(canonico, 0)
+
+    def reporte_variantes(self, top=None):
+        """
+        Reporte de cuántas variantes apuntan a cada valor canónico
+
+        Args:
+            top: Si se indica, solo devuelve los N canónicos con más variantes
+
+        Returns:
+            Lista de tuplas (canonico, cantidad) ordenada de mayor a menor
+        """
+        reporte = sorted(self.conteos.items(), key=lambda item: (-item[1], item[0]))
+        if top is not None:
+            return reporte[:top]
+        return reporte
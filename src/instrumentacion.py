@@ -0,0 +1,239 @@
+"""
+instrumentacion.py
+Medición por etapa del procesamiento: tiempo de reloj, tiempo de CPU, filas
+procesadas y tiempo esperando respuestas del usuario (separado del cómputo),
+con un perfil cProfile opcional por etapa. Los totales de la ejecución se
+miden aparte, de punta a punta: las etapas pueden correr a la vez, así que
+sumarlas no da el tiempo de la ejecución.
+"""
+
+import cProfile
+import os
+import re
+import threading
+import time
+import unicodedata
+from contextlib import contextmanager
+
+
+# Tiempo acumulado dentro de pedir_entrada() (todas las etapas)
+_espera = {'segundos': 0.0, 'pedidos': 0}
+_espera_lock = threading.Lock()
+
+
+def pedir_entrada(mensaje=''):
+    """
+    Igual que input(), pero registra cuánto tiempo se esperó al usuario para
+    descontarlo del tiempo de cómputo de la etapa en curso
+
+    Args:
+        mensaje: Texto que se muestra antes de leer la respuesta
+    """
+    inicio = time.perf_counter()
+    try:
+        return input(mensaje)
+    finally:
+        duracion = time.perf_counter() - inicio
+        with _espera_lock:
+            _espera['segundos'] += duracion
+            _espera['pedidos'] += 1
+
+
+def cpu_proceso():
+    """
+    Tiempo de CPU del proceso (todos sus hilos) más el de los procesos hijos
+    que ya terminaron (p. ej. los del pool de ProcessPoolExecutor al cerrarlo)
+    """
+    tiempos = os.times()
+    return time.process_time() + tiempos.children_user + tiempos.children_system
+
+
+def espera_acumulada():
+    """Tupla (segundos, pedidos) esperando al usuario desde que arrancó el proceso"""
+    with _espera_lock:
+        return _espera['segundos'], _espera['pedidos']
+
+
+class Etapa:
+    """Resultado de la medición de una etapa"""
+
+    def __init__(self, nombre, filas=None):
+        """
+        Args:
+            nombre: Nombre de la etapa
+            filas: Filas (o elementos) procesados; se puede asignar dentro del 'with'
+
+        cpu es el tiempo de CPU del hilo que corrió la etapa (las etapas pueden
+        correr a la vez, ver etapas.py) y espera solo se cuenta en el hilo
+        principal, que es el único que le pregunta al usuario
+        """
+        self.nombre = nombre
+        self.filas = filas
+        self.reloj = 0.0
+        self.cpu = 0.0
+        self.espera = 0.0
+        self.pedidos = 0
+        self.perfil = None
+
+    @property
+    def computo(self):
+        """Tiempo de reloj sin la espera al usuario"""
+        return max(self.reloj - self.espera, 0.0)
+
+    def como_dict(self):
+        """Representación serializable (para reportes)"""
+        return {
+            'etapa': self.nombre,
+            'filas': self.filas,
+            'reloj_s': round(self.reloj, 6),
+            'cpu_s': round(self.cpu, 6),
+            'espera_usuario_s': round(self.espera, 6),
+            'computo_s': round(self.computo, 6),
+            'pedidos_usuario': self.pedidos,
+            'perfil': self.perfil,
+        }
+
+
+class Instrumentacion:
+    """
+    Mide cada etapa de procesar_leads con 'with instrumentacion.etapa(nombre):'
+    y muestra un resumen al final
+    """
+
+    def __init__(self, logger, perfil_dir=None):
+        """
+        Inicializa la instrumentación
+
+        Args:
+            logger: Instancia de Logger para registrar mensajes
+            perfil_dir: Carpeta donde guardar un .pstats por etapa (None = sin perfilar)
+        """
+        self.logger = logger
+        self.perfil_dir = perfil_dir
+        self.etapas = []
+        self.perfilando = False
+        self.total = None
+        self.inicio_total = None
+
+        if perfil_dir:
+            os.makedirs(perfil_dir, exist_ok=True)
+
+    @contextmanager
+    def etapa(self, nombre, filas=None):
+        """
+        Mide el bloque como una etapa
+
+        Args:
+            nombre: Nombre de la etapa
+            filas: Filas procesadas, si ya se conocen (si no, asignar etapa.filas)
+
+        Yields:
+            Etapa con los tiempos (completos al salir del bloque)
+        """
+        etapa = Etapa(nombre, filas)
+        perfil = None
+        if self.perfil_dir and not self.perfilando:
+            # cProfile no admite dos perfiles activos: las etapas anidadas se cuentan en la de afuera
+            perfil = cProfile.Profile()
+            self.perfilando = True
+
+        principal = threading.current_thread() is threading.main_thread()
+        espera_inicial, pedidos_iniciales = espera_acumulada()
+        cpu_inicial = time.thread_time()
+        inicio = time.perf_counter()
+        if perfil is not None:
+            perfil.enable()
+        try:
+            yield etapa
+        finally:
+            if perfil is not None:
+                perfil.disable()
+            etapa.reloj = time.perf_counter() - inicio
+            etapa.cpu = time.thread_time() - cpu_inicial
+            if principal:
+                espera_final, pedidos_finales = espera_acumulada()
+                etapa.espera = espera_final - espera_inicial
+                etapa.pedidos = pedidos_finales - pedidos_iniciales
+            self.etapas.append(etapa)
+
+            if perfil is not None:
+                self.perfilando = False
+                etapa.perfil = self.guardar_perfil(perfil, nombre)
+
+            self.logger.debug("⏱️ %s: %.3f s (CPU %.3f s, espera %.3f s)",
+                              nombre, etapa.reloj, etapa.cpu, etapa.espera)
+
+    def iniciar_ejecucion(self):
+        """Empieza a medir la ejecución completa (reloj, CPU del proceso e hijos y espera)"""
+        self.inicio_total = (time.perf_counter(), cpu_proceso(), *espera_acumulada())
+
+    def terminar_ejecucion(self, filas=None):
+        """
+        Termina la medición de la ejecución completa
+
+        Args:
+            filas: Filas procesadas en la ejecución
+
+        Returns:
+            Etapa 'Total' con los tiempos de punta a punta
+        """
+        inicio, cpu_inicial, espera_inicial, pedidos_iniciales = self.inicio_total
+        espera_final, pedidos_finales = espera_acumulada()
+
+        total = Etapa('Total', filas)
+        total.reloj = time.perf_counter() - inicio
+        total.cpu = cpu_proceso() - cpu_inicial
+        total.espera = espera_final - espera_inicial
+        total.pedidos = pedidos_finales - pedidos_iniciales
+        self.total = total
+        return total
+
+    def guardar_perfil(self, perfil, nombre):
+        """Guarda el perfil de una etapa como <perfil_dir>/<NN>_<nombre>.pstats"""
+        texto = unicodedata.normalize('NFKD', nombre).encode('ascii', 'ignore').decode()
+        slug = re.sub(r'[^a-z0-9]+', '_', texto.lower()).strip('_')
+        ruta = os.path.join(self.perfil_dir, f"{len(self.etapas):02d}_{slug}.pstats")
+        try:
+            perfil.dump_stats(ruta)
+        except OSError as e:
+            self.logger.log(f"⚠️ No se pudo guardar el perfil de '{nombre}': {e}")
+            return None
+        return ruta
+
+    def totales(self):
+        """
+        Tupla (reloj, cpu, espera) de la ejecución completa (ver
+        terminar_ejecucion); sin esa medición, la suma de las etapas
+        """
+        if self.total is not None:
+            return self.total.reloj, self.total.cpu, self.total.espera
+        return (
+            sum(etapa.reloj for etapa in self.etapas),
+            sum(etapa.cpu for etapa in self.etapas),
+            sum(etapa.espera for etapa in self.etapas),
+        )
+
+    def mostrar_resumen(self):
+        """Muestra la tabla de tiempos por etapa"""
+        if not self.etapas:
+            return
+
+        self.logger.log("\n" + "━"*60)
+        self.logger.log("⏱️ TIEMPOS POR ETAPA")
+        self.logger.log("━"*60)
+        self.logger.log(f"{'Etapa':<24}{'Reloj':>9}{'CPU':>9}{'Espera':>9}{'Filas':>9}")
+        for etapa in self.etapas:
+            filas = f"{etapa.filas:,}" if etapa.filas is not None else '-'
+            self.logger.log(
+                f"{etapa.nombre:<24}{etapa.reloj:>8.2f}s{etapa.cpu:>8.2f}s{etapa.espera:>8.2f}s{filas:>9}"
+            )
+
+        reloj, cpu, espera = self.totales()
+        self.logger.log(f"{'Total':<24}{reloj:>8.2f}s{cpu:>8.2f}s{espera:>8.2f}s")
+        if self.total is not None:
+            self.logger.log("ℹ️ Total medido de punta a punta (CPU de todos los hilos y procesos hijos); "
+                            "las etapas pueden correr a la vez y no suman el total")
+        self.logger.log(f"🧮 Cómputo (sin esperar al usuario): {reloj - espera:.2f} s")
+        if self.perfil_dir:
+            self.logger.log(f"🔬 Perfiles cProfile en: {self.perfil_dir}")
+        self.logger.log("━"*60)
@@ -3,43 +3,257 @@ logger.py
 Sistema de logging para el Normalizador de Leads
 """
 
+import atexit
+import gzip
 import os
+import queue
+import shutil
+import threading
+import time
 from datetime import datetime
 
 
+# Niveles de log: DEBUG para decisiones por elemento, INFO para resúmenes de
+# etapa, WARNING para avisos y errores
+DEBUG = 10
+INFO = 20
+WARNING = 30
+NIVELES = {'DEBUG': DEBUG, 'INFO': INFO, 'WARNING': WARNING}
+
+# Los mensajes de log() que empiezan con estos emojis son avisos (WARNING):
+# el modo silencioso los sigue mostrando en consola
+PREFIJOS_AVISO = ('⚠️', '❌')
+
+# Marca de fin para el hilo escritor
+_FIN = object()
+
+
+def formatear(mensaje, args):
+    """
+    Arma el texto de un mensaje con formato estilo %. Si la plantilla no
+    coincide con los valores se devuelve un aviso en su lugar (un error de
+    formato no debe cortar la ejecución ni el hilo escritor)
+    """
+    if not args:
+        return mensaje
+    try:
+        return mensaje % args
+    except Exception as e:
+        return f"⚠️ Error al formatear mensaje de log ({e}): {mensaje!r} % {args!r}"
+
+
 class Logger:
-    """Manejador de logs para consola y archivo"""
+    """
+    Manejador de logs para consola y archivo, con niveles DEBUG/INFO/WARNING.
+    La consola se escribe al momento; el archivo queda abierto y lo escribe
+    un hilo en segundo plano por lotes (se vacía al cerrar o al salir)
+    y se rota comprimido al llegar a max_bytes.
+    """
     
-    def __init__(self, log_file):
+    def __init__(self, log_file, nivel='DEBUG', nivel_consola='INFO',
+                 max_bytes=5 * 1024 * 1024, archivos_rotados=5, lote_max=1000):
         """
         Inicializa el logger
         
         Args:
             log_file: Ruta del archivo de log
+            nivel: Nivel mínimo que se escribe en el archivo ('DEBUG', 'INFO' o 'WARNING')
+            nivel_consola: Nivel mínimo que se muestra en consola
+            max_bytes: Tamaño a partir del cual el archivo se rota, entre lotes de escritura (0 = no rotar)
+            archivos_rotados: Cantidad de archivos comprimidos (.1.gz, .2.gz...) que se conservan
+            lote_max: Máximo de líneas por escritura del hilo escritor
         """
         self.log_file = log_file
+        self.nivel_archivo = NIVELES[nivel.upper()]
+        self.nivel_consola = NIVELES[nivel_consola.upper()]
+        self.nivel_consola_previo = None
+        self.nivel_minimo = min(self.nivel_archivo, self.nivel_consola)
+        self.max_bytes = max_bytes
+        self.archivos_rotados = archivos_rotados
+        self.lote_max = lote_max
         
         # Crear carpeta de logs si no existe
         log_dir = os.path.dirname(log_file)
         if log_dir:
             os.makedirs(log_dir, exist_ok=True)
+        
+        self.cola = queue.SimpleQueue()
+        self.archivo = None
+        self.tamanio = 0
+        self.cerrado = False
+        self.error_reportado = False
+        
+        self.hilo = threading.Thread(target=self.escribir_pendientes, name='logger', daemon=True)
+        self.hilo.start()
+        atexit.register(self.cerrar)
     
     def log(self, mensaje):
         """
-        Registra un mensaje en consola y archivo
+        Registra un mensaje en consola y archivo: nivel WARNING si empieza
+        con un emoji de aviso (ver PREFIJOS_AVISO), si no INFO
         
         Args:
             mensaje: Texto a registrar
         """
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        log_msg = f"[{timestamp}] {mensaje}"
+        nivel = WARNING if mensaje.lstrip().startswith(PREFIJOS_AVISO) else INFO
+        self.registrar(nivel, mensaje)
+    
+    info = log
+    
+    def debug(self, mensaje, *args):
+        """
+        Registra un detalle por elemento (nivel DEBUG) con formato estilo %.
+        El texto se arma recién cuando algún destino lo usa (en el hilo escritor
+        si solo va al archivo), así los bucles de normalización no pagan el
+        formateo de mensajes descartados.
         
+        Args:
+            mensaje: Plantilla del mensaje ('%s')
+            *args: Valores para la plantilla
+        """
+        if DEBUG < self.nivel_minimo:
+            return
+        self.registrar(DEBUG, mensaje, args)
+    
+    def debug_activo(self):
+        """Indica si los mensajes DEBUG llegan a algún destino"""
+        return DEBUG >= self.nivel_minimo
+    
+    def silenciar(self):
+        """
+        Modo silencioso: la consola solo muestra avisos y errores (el archivo
+        sigue recibiendo todo) hasta restaurar_consola()
+
+        Returns:
+            True si la consola mostraba algo más que avisos
+        """
+        if self.nivel_consola >= WARNING:
+            return False
+        self.nivel_consola_previo = self.nivel_consola
+        self.nivel_consola = WARNING
+        self.nivel_minimo = min(self.nivel_archivo, self.nivel_consola)
+        return True
+    
+    def restaurar_consola(self):
+        """Termina el modo silencioso: la consola vuelve a su nivel anterior"""
+        if self.nivel_consola_previo is None:
+            return
+        self.nivel_consola = self.nivel_consola_previo
+        self.nivel_consola_previo = None
+        self.nivel_minimo = min(self.nivel_archivo, self.nivel_consola)
+    
+    def registrar(self, nivel, mensaje, args=()):
+        """Envía el mensaje a consola y/o archivo según su nivel"""
         # Mostrar en consola
-        print(mensaje)
+        if nivel >= self.nivel_consola:
+            if args:
+                mensaje = formatear(mensaje, args)
+                args = ()
+            print(mensaje)
+        
+        # El formato y la escritura en archivo los hace el hilo escritor
+        if nivel >= self.nivel_archivo and not self.cerrado:
+            self.cola.put((time.time(), nivel, mensaje, args))
+    
+    def escribir_pendientes(self):
+        """Hilo escritor: junta los mensajes encolados y los escribe en lote"""
+        ultimo_segundo = None
+        timestamp = ''
         
-        # Escribir en archivo
+        while True:
+            lote = [self.cola.get()]
+            while len(lote) < self.lote_max:
+                try:
+                    lote.append(self.cola.get_nowait())
+                except queue.Empty:
+                    break
+            
+            lineas = []
+            esperando = []
+            fin = False
+            for item in lote:
+                if item is _FIN:
+                    fin = True
+                elif isinstance(item, threading.Event):
+                    esperando.append(item)
+                else:
+                    momento, nivel, mensaje, args = item
+                    mensaje = formatear(mensaje, args)
+                    segundo = int(momento)
+                    if segundo != ultimo_segundo:
+                        ultimo_segundo = segundo
+                        timestamp = datetime.fromtimestamp(segundo).strftime('%Y-%m-%d %H:%M:%S')
+                    etiqueta = 'DEBUG ' if nivel == DEBUG else ''
+                    lineas.append(f"[{timestamp}] {etiqueta}{mensaje}\n")
+            
+            if lineas:
+                self.escribir(''.join(lineas))
+            for evento in esperando:
+                evento.set()
+            if fin:
+                break
+    
+    def escribir(self, texto):
+        """Escribe un bloque en el archivo (lo abre la primera vez y lo rota si se pasa del tamaño)"""
+        datos = texto.encode('utf-8')
         try:
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(log_msg + '\n')
+            if self.archivo is None:
+                self.abrir()
+            if self.max_bytes and self.tamanio and self.tamanio + len(datos) > self.max_bytes:
+                self.rotar()
+            self.archivo.write(datos)
+            self.archivo.flush()
+            self.tamanio += len(datos)
         except Exception as e:
-            print(f"⚠️ Error al escribir log: {e}")
\ No newline at end of file
+            if not self.error_reportado:
+                print(f"⚠️ Error al escribir log: {e}")
+                self.error_reportado = True
+    
+    def abrir(self):
+        """Abre el archivo en modo append"""
+        self.archivo = open(self.log_file, 'ab')
+        self.tamanio = self.archivo.tell()
+    
+    def rotar(self):
+        """
+        Comprime el archivo actual como <log>.1.gz, corre los anteriores
+        (.1.gz → .2.gz ...) y descarta los que exceden archivos_rotados
+        """
+        self.archivo.close()
+        
+        for numero in range(self.archivos_rotados, 0, -1):
+            origen = f"{self.log_file}.{numero}.gz"
+            if not os.path.exists(origen):
+                continue
+            if numero == self.archivos_rotados:
+                os.remove(origen)
+            else:
+                os.replace(origen, f"{self.log_file}.{numero + 1}.gz")
+        
+        if self.archivos_rotados:
+            with open(self.log_file, 'rb') as origen, gzip.open(f"{self.log_file}.1.gz", 'wb') as destino:
+                shutil.copyfileobj(origen, destino)
+        os.remove(self.log_file)
+        
+        self.abrir()
+    
+    def flush(self, timeout=10):
+        """Espera a que todo lo registrado hasta ahora esté escrito en el archivo"""
+        if self.cerrado:
+            return
+        evento = threading.Event()
+        self.cola.put(evento)
+        evento.wait(timeout)
+    
+    def cerrar(self):
+        """Escribe lo pendiente, detiene el hilo escritor y cierra el archivo"""
+        if self.cerrado:
+            return
+        self.cerrado = True
+        self.cola.put(_FIN)
+        self.hilo.join(timeout=10)
+        
+        if self.archivo is not None:
+            self.archivo.close()
+            self.archivo = None
+        atexit.unregister(self.cerrar)
@@ -0,0 +1,267 @@
+"""
+metricas.py
+Registro de métricas de la ejecución (contadores, valores e histogramas),
+seguro para actualizar desde varios hilos, con exportación a un reporte JSON
+y a un archivo de texto de Prometheus (textfile collector de node_exporter)
+"""
+
+import json
+import math
+import os
+import re
+import threading
+
+
+# Cuantiles que se reportan para los histogramas (p. ej. latencia de Claude)
+CUANTILES = (0.5, 0.95, 0.99)
+
+
+def percentil(valores_ordenados, cuantil):
+    """
+    Percentil con interpolación lineal
+
+    Args:
+        valores_ordenados: Lista de valores ya ordenada
+        cuantil: Entre 0 y 1
+
+    Returns:
+        Valor del percentil, o None si no hay valores
+    """
+    if not valores_ordenados:
+        return None
+    posicion = (len(valores_ordenados) - 1) * cuantil
+    inferior = math.floor(posicion)
+    superior = math.ceil(posicion)
+    if inferior == superior:
+        return valores_ordenados[inferior]
+    fraccion = posicion - inferior
+    return valores_ordenados[inferior] * (1 - fraccion) + valores_ordenados[superior] * fraccion
+
+
+def escribir_atomico(ruta, texto):
+    """Escribe un archivo de texto completo o no lo toca (tmp + replace)"""
+    carpeta = os.path.dirname(ruta)
+    if carpeta:
+        os.makedirs(carpeta, exist_ok=True)
+    temporal = ruta + '.tmp'
+    with open(temporal, 'w', encoding='utf-8') as f:
+        f.write(texto)
+    os.replace(temporal, ruta)
+
+
+class Contador:
+    """Contador seguro entre hilos: un entero que se actualiza bajo lock"""
+
+    def __init__(self):
+        self.cuenta = 0
+        self.lock = threading.Lock()
+
+    def incrementar(self, cantidad=1):
+        """Suma una unidad (o una cantidad arbitraria, p. ej. tokens)"""
+        with self.lock:
+            self.cuenta += cantidad
+
+    def valor(self):
+        """Valor actual"""
+        with self.lock:
+            return self.cuenta
+
+
+class RegistroMetricas:
+    """
+    Contadores con etiquetas, valores puntuales (gauges) e histogramas.
+    Se pueden actualizar desde varios hilos a la vez. Para los bucles calientes,
+    contador() y nivel_cache() devuelven el contador ya resuelto.
+    """
+
+    def __init__(self, prefijo='normalizador'):
+        """
+        Args:
+            prefijo: Prefijo de los nombres en la exportación a Prometheus
+        """
+        self.prefijo = prefijo
+        self.lock = threading.Lock()
+        self.contadores = {}
+        self.niveles = {}
+        self.valores = {}
+        self.observaciones = {}
+        self.descripciones = {}
+
+    @staticmethod
+    def clave(nombre, etiquetas):
+        """Clave interna (nombre, etiquetas ordenadas)"""
+        return nombre, tuple(sorted(etiquetas.items()))
+
+    def describir(self, nombre, descripcion):
+        """Texto de ayuda (# HELP) de una métrica"""
+        self.descripciones[nombre] = descripcion
+
+    def contador(self, nombre, **etiquetas):
+        """Contador nombre{etiquetas} (se crea la primera vez)"""
+        clave = self.clave(nombre, etiquetas)
+        contador = self.contadores.get(clave)
+        if contador is None:
+            with self.lock:
+                contador = self.contadores.setdefault(clave, Contador())
+        return contador
+
+    def incrementar(self, nombre, cantidad=1, **etiquetas):
+        """Suma al contador nombre{etiquetas}"""
+        self.contador(nombre, **etiquetas).incrementar(cantidad)
+
+    def nivel_cache(self, nivel):
+        """
+        Funciones para registrar consultas a un nivel de caché (diccionario, caché en memoria, ...)
+
+        Returns:
+            Tupla (registrar_fallo, registrar_acierto): se usa como nivel[acierto]()
+        """
+        registradores = self.niveles.get(nivel)
+        if registradores is None:
+            registradores = self.niveles[nivel] = (
+                self.contador('cache_consultas', nivel=nivel, resultado='fallo').incrementar,
+                self.contador('cache_consultas', nivel=nivel, resultado='acierto').incrementar,
+            )
+        return registradores
+
+    def cache(self, nivel, acierto):
+        """Registra una consulta a un nivel de caché"""
+        self.nivel_cache(nivel)[acierto]()
+
+    def fijar(self, nombre, valor, **etiquetas):
+        """Asigna el valor puntual nombre{etiquetas}"""
+        with self.lock:
+            self.valores[self.clave(nombre, etiquetas)] = valor
+
+    def observar(self, nombre, valor):
+        """Agrega una muestra al histograma nombre"""
+        with self.lock:
+            self.observaciones.setdefault(nombre, []).append(valor)
+
+    def valores_contadores(self):
+        """{(nombre, etiquetas): valor} de todos los contadores"""
+        with self.lock:
+            contadores = list(self.contadores.items())
+        return {clave: contador.valor() for clave, contador in contadores}
+
+    def valor(self, nombre, **etiquetas):
+        """Valor del contador nombre{etiquetas} (0 si nunca se incrementó)"""
+        contador = self.contadores.get(self.clave(nombre, etiquetas))
+        return contador.valor() if contador is not None else 0
+
+    def total(self, nombre, **filtro):
+        """Suma del contador nombre sobre todas las etiquetas que coinciden con el filtro"""
+        return sum(
+            cantidad for (actual, etiquetas), cantidad in self.valores_contadores().items()
+            if actual == nombre and all(dict(etiquetas).get(k) == v for k, v in filtro.items())
+        )
+
+    def ratios_cache(self):
+        """{nivel: (aciertos, consultas, ratio)} por nivel de caché"""
+        por_nivel = {}
+        for (nombre, etiquetas), cantidad in self.valores_contadores().items():
+            if nombre != 'cache_consultas':
+                continue
+            etiquetas = dict(etiquetas)
+            aciertos, consultas = por_nivel.get(etiquetas['nivel'], (0, 0))
+            if etiquetas['resultado'] == 'acierto':
+                aciertos += cantidad
+            por_nivel[etiquetas['nivel']] = (aciertos, consultas + cantidad)
+
+        return {
+            nivel: (aciertos, consultas, aciertos / consultas if consultas else 0.0)
+            for nivel, (aciertos, consultas) in sorted(por_nivel.items())
+            if consultas
+        }
+
+    def resumen_histograma(self, nombre):
+        """{'cantidad', 'suma', 'p50', 'p95', 'p99'} de un histograma"""
+        with self.lock:
+            valores = sorted(self.observaciones.get(nombre, ()))
+
+        resumen = {'cantidad': len(valores), 'suma': sum(valores)}
+        for cuantil in CUANTILES:
+            resumen[f"p{round(cuantil * 100)}"] = percentil(valores, cuantil)
+        return resumen
+
+    def como_dict(self):
+        """Todas las métricas en un diccionario serializable a JSON"""
+        def nombre_con_etiquetas(nombre, etiquetas):
+            if not etiquetas:
+                return nombre
+            return nombre + '{' + ','.join(f"{k}={v}" for k, v in etiquetas) + '}'
+
+        contadores = {nombre_con_etiquetas(*clave): valor for clave, valor in sorted(self.valores_contadores().items())}
+        with self.lock:
+            valores = {nombre_con_etiquetas(*clave): valor for clave, valor in sorted(self.valores.items())}
+            histogramas = list(self.observaciones)
+
+        return {
+            'contadores': contadores,
+            'valores': valores,
+            'histogramas': {nombre: self.resumen_histograma(nombre) for nombre in histogramas},
+            'cache': {
+                nivel: {'aciertos': aciertos, 'consultas': consultas, 'ratio': round(ratio, 4)}
+                for nivel, (aciertos, consultas, ratio) in self.ratios_cache().items()
+            },
+        }
+
+    def exportar_prometheus(self):
+        """Texto en el formato de exposición de Prometheus"""
+        lineas = []
+
+        def nombre_prometheus(nombre):
+            return f"{self.prefijo}_{re.sub(r'[^a-zA-Z0-9_]', '_', nombre)}"
+
+        def etiquetas_prometheus(etiquetas):
+            if not etiquetas:
+                return ''
+            partes = []
+            for k, v in etiquetas:
+                v = str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+                partes.append(f'{k}="{v}"')
+            return '{' + ','.join(partes) + '}'
+
+        def encabezado(nombre, tipo, sufijo=''):
+            metrica = nombre_prometheus(nombre) + sufijo
+            if nombre in self.descripciones:
+                lineas.append(f"# HELP {metrica} {self.descripciones[nombre]}")
+            lineas.append(f"# TYPE {metrica} {tipo}")
+            return metrica
+
+        contadores = sorted(self.valores_contadores().items())
+        with self.lock:
+            valores = sorted(self.valores.items())
+            histogramas = sorted(self.observaciones)
+
+        for tipo, muestras, sufijo in (('counter', contadores, '_total'), ('gauge', valores, '')):
+            anterior = None
+            for (nombre, etiquetas), valor in muestras:
+                if nombre != anterior:
+                    metrica = encabezado(nombre, tipo, sufijo)
+                    anterior = nombre
+                lineas.append(f"{metrica}{etiquetas_prometheus(etiquetas)} {valor}")
+
+        for nombre in histogramas:
+            resumen = self.resumen_histograma(nombre)
+            metrica = encabezado(nombre, 'summary')
+            for cuantil in CUANTILES:
+                valor = resumen[f"p{round(cuantil * 100)}"]
+                lineas.append(f'{metrica}{{quantile="{cuantil}"}} {valor if valor is not None else "NaN"}')
+            lineas.append(f"{metrica}_sum {resumen['suma']}")
+            lineas.append(f"{metrica}_count {resumen['cantidad']}")
+
+        return '\n'.join(lineas) + '\n'
+
+    def guardar(self, ruta_json, ruta_prometheus, reporte):
+        """
+        Escribe el reporte JSON de la ejecución y el archivo de Prometheus
+
+        Args:
+            ruta_json: Ruta del reporte JSON
+            ruta_prometheus: Ruta del archivo .prom (se reemplaza en cada ejecución)
+            reporte: Datos de la ejecución; se le agregan las métricas bajo 'metricas'
+        """
+        reporte = dict(reporte, metricas=self.como_dict())
+        escribir_atomico(ruta_json, json.dumps(reporte, indent=2, ensure_ascii=False))
+        escribir_atomico(ruta_prometheus, self.exportar_prometheus())
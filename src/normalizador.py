@@ -3,8 +3,7 @@ normalizador.py
 Clase principal del Normalizador de Leads
 Orquesta todos los módulos para el procesamiento completo
 """
-import webbrowser
-import subprocess
+import argparse
 import time
 import os
 import pandas as pd
@@ -16,27 +15,120 @@ from . import config
 from .logger import Logger
 from .diccionario_manager import DiccionarioManager
 from .validadores import Validadores
+from .clasificador_grados import ClasificadorGrados
 from .normalizador_claude import NormalizadorClaude
 from .url_categorizer import URLCategorizer
 from .form_mapper import FormMapper
+from .instrumentacion import Instrumentacion, pedir_entrada
+from .etapas import PlanEtapas, PRINCIPAL, HILOS, PROCESOS, aplicar
+from .metricas import RegistroMetricas
+from .consultas_anticipadas import ConsultasAnticipadas
+
+
+# Nivel de resolución local de cada método de validar_colegio_localmente
+NIVEL_METODO_COLEGIO = {
+    'diccionario': 'colegios_diccionario',
+    'respuesta_invalida': 'colegios_reglas',
+    'titulo_carrera': 'colegios_reglas',
+    'no_es_colegio': 'colegios_reglas',
+    'colegio_conocido': 'colegios_reglas',
+    'universidad': 'colegios_reglas',
+    'patron_colegio': 'colegios_reglas',
+    'fuzzy_match': 'colegios_fuzzy',
+}
+NIVELES_COLEGIO = ('colegios_diccionario', 'colegios_reglas', 'colegios_fuzzy')
+
+# Todos los métodos con los que se resuelve un colegio
+METODOS_COLEGIO = tuple(NIVEL_METODO_COLEGIO) + ('sigla_ambigua', 'claude')
+
+# Métodos locales que reemplazan una respuesta por 'Otro'
+METODOS_RESPUESTA_INVALIDA = ('respuesta_invalida', 'titulo_carrera', 'no_es_colegio')
+
+def normalizar_telefono(telefono):
+    """
+    Limpia y normaliza números de teléfono
+    1. Quita todo lo que NO sea número (espacios, guiones, +, paréntesis, etc.)
+    2. Toma los últimos 8 dígitos
+    (función de módulo para poder correrla en un pool de procesos)
+    """
+    if pd.isna(telefono) or str(telefono).strip() == '':
+        return ''
+    
+    # Convertir a string y limpiar
+    telefono_str = str(telefono).strip()
+    
+    # Paso 1: Quitar todo excepto números
+    solo_numeros = re.sub(r'\D', '', telefono_str)
+    
+    # Paso 2: Tomar los últimos 8 dígitos
+    if len(solo_numeros) >= 8:
+        return solo_numeros[-8:]
+    else:
+        return solo_numeros  # Si tiene menos de 8, devolver lo que haya
+
+
+# Mensaje de debug de cada regla local de colegios (colegio, valor)
+MENSAJES_REGLA_COLEGIO = {
+    'respuesta_invalida': "⚠️ Respuesta inválida detectada: '%s' → '%s'",
+    'titulo_carrera': "⚠️ Título académico detectado: '%s' → '%s'",
+    'no_es_colegio': "⚠️ No es un colegio detectado: '%s' → '%s'",
+    'colegio_conocido': "✅ Colegio conocido: '%s' → '%s'",
+    'universidad': "🎓 Universidad detectada: '%s' → '%s'",
+    'patron_colegio': "📚 Patrón colegio detectado: '%s' → '%s'",
+}
 
 
 class NormalizadorLeads:
     """Clase principal que orquesta la normalización de leads"""
     
-    def __init__(self):
-        """Inicializa todos los componentes del normalizador"""
+    def __init__(self, perfilar=False, procesos=None):
+        """
+        Inicializa todos los componentes del normalizador
+        
+        Args:
+            perfilar: Si True, guarda un perfil cProfile por etapa en config.PERFIL_DIR
+            procesos: Procesos para la resolución local de colegios únicos
+                      (por defecto config.COLEGIOS_PROCESOS; 0 o 1 = en serie)
+        """
+        self.procesos = config.COLEGIOS_PROCESOS if procesos is None else procesos
+        
         # Crear carpetas necesarias
         config.crear_carpetas()
         
         # Inicializar logger
-        self.logger = Logger(config.LOG_FILE)
+        self.logger = Logger(
+            config.LOG_FILE,
+            nivel=config.LOG_NIVEL,
+            nivel_consola=config.LOG_NIVEL_CONSOLA,
+            max_bytes=config.LOG_MAX_BYTES,
+            archivos_rotados=config.LOG_ARCHIVOS_ROTADOS
+        )
+        
+        # ⭐ Contadores de estadísticas detalladas (compartidos por todos los componentes)
+        self.metricas = RegistroMetricas()
+        self.metricas.describir('colegios_resueltos', 'Colegios resueltos por método (una vez por fila)')
+        self.metricas.describir('validaciones_manuales', 'Normalizaciones enviadas a validación manual')
+        self.metricas.describir('cache_consultas', 'Consultas por nivel de caché (acierto o fallo)')
+        self.metricas.describir('claude_descartadas', 'Consultas anticipadas a Claude que no se usaron')
+        
+        # Tiempos por etapa (y perfiles si se pidió --profile)
+        self.instrumentacion = Instrumentacion(
+            self.logger,
+            perfil_dir=config.PERFIL_DIR if perfilar else None
+        )
         
         # Inicializar gestor de diccionario
         self.dict_manager = DiccionarioManager(
             config.DICCIONARIO_FILE,
             config.BACKUP_DIR,
-            self.logger
+            self.logger,
+            backend=config.DICCIONARIO_BACKEND,
+            db_file=config.DICCIONARIO_DB,
+            journal_file=config.JOURNAL_FILE,
+            journal_fsync_entradas=config.JOURNAL_FSYNC_ENTRADAS,
+            journal_fsync_segundos=config.JOURNAL_FSYNC_SEGUNDOS,
+            deltas_por_base=config.BACKUP_DELTAS_POR_BASE,
+            retencion_dias=config.BACKUP_RETENCION_DIAS
         )
         
         # Cargar diccionario
@@ -45,32 +137,36 @@ class NormalizadorLeads:
         # Inicializar validadores
         self.validadores = Validadores(config, self.logger)
         
+        # Inicializar clasificador de grados
+        self.clasificador_grados = ClasificadorGrados(config, self.logger, self.metricas)
+        
         # Inicializar normalizador de Claude
-        self.normalizador_claude = NormalizadorClaude(config.API_KEY, self.logger)
+        self.normalizador_claude = NormalizadorClaude(config.API_KEY, self.logger, self.metricas)
         
-        # Inicializar categorizador de URLs
-        self.url_categorizer = URLCategorizer(config, self.logger)
+        # Inicializar categorizador de URLs (colapsa las URLs del diccionario a
+        # su forma canónica la primera vez que consulta la sección)
+        self.url_categorizer = URLCategorizer(config, self.logger, self.metricas)
         
         # Inicializar mapeador de formularios
-        self.form_mapper = FormMapper(config, self.logger)
+        self.form_mapper = FormMapper(config, self.logger, self.metricas)
         
         # Contadores y listas de seguimiento
         self.normalizaciones_nuevas = []
         self.urls_nuevas = []
         self.formularios_nuevos = []
         
-        # ⭐ NUEVO: Contadores de estadísticas detalladas
-        self.stats_validaciones_locales = 0
-        self.stats_diccionario = 0
-        self.stats_respuestas_invalidas = 0
-        self.stats_colegios_conocidos = 0
-        self.stats_universidades = 0
-        self.stats_patrones = 0
-        self.stats_claude = 0
-        self.stats_validaciones_manuales = 0
-        self.stats_validaciones_aceptadas = 0
-        self.stats_validaciones_modificadas = 0
-        self.stats_validaciones_omitidas = 0
+        # Colegios en los que falló la llamada a Claude: no se guardan en el
+        # diccionario ni se vuelven a consultar en esta ejecución
+        self.colegios_sin_claude = set()
+        
+        # Carrera por formulario único (se llena en el paso de formularios)
+        self.mapa_form_carrera = {}
+        
+        # Contador de colegios por método de resolución (se incrementa por fila)
+        self.contar_metodo = {
+            metodo: self.metricas.contador('colegios_resueltos', metodo=metodo).incrementar
+            for metodo in METODOS_COLEGIO
+        }
     
     def unificar_columnas(self, df):
         """Unifica columnas duplicadas"""
@@ -114,84 +210,70 @@ class NormalizadorLeads:
         self.logger.log("✅ Columnas unificadas")
         return df
     
-    def validar_colegio_localmente(self, colegio_str):
+    def validar_colegio_localmente(self, colegio_str, local=None):
         """
         Valida el colegio localmente usando diccionarios y patrones
         Retorna (valor_normalizado, metodo_usado) o (None, None) si no se pudo resolver
-        """
-        texto_lower = colegio_str.lower().strip()
         
+        Args:
+            local: Resultado de resolucion_paralela.resolver_localmente, si las
+                   reglas y el fuzzy match ya se corrieron en otro proceso
+        """
         # 1. Verificar si ya está en diccionario
         if colegio_str in self.diccionario['colegios']:
-            self.stats_diccionario += 1
+            self.contar_metodo['diccionario']()
             return self.diccionario['colegios'][colegio_str], 'diccionario'
         
-        # 2. Verificar si es respuesta inválida
-        if self.validadores.detectar_respuesta_invalida(colegio_str):
-            self.stats_respuestas_invalidas += 1
-            self.logger.log(f"⚠️ Respuesta inválida detectada: '{colegio_str}' → 'Otro'")
-            return "Otro", 'respuesta_invalida'
-        
-        # ⭐ 2.5 NUEVO: Verificar si es un título/carrera académica
-        if self.validadores.detectar_titulo_carrera(colegio_str):
-            self.stats_respuestas_invalidas += 1
-            self.logger.log(f"⚠️ Título académico detectado: '{colegio_str}' → 'Otro'")
-            return "Otro", 'titulo_carrera'
-        
-        # 3. Verificar si NO es colegio
-        if self.validadores.detectar_no_es_colegio(colegio_str):
-            self.stats_respuestas_invalidas += 1
-            self.logger.log(f"⚠️ No es un colegio detectado: '{colegio_str}' → 'Otro'")
-            return "Otro", 'no_es_colegio'
-        
-        # 4. Verificar si está en COLEGIOS_CONOCIDOS
-        if texto_lower in config.COLEGIOS_CONOCIDOS:
-            valor = config.COLEGIOS_CONOCIDOS[texto_lower]
-            self.stats_colegios_conocidos += 1
-            self.logger.log(f"✅ Colegio conocido: '{colegio_str}' → '{valor}'")
-            return valor, 'colegio_conocido'
-        
-        # 5. Verificar si es universidad conocida
-        universidad = self.validadores.buscar_universidad_conocida(colegio_str)
-        if universidad:
-            self.stats_universidades += 1
-            self.logger.log(f"🎓 Universidad detectada: '{colegio_str}' → '{universidad}'")
-            return universidad, 'universidad'
-        
-        # 6. Verificar patrones de colegio (Liceo, Instituto, Escuela, etc.)
-        for patron in config.PATRONES_COLEGIO:
-            if texto_lower.startswith(patron):
-                # Es un colegio, formatear el nombre
-                nombre_formateado = colegio_str.strip().title()
-                self.stats_patrones += 1
-                self.logger.log(f"📚 Patrón colegio detectado: '{colegio_str}' → '{nombre_formateado}'")
-                return nombre_formateado, 'patron_colegio'
-        
-        # 7. Fuzzy matching en diccionario
-        match = self.validadores.fuzzy_match(colegio_str, 'colegios', self.diccionario)
+        # 2 a 6. Reglas del config (respuesta inválida, título, no es colegio,
+        # colegio conocido, universidad, patrón de colegio)
+        previo = None
+        if local is None:
+            valor, metodo = self.validadores.clasificar_colegio(colegio_str)
+        else:
+            valor, metodo, previo, mensajes = local
+            for mensaje, args in mensajes:
+                self.logger.debug(mensaje, *args)
+        
+        if valor is not None:
+            self.contar_metodo[metodo]()
+            self.logger.debug(MENSAJES_REGLA_COLEGIO[metodo], colegio_str, valor)
+            return valor, metodo
+        
+        # 7. Fuzzy matching en diccionario (con previo, solo contra lo agregado después)
+        match = self.validadores.fuzzy_match(colegio_str, 'colegios', self.diccionario, previo=previo)
         if match:
-            self.stats_diccionario += 1
-            self.logger.log(f"✓ Fuzzy match: '{colegio_str}' → '{match}'")
+            self.contar_metodo['fuzzy_match']()
+            self.logger.debug("✓ Fuzzy match: '%s' → '%s'", colegio_str, match)
             return match, 'fuzzy_match'
         
         # No se pudo resolver localmente
         return None, None
     
-    def normalizar_colegio(self, colegio, modo_validacion=True):
-        """Normaliza nombre de colegio - VERSIÓN MEJORADA"""
+    def normalizar_colegio(self, colegio, modo_validacion=True, local=None, consulta=None):
+        """
+        Normaliza nombre de colegio - VERSIÓN MEJORADA
+        
+        Args:
+            local: Resolución local ya hecha en otro proceso (ver validar_colegio_localmente)
+            consulta: Consulta a Claude ya lanzada para este colegio (Future); si el
+                      colegio se resuelve sin Claude, se descarta
+        """
         if not colegio or pd.isna(colegio):
+            self.descartar_consulta(consulta, colegio)
             return "Otro"
         
         colegio_str = str(colegio).strip()
         if not colegio_str:
+            self.descartar_consulta(consulta, colegio_str)
             return "Otro"
         
         # ⭐ PRIMERO: Intentar validación local
-        valor_local, metodo = self.validar_colegio_localmente(colegio_str)
+        valor_local, metodo = self.validar_colegio_localmente(colegio_str, local)
         
         if valor_local is not None:
+            self.descartar_consulta(consulta, colegio_str)
+            
             # Se resolvió localmente
-            self.stats_validaciones_locales += 1
             
             # Guardar en diccionario si no estaba
             if colegio_str not in self.diccionario['colegios']:
@@ -200,7 +282,7 @@ class NormalizadorLeads:
             
             # ⭐ VALIDACIÓN MANUAL SELECTIVA: Solo para patrones de colegio si es modo validación
             if metodo == 'patron_colegio' and modo_validacion:
-                self.stats_validaciones_manuales += 1
+                self.metricas.incrementar('validaciones_manuales')
                 valor_validado = self.normalizador_claude.validar_normalizacion(
                     colegio_str,
                     valor_local,
@@ -214,9 +296,10 @@ class NormalizadorLeads:
         
         # ⭐ SEGUNDO: Si no se resolvió localmente, verificar siglas ambiguas
         if self.validadores.es_sigla_ambigua(colegio_str):
-            self.logger.log(f"🔍 Sigla ambigua detectada: '{colegio_str}'")
+            self.logger.debug("🔍 Sigla ambigua detectada: '%s'", colegio_str)
+            self.contar_metodo['sigla_ambigua']()
             if modo_validacion:
-                self.stats_validaciones_manuales += 1
+                self.metricas.incrementar('validaciones_manuales')
                 normalizado = self.normalizador_claude.validar_normalizacion(
                     colegio_str,
                     colegio_str,
@@ -229,12 +312,25 @@ class NormalizadorLeads:
                 return colegio_str
         
         # ⭐ TERCERO: Llamar a Claude (solo si no se resolvió localmente)
-        self.stats_claude += 1
-        normalizado = self.normalizador_claude.normalizar_con_claude(colegio_str, 'colegio')
+        if colegio_str in self.colegios_sin_claude:
+            self.descartar_consulta(consulta, colegio_str)
+            return colegio_str
+        
+        self.contar_metodo['claude']()
+        if consulta is not None:
+            normalizado = consulta.result()
+        else:
+            normalizado = self.normalizador_claude.normalizar_con_claude(colegio_str, 'colegio', texto_si_falla=False)
+        
+        if normalizado is None:
+            # Sin respuesta de Claude el texto crudo no es una normalización: no se guarda
+            self.colegios_sin_claude.add(colegio_str)
+            self.logger.log(f"⚠️ Claude no respondió para '{colegio_str}': se deja tal cual y no se guarda en el diccionario")
+            return colegio_str
         
         # ⭐ VALIDACIÓN MANUAL SELECTIVA: Solo si NO es "Otro" Y modo validación está activo
         if modo_validacion and normalizado.lower() != "otro":
-            self.stats_validaciones_manuales += 1
+            self.metricas.incrementar('validaciones_manuales')
             normalizado = self.normalizador_claude.validar_normalizacion(colegio_str, normalizado, 'colegio')
         
         # Guardar en diccionario
@@ -243,6 +339,32 @@ class NormalizadorLeads:
         
         return normalizado
     
+    def descartar_consulta(self, consulta, colegio_str):
+        """Cancela una consulta anticipada que no hizo falta (o la cuenta si ya se hizo)"""
+        if consulta is None or consulta.cancel():
+            return
+        self.metricas.incrementar('claude_descartadas')
+        self.logger.debug("🗑️ Consulta anticipada descartada (resuelto sin Claude): '%s'", colegio_str)
+    
+    def ratios_niveles_colegio(self):
+        """
+        Aciertos de cada nivel local de resolución de colegios (diccionario → reglas → fuzzy),
+        a partir de los contadores por método
+        
+        Returns:
+            Diccionario {nivel: (aciertos, consultas, ratio)}
+        """
+        por_metodo = {metodo: self.metricas.valor('colegios_resueltos', metodo=metodo) for metodo in METODOS_COLEGIO}
+        consultas = sum(por_metodo.values())
+        
+        ratios = {}
+        for nivel in NIVELES_COLEGIO:
+            aciertos = sum(cantidad for metodo, cantidad in por_metodo.items() if NIVEL_METODO_COLEGIO.get(metodo) == nivel)
+            if consultas:
+                ratios[nivel] = (aciertos, consultas, aciertos / consultas)
+            consultas -= aciertos
+        return ratios
+    
     def normalizar_grado(self, grado, modo_validacion=True):
         """
         Normaliza grado académico con detección completa de patrones
@@ -254,214 +376,24 @@ class NormalizadorLeads:
         Returns:
             Grado normalizado
         """
-        # Importar funciones auxiliares
-        from .validadores import es_valor_basura, detectar_graduacion_implicita, validar_grado_manual
-        
-        # ========================================
-        # PASO 1: Pre-procesamiento
-        # ========================================
-        
-        # Verificar si es nulo o vacío
-        if grado is None or pd.isna(grado):
-            if modo_validacion:
-                self.logger.log(f"⚠️ Valor nulo/vacío detectado - solicitando clasificación manual")
-                return validar_grado_manual("(vacío)", config.GRADOS_OPCIONES, self.logger)
-            else:
-                return "Sin especificar"
-        
-        # Convertir a string y limpiar
-        grado_str = str(grado).strip()
-        
-        # Verificar si está vacío después de strip
-        if not grado_str:
-            if modo_validacion:
-                self.logger.log(f"⚠️ Valor vacío detectado - solicitando clasificación manual")
-                return validar_grado_manual("(vacío)", config.GRADOS_OPCIONES, self.logger)
-            else:
-                return "Sin especificar"
-        
-        # Buscar en diccionario primero (si ya fue clasificado antes)
-        if grado_str in self.diccionario['grados']:
-            return self.diccionario['grados'][grado_str]
-        
-        # Normalizar formato: lowercase y quitar tildes
-        grado_lower = grado_str.lower()
-        grado_normalizado = grado_lower.replace('á', 'a').replace('é', 'e').replace('í', 'i').replace('ó', 'o').replace('ú', 'u').replace('ñ', 'n')
-        
-        # Reemplazar guiones bajos por espacios
-        grado_normalizado = grado_normalizado.replace('_', ' ')
-        
-        # ========================================
-        # PASO 2: Detectar Graduado Universitario
-        # ========================================
-        if 'graduado' in grado_normalizado and 'universitario' in grado_normalizado:
-            self.diccionario['grados'][grado_str] = "Graduado Universitario"
-            self.normalizaciones_nuevas.append(f"Grado: {grado_str} → Graduado Universitario")
-            return "Graduado Universitario"
-        
-        # ========================================
-        # PASO 3: Detectar Graduado Diversificado
-        # ========================================
-        if 'graduado' in grado_normalizado and 'diversificado' in grado_normalizado:
-            self.diccionario['grados'][grado_str] = "Graduado Diversificado"
-            self.normalizaciones_nuevas.append(f"Grado: {grado_str} → Graduado Diversificado")
-            return "Graduado Diversificado"
-        
-        # Detectar graduación implícita (finalizado, terminado, egresado)
-        if detectar_graduacion_implicita(grado_normalizado, config):
-            self.diccionario['grados'][grado_str] = "Graduado Diversificado"
-            self.normalizaciones_nuevas.append(f"Grado: {grado_str} → Graduado Diversificado")
-            return "Graduado Diversificado"
-        
-        # ========================================
-        # PASO 4: Detectar Estudiante Universitario
-        # ========================================
-        contador_keywords_universitario = 0
-        for keyword in config.KEYWORDS_UNIVERSITARIO:
-            if keyword in grado_normalizado:
-                contador_keywords_universitario += 1
-        
-        if contador_keywords_universitario >= 1:
-            self.diccionario['grados'][grado_str] = "Estudiante Universitario"
-            self.normalizaciones_nuevas.append(f"Grado: {grado_str} → Estudiante Universitario")
-            return "Estudiante Universitario"
-        
-        # ========================================
-        # PASO 5: Extraer número del texto
-        # ========================================
-        numero_extraido = None
-        
-        # 5.1 Buscar ordinales (4to, 5to, 6to, 7mo, 1ro, 2do, 3ro)
-        match_ordinal = re.search(r'(\d+)(to|mo|ro|do)\.?', grado_normalizado)
-        if match_ordinal:
-            numero_extraido = match_ordinal.group(1)
-        
-        # 5.2 Si no encontró ordinal, buscar números en texto
-        if not numero_extraido:
-            for texto_num, digito in config.NUMEROS_TEXTO.items():
-                if texto_num in grado_normalizado:
-                    numero_extraido = digito
-                    break
-        
-        # 5.3 Si no encontró número en texto, buscar dígito solo
-        if not numero_extraido:
-            match_digito = re.search(r'\b([1-7])\b', grado_normalizado)
-            if match_digito:
-                numero_extraido = match_digito.group(1)
-        
-        # ========================================
-        # PASO 6: Clasificar por número
-        # ========================================
-        if numero_extraido:
-            # Convertir a int para comparar
-            num = int(numero_extraido)
-            
-            # BÁSICOS (1-3)
-            if num in [1, 2, 3]:
-                # Verificar si tiene contexto de "básico"
-                tiene_basico = any(keyword in grado_normalizado for keyword in config.KEYWORDS_BASICO)
-                
-                if tiene_basico:
-                    # Formatear según el número
-                    if num == 1:
-                        resultado = "1ro. Básico"
-                    elif num == 2:
-                        resultado = "2do. Básico"
-                    else:  # num == 3
-                        resultado = "3ro. Básico"
-                    
-                    self.diccionario['grados'][grado_str] = resultado
-                    self.normalizaciones_nuevas.append(f"Grado: {grado_str} → {resultado}")
-                    return resultado
-                else:
-                    # No tiene contexto, preguntar
-                    if modo_validacion:
-                        self.logger.log(f"⚠️ Número {num} sin contexto - solicitando clasificación manual")
-                        resultado = validar_grado_manual(grado_str, config.GRADOS_OPCIONES, self.logger)
-                        self.diccionario['grados'][grado_str] = resultado
-                        self.normalizaciones_nuevas.append(f"Grado: {grado_str} → {resultado}")
-                        return resultado
-                    else:
-                        # Sin modo validación, asumir básico
-                        if num == 1:
-                            resultado = "1ro. Básico"
-                        elif num == 2:
-                            resultado = "2do. Básico"
-                        else:
-                            resultado = "3ro. Básico"
-                        
-                        self.diccionario['grados'][grado_str] = resultado
-                        return resultado
-            
-            # DIVERSIFICADO (4-7)
-            elif num in [4, 5, 6, 7]:
-                # Formatear según el número
-                if num == 4:
-                    resultado = "4to. Diversificado"
-                elif num == 5:
-                    resultado = "5to. Diversificado"
-                elif num == 6:
-                    resultado = "6to. Diversificado"
-                else:  # num == 7
-                    resultado = "7mo. Diversificado"
-                
-                self.diccionario['grados'][grado_str] = resultado
-                self.normalizaciones_nuevas.append(f"Grado: {grado_str} → {resultado}")
-                return resultado
-        
-        # ========================================
-        # PASO 7: Detectar diversificado SIN número
-        # ========================================
-        tiene_keyword_diversificado = any(keyword in grado_normalizado for keyword in config.KEYWORDS_DIVERSIFICADO)
-        
-        if tiene_keyword_diversificado:
-            resultado = "5to. Diversificado"
-            self.diccionario['grados'][grado_str] = resultado
-            self.normalizaciones_nuevas.append(f"Grado: {grado_str} → {resultado}")
-            return resultado
-        
-        # ========================================
-        # PASO 8: Detectar valores basura
-        # ========================================
-        if es_valor_basura(grado_normalizado, config):
-            resultado = "5to. Diversificado"
-            self.diccionario['grados'][grado_str] = resultado
-            self.normalizaciones_nuevas.append(f"Grado: {grado_str} → {resultado} (basura)")
-            return resultado
-        
-        # ========================================
-        # PASO 9: Default - no coincide con nada
-        # ========================================
-        resultado = "5to. Diversificado"
-        self.diccionario['grados'][grado_str] = resultado
-        self.normalizaciones_nuevas.append(f"Grado: {grado_str} → {resultado} (default)")
-        return resultado
+        return self.clasificador_grados.normalizar(
+            grado,
+            self.diccionario,
+            self.normalizaciones_nuevas,
+            modo_validacion=modo_validacion
+        )
     
     def normalizar_telefono(self, telefono):
-            """
-            Limpia y normaliza números de teléfono
-            1. Quita todo lo que NO sea número (espacios, guiones, +, paréntesis, etc.)
-            2. Toma los últimos 8 dígitos
-            """
-            if pd.isna(telefono) or str(telefono).strip() == '':
-                return ''
-            
-            # Convertir a string y limpiar
-            telefono_str = str(telefono).strip()
-            
-            # Paso 1: Quitar todo excepto números
-            solo_numeros = re.sub(r'\D', '', telefono_str)
-            
-            # Paso 2: Tomar los últimos 8 dígitos
-            if len(solo_numeros) >= 8:
-                return solo_numeros[-8:]
-            else:
-                return solo_numeros  # Si tiene menos de 8, devolver lo que haya
+        """Limpia y normaliza números de teléfono (ver normalizar_telefono)"""
+        return normalizar_telefono(telefono)
 
     def completar_carrera(self, row):
         """
         Completa la carrera de interés - VERSIÓN MEJORADA
         Procesa valores del CSV (con underscores) y desde formularios
+        
+        Args:
+            row: Fila (Serie o dict) con 'Carrera de Interés' y '___FORM_LIMPIO___'
         """
         # 1. Revisar si ya tiene un valor en "Carrera de Interés"
         carrera_actual = row.get('Carrera de Interés', '')
@@ -484,14 +416,17 @@ class NormalizadorLeads:
             carrera_limpia = str(carrera_actual).replace('_', ' ').title()
             return carrera_limpia
         
-        # 2. Si no tiene carrera, intentar mapear desde formulario
+        # 2. Si no tiene carrera, intentar mapear desde formulario (mapa precalculado)
         form_limpio = row.get('___FORM_LIMPIO___', '')
-        carrera_mapeada = self.form_mapper.mapear_form_a_carrera(
-            form_limpio,
-            self.diccionario,
-            self.formularios_nuevos,
-            modo_interactivo=False
-        )
+        if form_limpio in self.mapa_form_carrera:
+            carrera_mapeada = self.mapa_form_carrera[form_limpio]
+        else:
+            carrera_mapeada = self.form_mapper.mapear_form_a_carrera(
+                form_limpio,
+                self.diccionario,
+                self.formularios_nuevos,
+                modo_interactivo=False
+            )
         
         if carrera_mapeada:
             return carrera_mapeada
@@ -504,84 +439,210 @@ class NormalizadorLeads:
         # Obtener estadísticas de Claude
         stats_claude = self.normalizador_claude.get_estadisticas()
         
-        total_colegios = self.stats_validaciones_locales + self.stats_claude
+        # Contadores del registro de métricas
+        stats_validaciones_locales = sum(
+            self.metricas.valor('colegios_resueltos', metodo=metodo) for metodo in NIVEL_METODO_COLEGIO
+        )
+        stats_claude_colegios = self.metricas.valor('colegios_resueltos', metodo='claude')
+        stats_diccionario = (self.metricas.valor('colegios_resueltos', metodo='diccionario')
+                             + self.metricas.valor('colegios_resueltos', metodo='fuzzy_match'))
+        stats_respuestas_invalidas = sum(
+            self.metricas.valor('colegios_resueltos', metodo=metodo) for metodo in METODOS_RESPUESTA_INVALIDA
+        )
+        stats_validaciones_manuales = self.metricas.valor('validaciones_manuales')
+        
+        total_colegios = stats_validaciones_locales + stats_claude_colegios
         porcentaje_local = 0
         porcentaje_claude = 0
         
         if total_colegios > 0:
-            porcentaje_local = (self.stats_validaciones_locales / total_colegios) * 100
-            porcentaje_claude = (self.stats_claude / total_colegios) * 100
+            porcentaje_local = (stats_validaciones_locales / total_colegios) * 100
+            porcentaje_claude = (stats_claude_colegios / total_colegios) * 100
         
         self.logger.log("\n" + "━"*60)
         self.logger.log("📊 ESTADÍSTICAS DE NORMALIZACIÓN DE COLEGIOS")
         self.logger.log("━"*60)
         self.logger.log(f"\nTotal de colegios procesados: {total_colegios}")
         
-        self.logger.log(f"\n🏠 VALIDACIONES LOCALES (sin Claude): {self.stats_validaciones_locales} ({porcentaje_local:.1f}%)")
-        self.logger.log(f"  ├─ En diccionario previo: {self.stats_diccionario}")
-        self.logger.log(f"  ├─ Respuestas inválidas → 'Otro': {self.stats_respuestas_invalidas}")
-        self.logger.log(f"  ├─ Colegios conocidos: {self.stats_colegios_conocidos}")
-        self.logger.log(f"  ├─ Universidades conocidas: {self.stats_universidades}")
-        self.logger.log(f"  └─ Patrones automáticos: {self.stats_patrones}")
+        self.logger.log(f"\n🏠 VALIDACIONES LOCALES (sin Claude): {stats_validaciones_locales} ({porcentaje_local:.1f}%)")
+        self.logger.log(f"  ├─ En diccionario previo: {stats_diccionario}")
+        self.logger.log(f"  ├─ Respuestas inválidas → 'Otro': {stats_respuestas_invalidas}")
+        self.logger.log(f"  ├─ Colegios conocidos: {self.metricas.valor('colegios_resueltos', metodo='colegio_conocido')}")
+        self.logger.log(f"  ├─ Universidades conocidas: {self.metricas.valor('colegios_resueltos', metodo='universidad')}")
+        self.logger.log(f"  └─ Patrones automáticos: {self.metricas.valor('colegios_resueltos', metodo='patron_colegio')}")
         
-        self.logger.log(f"\n🤖 CONSULTAS A CLAUDE API: {self.stats_claude} ({porcentaje_claude:.1f}%)")
+        self.logger.log(f"\n🤖 CONSULTAS A CLAUDE API: {stats_claude_colegios} ({porcentaje_claude:.1f}%)")
         self.logger.log(f"  ├─ Sin web_search: {stats_claude['llamadas_sin_web_search']}")
         self.logger.log(f"  ├─ Con web_search: {stats_claude['llamadas_con_web_search']}")
         self.logger.log(f"  └─ % con web_search: {stats_claude['porcentaje_web_search']}%")
-        
-        if self.stats_validaciones_manuales > 0:
-            self.logger.log(f"\n✋ VALIDACIONES MANUALES: {self.stats_validaciones_manuales}")
-        
+        descartadas = self.metricas.valor('claude_descartadas')
+        if descartadas:
+            self.logger.log(f"  🗑️ Consultas anticipadas descartadas (resueltas sin Claude): {descartadas}")
+        
+        latencia = stats_claude['latencia']
+        if latencia['cantidad']:
+            self.logger.log(f"  ⏱️ Latencia p50/p95/p99: {latencia['p50']:.2f} / {latencia['p95']:.2f} / {latencia['p99']:.2f} s")
+        
+        if stats_validaciones_manuales > 0:
+            self.logger.log(f"\n✋ VALIDACIONES MANUALES: {stats_validaciones_manuales}")
+        
+        ratios = {**self.ratios_niveles_colegio(), **self.metricas.ratios_cache()}
+        if ratios:
+            self.logger.log("\n⚡ ACIERTOS POR NIVEL DE CACHÉ:")
+            for nivel, (aciertos, consultas, ratio) in ratios.items():
+                self.logger.log(f"  • {nivel}: {aciertos}/{consultas} ({ratio * 100:.1f}%)")
+        
+        # Variantes por valor canónico (índice inverso del diccionario)
+        top_canonicos = self.validadores.reporte_variantes('colegios', self.diccionario, top=5)
+        if top_canonicos:
+            self.logger.log(f"\n📚 VALORES CANÓNICOS CON MÁS VARIANTES:")
+            for canonico, cantidad in top_canonicos:
+                self.logger.log(f"  • {canonico}: {cantidad} variantes")
+
         self.logger.log(f"\n💡 Tokens usados: {stats_claude['tokens_totales']:,}")
-        costo = (stats_claude['tokens_totales'] / 1_000_000) * 3
+        costo = self.costo_claude(stats_claude['tokens_totales'])
         self.logger.log(f"💰 Costo aproximado: ${costo:.4f}")
         self.logger.log("━"*60)
     
-    def procesar_leads(self, modo_validacion=True):
-        """Proceso principal de normalización"""
-        self.logger.log("\n" + "="*60)
-        self.logger.log("🚀 INICIANDO NORMALIZACIÓN")
-        self.logger.log("="*60)
+    def costo_claude(self, tokens):
+        """Costo aproximado en USD de los tokens usados"""
+        return (tokens / 1_000_000) * config.CLAUDE_COSTO_MILLON_TOKENS
+    
+    def guardar_metricas(self, filas, inicio):
+        """
+        Escribe el reporte JSON de la ejecución y el archivo de Prometheus
         
-        # 1. Leer CSV
-        self.logger.log(f"\n📂 Leyendo: {config.INPUT_FILE}")
-        try:
-            df = pd.read_csv(config.INPUT_FILE, encoding='utf-8')
-            self.logger.log(f"✅ Leído: {len(df)} leads")
-        except Exception as e:
-            self.logger.log(f"❌ Error: {e}")
-            return
+        Args:
+            filas: Leads procesados
+            inicio: datetime de inicio de la ejecución
+        """
+        reloj, cpu, espera = self.instrumentacion.totales()
+        computo = max(reloj - espera, 0.0)
+        tokens = self.normalizador_claude.get_tokens_usados()
+        
+        self.metricas.fijar('ejecucion_timestamp_segundos', round(inicio.timestamp(), 3))
+        self.metricas.fijar('ejecucion_filas', filas)
+        self.metricas.fijar('ejecucion_duracion_segundos', round(reloj, 6))
+        self.metricas.fijar('ejecucion_cpu_segundos', round(cpu, 6))
+        self.metricas.fijar('ejecucion_espera_usuario_segundos', round(espera, 6))
+        self.metricas.fijar('ejecucion_filas_por_segundo', round(filas / computo, 3) if computo else 0)
+        self.metricas.fijar('claude_costo_usd', round(self.costo_claude(tokens), 6))
+        for etapa in self.instrumentacion.etapas:
+            self.metricas.fijar('etapa_duracion_segundos', round(etapa.reloj, 6), etapa=etapa.nombre)
+        ratios = {**self.ratios_niveles_colegio(), **self.metricas.ratios_cache()}
+        for nivel, (_, _, ratio) in ratios.items():
+            self.metricas.fijar('cache_ratio_aciertos', round(ratio, 4), nivel=nivel)
+        
+        reporte = {
+            'inicio': inicio.isoformat(timespec='seconds'),
+            'archivo_entrada': config.INPUT_FILE,
+            'filas': filas,
+            'normalizaciones_nuevas': len(self.normalizaciones_nuevas),
+            'claude': self.normalizador_claude.get_estadisticas(),
+            'cache': {
+                nivel: {'aciertos': aciertos, 'consultas': consultas, 'ratio': round(ratio, 4)}
+                for nivel, (aciertos, consultas, ratio) in ratios.items()
+            },
+            'ejecucion': self.instrumentacion.total.como_dict() if self.instrumentacion.total else None,
+            'etapas': [etapa.como_dict() for etapa in self.instrumentacion.etapas],
+        }
+        ruta_json = os.path.join(config.METRICAS_DIR, f"ejecucion_{inicio:%Y%m%d_%H%M%S}.json")
         
-        # 2. Unificar columnas
-        df = self.unificar_columnas(df)
+        try:
+            self.metricas.guardar(ruta_json, config.METRICAS_PROMETHEUS, reporte)
+            self.logger.log(f"📈 Métricas guardadas: {ruta_json}")
+        except OSError as e:
+            self.logger.log(f"⚠️ No se pudieron guardar las métricas: {e}")
+    
+    def hilos_claude(self):
+        """
+        Consultas a Claude anticipadas a la vez. Con --profile no se anticipa
+        nada: las consultas en segundo plano ensuciarían los tiempos de las
+        etapas, que corren en serie
+        """
+        return 0 if self.instrumentacion.perfil_dir else config.CLAUDE_HILOS
+    
+    def conviene_anticipar(self, cantidad_colegios):
+        """
+        Si la etapa 'Resolución anticipada' sirve de algo: hay consultas a Claude
+        para anticipar o los colegios alcanzan para el pool de procesos. Si no,
+        normalizar_colegios_unicos resuelve cada colegio en su turno con el
+        índice de self.validadores (sin una segunda pasada ni un segundo índice)
+        """
+        if self.hilos_claude() and self.normalizador_claude.client:
+            return True
+        return self.procesos > 1 and cantidad_colegios >= config.COLEGIOS_MIN_PARALELO
+    
+    def anticipar_colegios(self, colegios_unicos):
+        """
+        Etapa de fondo: resolución local de los colegios únicos (en procesos si
+        son muchos) y consultas a Claude de los que queden pendientes, para que
+        estén listas (o en camino) cuando normalizar_colegios_unicos llegue a ellos
         
-        # 3. Normalizar colegios
+        Returns:
+            ConsultasAnticipadas
+        """
+        limpios = list(dict.fromkeys(str(c).strip() for c in colegios_unicos))
+        anticipadas = ConsultasAnticipadas(self.normalizador_claude, self.validadores, self.logger, self.hilos_claude())
+        return anticipadas.iniciar(
+            limpios,
+            self.diccionario['colegios'],
+            procesos=self.procesos,
+            min_paralelo=config.COLEGIOS_MIN_PARALELO
+        )
+    
+    def normalizar_colegios_unicos(self, colegios_unicos, modo_validacion, anticipadas=None):
+        """
+        Etapa 3: decide cada colegio único una vez, en el orden original (reglas,
+        fuzzy, Claude, validación manual), con lo que ya resolvió anticipar_colegios
+        (si la etapa corrió, ver conviene_anticipar)
+        """
         self.logger.log("\n🏫 Normalizando colegios...")
-        colegios_unicos = df['___COLEGIO_UNIFICADO___'].unique()
-        colegios_unicos = [c for c in colegios_unicos if c and str(c).strip()]
-        
         self.logger.log(f"Colegios únicos: {len(colegios_unicos)}")
         
-        # Normalizar todos los colegios únicos primero
-        for colegio in colegios_unicos:
-            self.normalizar_colegio(colegio, modo_validacion=modo_validacion)
+        if anticipadas is None:
+            for colegio in colegios_unicos:
+                self.normalizar_colegio(colegio, modo_validacion=modo_validacion)
+            return
         
-        # Aplicar normalizaciones a todas las filas
-        df['___COLEGIO_NORMALIZADO___'] = df['___COLEGIO_UNIFICADO___'].apply(
-            lambda x: self.normalizar_colegio(x, modo_validacion=False)
-        )
+        try:
+            for colegio in colegios_unicos:
+                colegio_str = str(colegio).strip()
+                self.normalizar_colegio(colegio, modo_validacion=modo_validacion,
+                                        local=anticipadas.local(colegio_str),
+                                        consulta=anticipadas.consulta(colegio_str))
+        finally:
+            anticipadas.cerrar()
+    
+    def normalizar_colegios_por_fila(self, colegios, _):
+        """Aplica a cada fila las normalizaciones de colegios ya decididas"""
+        return colegios.apply(lambda x: self.normalizar_colegio(x, modo_validacion=False))
+    
+    def normalizar_grados(self, grados, modo_validacion):
+        """
+        Etapa 4: grados académicos (una decisión por valor distinto)
         
-        # 4. Normalizar grados
+        Returns:
+            Tupla (serie normalizada, normalizaciones nuevas): las normalizaciones
+            se agregan después de las de colegios, como cuando las etapas iban en serie
+        """
         self.logger.log("\n🎓 Normalizando grados académicos...")
-        df['___GRADO_NORMALIZADO___'] = df['___GRADO_UNIFICADO___'].apply(self.normalizar_grado)
-
-        # 📞 Normalizando números de teléfono...
-        if 'Phone Number' in df.columns:
-            self.logger.log("\n📞 Normalizando números de teléfono...")
-            df['Phone Number'] = df['Phone Number'].apply(self.normalizar_telefono)
-            self.logger.log("✅ Teléfonos normalizados (últimos 8 dígitos)")
+        normalizaciones = []
+        serie = self.clasificador_grados.normalizar_serie(
+            grados,
+            self.diccionario,
+            normalizaciones,
+            modo_validacion=modo_validacion
+        )
+        return serie, normalizaciones
+    
+    def procesar_formularios(self, df, modo_validacion):
+        """
+        Etapa 5: primer formulario de cada fila y carrera de cada formulario único
         
-        # 5. Procesar formularios
+        Returns:
+            Serie con el formulario limpio de cada fila
+        """
         self.logger.log("\n📝 Procesando Associated Form Submission...")
         
         # Buscar la columna de formularios sin importar mayúsculas
@@ -593,28 +654,28 @@ class NormalizadorLeads:
         
         if form_col_input:
             self.logger.log(f"✓ Columna encontrada: '{form_col_input}'")
-            df['___FORM_LIMPIO___'] = df[form_col_input].apply(self.form_mapper.extraer_primer_form)
+            formularios = df[form_col_input].apply(self.form_mapper.extraer_primer_form)
             self.logger.log(f"✓ Procesados {len(df)} formularios")
         else:
             self.logger.log("⚠️ No se encontró columna de formularios, usando 'Otro'")
-            df['___FORM_LIMPIO___'] = 'Otro'
+            formularios = pd.Series('Otro', index=df.index, dtype=object)
         
-        if modo_validacion:
-            self.logger.log("\n🎓 Identificando formularios únicos...")
-            formularios_unicos = df['___FORM_LIMPIO___'].unique()
-            formularios_unicos = [f for f in formularios_unicos if f and f != "Otro" and str(f).strip()]
-            
-            self.logger.log(f"Formularios únicos encontrados: {len(formularios_unicos)}")
-            
-            for form in formularios_unicos:
-                self.form_mapper.mapear_form_a_carrera(
-                    form, 
-                    self.diccionario, 
-                    self.formularios_nuevos, 
-                    modo_interactivo=True
-                )
+        self.logger.log("\n🎓 Identificando formularios únicos...")
+        self.mapa_form_carrera = self.form_mapper.resolver_formularios(
+            formularios,
+            self.diccionario,
+            self.formularios_nuevos,
+            modo_interactivo=modo_validacion
+        )
+        return formularios
+    
+    def completar_carreras(self, df, formularios):
+        """
+        Etapa 6: completa la carrera de interés (con el formulario si no viene en el CSV)
         
-        # 6. Completar Carrera
+        Returns:
+            Tupla (columna de carrera encontrada o None, serie de carreras completadas)
+        """
         self.logger.log("\n🎯 Completando Carrera de Interés...")
         
         # Buscar la columna de carrera sin importar mayúsculas
@@ -624,152 +685,236 @@ class NormalizadorLeads:
                 carrera_col_input = col
                 break
         
-        if carrera_col_input:
-            self.logger.log(f"✓ Columna encontrada: '{carrera_col_input}'")
-            df['Carrera de Interés'] = df[carrera_col_input]
-            df['___CARRERA_COMPLETADA___'] = df.apply(self.completar_carrera, axis=1)
-        else:
+        if not carrera_col_input:
             self.logger.log("⚠️ No se encontró columna 'Carrera de Interés'")
-            df['___CARRERA_COMPLETADA___'] = 'Sin especificar'
-        
-        # 7. Identificar URLs únicas
-        if modo_validacion:
-            self.logger.log("\n🔗 Identificando URLs únicas...")
-            
-            urls_first = df['First Page Seen'].dropna().unique() if 'First Page Seen' in df.columns else []
-            urls_last = df['Last Page Seen'].dropna().unique() if 'Last Page Seen' in df.columns else []
-            urls_unicas = set(list(urls_first) + list(urls_last))
-            
-            self.logger.log(f"URLs únicas encontradas: {len(urls_unicas)}")
-            
-            for url in urls_unicas:
-                self.url_categorizer.categorizar_url(
-                    url, 
-                    self.diccionario, 
-                    self.urls_nuevas, 
-                    modo_interactivo=True
-                )
+            return None, 'Sin especificar'
+        
+        self.logger.log(f"✓ Columna encontrada: '{carrera_col_input}'")
+        # completar_carrera solo lee estas dos columnas: un dict por fila
+        # en lugar de armar una Serie por fila con df.apply(axis=1)
+        carreras = [
+            self.completar_carrera({'Carrera de Interés': carrera, '___FORM_LIMPIO___': form})
+            for carrera, form in zip(df[carrera_col_input], formularios)
+        ]
+        return carrera_col_input, pd.Series(carreras, index=df.index, dtype=object)
+    
+    def categorizar_urls(self, df, modo_validacion):
+        """
+        Etapas 7-8: First y Last Page Seen juntas, una vez por URL distinta
         
-        # 8. Categorizar URLs
+        Returns:
+            {columna temporal: serie de categorías}
+        """
         self.logger.log("\n🔗 Categorizando URLs...")
         
-        if 'First Page Seen' in df.columns:
-            df['___PRIMERA_PAGINA___'] = df['First Page Seen'].apply(
-                lambda x: self.url_categorizer.categorizar_url(
-                    x, 
-                    self.diccionario, 
-                    self.urls_nuevas, 
-                    modo_interactivo=False
-                )
-            )
-        else:
-            self.logger.log("⚠️ No se encontró First Page Seen")
-            df['___PRIMERA_PAGINA___'] = 'Otro'
-        
-        if 'Last Page Seen' in df.columns:
-            df['___ULTIMA_PAGINA___'] = df['Last Page Seen'].apply(
-                lambda x: self.url_categorizer.categorizar_url(
-                    x, 
-                    self.diccionario, 
-                    self.urls_nuevas, 
-                    modo_interactivo=False
-                )
-            )
-        else:
-            self.logger.log("⚠️ No se encontró Last Page Seen")
-            df['___ULTIMA_PAGINA___'] = 'Otro'
+        columnas_url = {
+            'First Page Seen': '___PRIMERA_PAGINA___',
+            'Last Page Seen': '___ULTIMA_PAGINA___',
+        }
+        presentes = [col for col in columnas_url if col in df.columns]
         
-        # 9. Reemplazar columnas originales
-        self.logger.log("\n🔄 Reemplazando columnas originales...")
+        categorizadas = self.url_categorizer.categorizar_columnas(
+            [df[col] for col in presentes],
+            self.diccionario,
+            self.urls_nuevas,
+            modo_interactivo=modo_validacion
+        )
         
-        # Grado Académico
-        if 'Grado Académico' in df.columns:
-            df['Grado Académico'] = df['___GRADO_NORMALIZADO___']
-            self.logger.log("✅ Reemplazada columna: Grado Académico")
+        resultado = {}
+        for col, temporal in columnas_url.items():
+            if col in presentes:
+                resultado[temporal] = categorizadas[presentes.index(col)]
+            else:
+                self.logger.log(f"⚠️ No se encontró {col}")
+                resultado[temporal] = 'Otro'
+        return resultado
+    
+    def procesar_leads(self, modo_validacion=True):
+        """Proceso principal de normalización"""
+        inicio = datetime.now()
+        self.instrumentacion.iniciar_ejecucion()
+        self.logger.log("\n" + "="*60)
+        self.logger.log("🚀 INICIANDO NORMALIZACIÓN")
+        self.logger.log("="*60)
+        
+        # 1. Leer CSV
+        with self.instrumentacion.etapa('Leer CSV') as etapa:
+            self.logger.log(f"\n📂 Leyendo: {config.INPUT_FILE}")
+            try:
+                df = pd.read_csv(config.INPUT_FILE, encoding='utf-8')
+                etapa.filas = len(df)
+                self.logger.log(f"✅ Leído: {len(df)} leads")
+                if len(df) > config.LOG_FILAS_MODO_SILENCIOSO:
+                    self.logger.log(f"🔇 Modo silencioso: más de {config.LOG_FILAS_MODO_SILENCIOSO} leads, hasta el "
+                                    f"resumen final la consola solo muestra avisos (el detalle va al log)")
+                    self.logger.silenciar()
+            except Exception as e:
+                self.logger.log(f"❌ Error: {e}")
+                return
         
-        if 'Grado Académico.1' in df.columns:
-            df.drop('Grado Académico.1', axis=1, inplace=True)
-            self.logger.log("✅ Eliminada columna duplicada: Grado Académico.1")
+        # 2. Unificar columnas
+        with self.instrumentacion.etapa('Unificar columnas', filas=len(df)):
+            df = self.unificar_columnas(df)
+        
+        # 3-8. Colegio, grado, teléfono, formulario (y la carrera, que depende
+        # del formulario) y URLs leen columnas distintas: el plan corre a la vez
+        # las que no preguntan nada; las interactivas quedan en el hilo principal.
+        # Las columnas se escriben al final, en el mismo orden de siempre.
+        interactiva = PRINCIPAL if modo_validacion else HILOS
+        plan = PlanEtapas(
+            self.instrumentacion,
+            hilos=0 if self.instrumentacion.perfil_dir else config.ETAPAS_HILOS,
+            procesos=config.ETAPAS_PROCESOS
+        )
         
-        # Colegio Actual
-        if 'Colegio Actual' in df.columns:
-            df['Colegio Actual'] = df['___COLEGIO_NORMALIZADO___']
-            self.logger.log("✅ Reemplazada columna: Colegio Actual")
+        # Las consultas a Claude de los colegios arrancan primero, en segundo plano;
+        # la validación de colegios va después de las demás preguntas, así el
+        # operador responde grados, formularios y URLs mientras Claude trabaja
+        colegios_unicos = df['___COLEGIO_UNIFICADO___'].unique()
+        colegios_unicos = [c for c in colegios_unicos if c and str(c).strip()]
+        anticipar = self.conviene_anticipar(len(colegios_unicos))
+        if anticipar:
+            plan.agregar('Resolución anticipada', self.anticipar_colegios, colegios_unicos,
+                         filas=len(colegios_unicos))
+        plan.agregar('Grados', self.normalizar_grados, df['___GRADO_UNIFICADO___'], modo_validacion,
+                     en=interactiva, filas=len(df))
+        if 'Phone Number' in df.columns:
+            self.logger.log("\n📞 Normalizando números de teléfono...")
+            plan.agregar('Teléfonos', aplicar, normalizar_telefono, df['Phone Number'],
+                         en=PROCESOS, filas=len(df))
+        plan.agregar('Formularios', self.procesar_formularios, df, modo_validacion,
+                     en=interactiva, filas=len(df))
+        plan.agregar('Carrera de Interés', self.completar_carreras, df,
+                     depende=['Formularios'], filas=len(df))
+        plan.agregar('URLs', self.categorizar_urls, df, modo_validacion,
+                     en=interactiva, filas=len(df))
+        plan.agregar('Colegios únicos', self.normalizar_colegios_unicos, colegios_unicos, modo_validacion,
+                     depende=['Resolución anticipada'] if anticipar else [], en=interactiva,
+                     filas=len(colegios_unicos))
+        plan.agregar('Colegios por fila', self.normalizar_colegios_por_fila, df['___COLEGIO_UNIFICADO___'],
+                     depende=['Colegios únicos'], filas=len(df))
+        
+        resultados = plan.ejecutar()
+        
+        df['___COLEGIO_NORMALIZADO___'] = resultados['Colegios por fila']
+        
+        grados, normalizaciones_grados = resultados['Grados']
+        df['___GRADO_NORMALIZADO___'] = grados
+        self.normalizaciones_nuevas.extend(normalizaciones_grados)
+        
+        if 'Teléfonos' in resultados:
+            df['Phone Number'] = resultados['Teléfonos']
+            self.logger.log("✅ Teléfonos normalizados (últimos 8 dígitos)")
         
-        if 'En qué colegio estudias actualmente?' in df.columns:
-            df.drop('En qué colegio estudias actualmente?', axis=1, inplace=True)
-            self.logger.log("✅ Eliminada columna redundante: En qué colegio estudias actualmente?")
+        df['___FORM_LIMPIO___'] = resultados['Formularios']
         
-        # ⭐ Associated Form Submission - CON DEBUGGING
-        form_col = None
-        for col in df.columns:
-            if col.lower() == 'associated form submission':
-                form_col = col
-                break
+        carrera_col_input, carreras = resultados['Carrera de Interés']
+        if carrera_col_input:
+            df['Carrera de Interés'] = df[carrera_col_input]
+        df['___CARRERA_COMPLETADA___'] = carreras
         
-        if form_col and '___FORM_LIMPIO___' in df.columns:
-            # Mostrar valores antes y después para debug
-            self.logger.log(f"✓ Reemplazando '{form_col}'...")
-            self.logger.log(f"  Ejemplo ANTES: {df[form_col].iloc[0] if len(df) > 0 else 'N/A'}")
-            self.logger.log(f"  Ejemplo PROCESADO: {df['___FORM_LIMPIO___'].iloc[0] if len(df) > 0 else 'N/A'}")
+        for temporal, categorias in resultados['URLs'].items():
+            df[temporal] = categorias
+        
+        # 9. Reemplazar columnas originales
+        with self.instrumentacion.etapa('Reemplazar columnas'):
+            self.logger.log("\n🔄 Reemplazando columnas originales...")
             
-            df[form_col] = df['___FORM_LIMPIO___']
+            # Grado Académico
+            if 'Grado Académico' in df.columns:
+                df['Grado Académico'] = df['___GRADO_NORMALIZADO___']
+                self.logger.log("✅ Reemplazada columna: Grado Académico")
             
-            self.logger.log(f"  Ejemplo DESPUÉS: {df[form_col].iloc[0] if len(df) > 0 else 'N/A'}")
-            self.logger.log(f"✅ Reemplazada columna: {form_col}")
-        else:
-            if not form_col:
-                self.logger.log("❌ ERROR: No se encontró columna 'Associated Form Submission'")
-                self.logger.log(f"   Columnas disponibles: {list(df.columns)}")
+            if 'Grado Académico.1' in df.columns:
+                df.drop('Grado Académico.1', axis=1, inplace=True)
+                self.logger.log("✅ Eliminada columna duplicada: Grado Académico.1")
+            
+            # Colegio Actual
+            if 'Colegio Actual' in df.columns:
+                df['Colegio Actual'] = df['___COLEGIO_NORMALIZADO___']
+                self.logger.log("✅ Reemplazada columna: Colegio Actual")
+            
+            if 'En qué colegio estudias actualmente?' in df.columns:
+                df.drop('En qué colegio estudias actualmente?', axis=1, inplace=True)
+                self.logger.log("✅ Eliminada columna redundante: En qué colegio estudias actualmente?")
+            
+            # ⭐ Associated Form Submission - CON DEBUGGING
+            form_col = None
+            for col in df.columns:
+                if col.lower() == 'associated form submission':
+                    form_col = col
+                    break
+            
+            if form_col and '___FORM_LIMPIO___' in df.columns:
+                # Mostrar valores antes y después para debug
+                self.logger.log(f"✓ Reemplazando '{form_col}'...")
+                self.logger.log(f"  Ejemplo ANTES: {df[form_col].iloc[0] if len(df) > 0 else 'N/A'}")
+                self.logger.log(f"  Ejemplo PROCESADO: {df['___FORM_LIMPIO___'].iloc[0] if len(df) > 0 else 'N/A'}")
+                
+                df[form_col] = df['___FORM_LIMPIO___']
+                
+                self.logger.log(f"  Ejemplo DESPUÉS: {df[form_col].iloc[0] if len(df) > 0 else 'N/A'}")
+                self.logger.log(f"✅ Reemplazada columna: {form_col}")
             else:
-                self.logger.log("❌ ERROR: No se encontró columna temporal '___FORM_LIMPIO___'")
-        
-        # ⭐ Carrera de Interés - CON DEBUGGING
-        carrera_col = None
-        for col in df.columns:
-            if col.lower() == 'carrera de interés':
-                carrera_col = col
-                break
-        
-        if carrera_col and '___CARRERA_COMPLETADA___' in df.columns:
-            self.logger.log(f"✓ Reemplazando '{carrera_col}'...")
-            df[carrera_col] = df['___CARRERA_COMPLETADA___']
-            self.logger.log(f"✅ Reemplazada columna: {carrera_col}")
-        else:
-            if not carrera_col:
-                self.logger.log("❌ ERROR: No se encontró columna 'Carrera de Interés'")
+                if not form_col:
+                    self.logger.log("❌ ERROR: No se encontró columna 'Associated Form Submission'")
+                    self.logger.log(f"   Columnas disponibles: {list(df.columns)}")
+                else:
+                    self.logger.log("❌ ERROR: No se encontró columna temporal '___FORM_LIMPIO___'")
+            
+            # ⭐ Carrera de Interés - CON DEBUGGING
+            carrera_col = None
+            for col in df.columns:
+                if col.lower() == 'carrera de interés':
+                    carrera_col = col
+                    break
+            
+            if carrera_col and '___CARRERA_COMPLETADA___' in df.columns:
+                self.logger.log(f"✓ Reemplazando '{carrera_col}'...")
+                df[carrera_col] = df['___CARRERA_COMPLETADA___']
+                self.logger.log(f"✅ Reemplazada columna: {carrera_col}")
             else:
-                self.logger.log("❌ ERROR: No se encontró columna temporal '___CARRERA_COMPLETADA___'")
-        # First Page Seen
-        if 'First Page Seen' in df.columns and '___PRIMERA_PAGINA___' in df.columns:
-            df['First Page Seen'] = df['___PRIMERA_PAGINA___']
-            self.logger.log("✅ Reemplazada columna: First Page Seen")
-        
-        # Last Page Seen
-        if 'Last Page Seen' in df.columns and '___ULTIMA_PAGINA___' in df.columns:
-            df['Last Page Seen'] = df['___ULTIMA_PAGINA___']
-            self.logger.log("✅ Reemplazada columna: Last Page Seen")
+                if not carrera_col:
+                    self.logger.log("❌ ERROR: No se encontró columna 'Carrera de Interés'")
+                else:
+                    self.logger.log("❌ ERROR: No se encontró columna temporal '___CARRERA_COMPLETADA___'")
+            # First Page Seen
+            if 'First Page Seen' in df.columns and '___PRIMERA_PAGINA___' in df.columns:
+                df['First Page Seen'] = df['___PRIMERA_PAGINA___']
+                self.logger.log("✅ Reemplazada columna: First Page Seen")
+            
+            # Last Page Seen
+            if 'Last Page Seen' in df.columns and '___ULTIMA_PAGINA___' in df.columns:
+                df['Last Page Seen'] = df['___ULTIMA_PAGINA___']
+                self.logger.log("✅ Reemplazada columna: Last Page Seen")
         
         # 10. Eliminar columnas temporales
-        self.logger.log("\n🗑️ Eliminando columnas temporales...")
-        columnas_temporales = [
-            '___COLEGIO_UNIFICADO___', '___COLEGIO_NORMALIZADO___',
-            '___GRADO_UNIFICADO___', '___GRADO_NORMALIZADO___', '___FORM_LIMPIO___',
-            '___CARRERA_COMPLETADA___', '___PRIMERA_PAGINA___', '___ULTIMA_PAGINA___'
-        ]
-        df.drop([c for c in columnas_temporales if c in df.columns], axis=1, inplace=True)
-        self.logger.log(f"✅ Eliminadas {len([c for c in columnas_temporales if c in df.columns])} columnas temporales")
+        with self.instrumentacion.etapa('Columnas temporales'):
+            self.logger.log("\n🗑️ Eliminando columnas temporales...")
+            columnas_temporales = [
+                '___COLEGIO_UNIFICADO___', '___COLEGIO_NORMALIZADO___',
+                '___GRADO_UNIFICADO___', '___GRADO_NORMALIZADO___', '___FORM_LIMPIO___',
+                '___CARRERA_COMPLETADA___', '___PRIMERA_PAGINA___', '___ULTIMA_PAGINA___'
+            ]
+            df.drop([c for c in columnas_temporales if c in df.columns], axis=1, inplace=True)
+            self.logger.log(f"✅ Eliminadas {len([c for c in columnas_temporales if c in df.columns])} columnas temporales")
         
         # 11. Guardar resultado
-        self.logger.log(f"\n💾 Guardando archivo limpio: {config.OUTPUT_FILE}")
-        df.to_csv(config.OUTPUT_FILE, index=False, encoding='utf-8-sig')
+        with self.instrumentacion.etapa('Guardar CSV', filas=len(df)):
+            self.logger.log(f"\n💾 Guardando archivo limpio: {config.OUTPUT_FILE}")
+            df.to_csv(config.OUTPUT_FILE, index=False, encoding='utf-8-sig')
         
         # 12. Guardar diccionario
-        self.logger.log("\n💾 Guardando diccionario...")
-        self.dict_manager.guardar_diccionario(self.diccionario)
+        with self.instrumentacion.etapa('Guardar diccionario'):
+            self.logger.log("\n💾 Guardando diccionario...")
+            self.dict_manager.guardar_diccionario(self.diccionario)
+        self.instrumentacion.terminar_ejecucion(len(df))
         
         # 13. Mostrar estadísticas detalladas
+        self.logger.restaurar_consola()
         self.mostrar_resumen_estadisticas()
+        self.instrumentacion.mostrar_resumen()
+        self.guardar_metricas(len(df), inicio)
         
         # 14. Resumen tradicional
         self.logger.log("\n" + "="*60)
@@ -814,6 +959,9 @@ class NormalizadorLeads:
         self.logger.log("\n🚀 Abriendo SharePoint y carpeta local...")
         
         try:
+            import webbrowser
+            import subprocess
+            
             # Abrir SharePoint en navegador
             webbrowser.open(URL_SHAREPOINT)
             time.sleep(2)
@@ -881,6 +1029,13 @@ class NormalizadorLeads:
 
 def main():
     """Función principal de ejecución"""
+    parser = argparse.ArgumentParser(description="Normalizador de Leads - HubSpot")
+    parser.add_argument('--profile', action='store_true',
+                        help=f"Guardar un perfil cProfile (.pstats) por etapa en '{config.PERFIL_DIR}'")
+    parser.add_argument('--procesos', type=int, default=None,
+                        help=f"Procesos para resolver localmente los colegios únicos (por defecto {config.COLEGIOS_PROCESOS}; 0 o 1 = en serie)")
+    args = parser.parse_args()
+    
     print("""
 ╔═══════════════════════════════════════════════════════════╗
 ║  NORMALIZADOR DE LEADS - HubSpot                         ║
@@ -889,12 +1044,12 @@ def main():
     
     if not os.path.exists(config.INPUT_FILE):
         print(f"❌ ERROR: No se encontró {config.INPUT_FILE}")
-        input("\nPresiona Enter para salir...")
+        pedir_entrada("\nPresiona Enter para salir...")
         return
     
     if not config.API_KEY:
         print("❌ ERROR: No se encontró ANTHROPIC_API_KEY")
-        input("\nPresiona Enter para salir...")
+        pedir_entrada("\nPresiona Enter para salir...")
         return
     
     print("\n¿Validar normalizaciones?")
@@ -902,7 +1057,7 @@ def main():
     print("n = No (automático)")
     
     while True:
-        respuesta = input("\nValidar (s/n): ").lower().strip()
+        respuesta = pedir_entrada("\nValidar (s/n): ").lower().strip()
         if respuesta == 's':
             validar = True
             break
@@ -912,9 +1067,9 @@ def main():
         else:
             print("⚠️ Respuesta inválida.")
     
-    normalizador = NormalizadorLeads()
+    normalizador = NormalizadorLeads(perfilar=args.profile, procesos=args.procesos)
     normalizador.procesar_leads(modo_validacion=validar)
     
-    input("\n\nPresiona Enter para salir...")
+    pedir_entrada("\n\nPresiona Enter para salir...")
 
 
@@ -3,30 +3,57 @@ normalizador_claude.py
 Interacción con Claude API para normalización de datos
 """
 
-from anthropic import Anthropic
+import time
+
+from .instrumentacion import pedir_entrada
+from .metricas import RegistroMetricas
 
 
 class NormalizadorClaude:
     """Manejador de interacciones con Claude API"""
     
-    def __init__(self, api_key, logger):
+    def __init__(self, api_key, logger, metricas=None):
         """
         Inicializa el normalizador con Claude
         
         Args:
             api_key: API key de Anthropic
             logger: Instancia de Logger para registrar mensajes
+            metricas: RegistroMetricas donde contar llamadas, tokens y latencia
         """
-        self.client = Anthropic(api_key=api_key) if api_key else None
+        self.api_key = api_key
+        self._client = None
         self.logger = logger
-        self.tokens_usados = 0
-        # ⭐ NUEVO: Tracking de uso de web_search
-        self.llamadas_con_web_search = 0
-        self.llamadas_sin_web_search = 0
-        self.llamadas_totales = 0
+        # ⭐ Tokens, llamadas (con/sin web_search), errores y latencia
+        self.metricas = metricas if metricas is not None else RegistroMetricas()
+        self.metricas.describir('claude_tokens', 'Tokens usados en la API de Claude')
+        self.metricas.describir('claude_llamadas', 'Llamadas exitosas a la API de Claude')
+        self.metricas.describir('claude_errores', 'Llamadas a la API de Claude que fallaron')
+        self.metricas.describir('claude_latencia_segundos', 'Latencia de las llamadas a la API de Claude')
+    
+    @property
+    def client(self):
+        """
+        Cliente de Anthropic (None sin API key). Se crea en la primera consulta:
+        el SDK carga httpx y pydantic, y muchas ejecuciones no llegan a llamar a Claude
+        """
+        if self._client is None and self.api_key:
+            from anthropic import Anthropic
+            self._client = Anthropic(api_key=self.api_key)
+        return self._client
+    
+    @client.setter
+    def client(self, cliente):
+        self._client = cliente
     
-    def normalizar_con_claude(self, texto, tipo):
-        """Usa Claude API para normalizar - VERSIÓN MEJORADA CON PROMPT CONSERVADOR"""
+    def normalizar_con_claude(self, texto, tipo, texto_si_falla=True):
+        """
+        Usa Claude API para normalizar - VERSIÓN MEJORADA CON PROMPT CONSERVADOR
+        
+        Args:
+            texto_si_falla: Si la llamada falla, devolver el texto tal cual (True)
+                            o None, para que quien llama no lo guarde como normalizado
+        """
         if not self.client:
             self.logger.log("⚠️ No hay API key")
             return texto
@@ -100,9 +127,10 @@ SOLO el grado normalizado, sin explicaciones."""
         }
         
         try:
-            self.logger.log(f"🤖 Consultando Claude: '{texto}'")
+            self.logger.debug("🤖 Consultando Claude: '%s'", texto)
             
             # ⭐ AUMENTADO max_tokens para permitir web_search
+            inicio = time.perf_counter()
             response = self.client.messages.create(
                 model="claude-sonnet-4-20250514",
                 max_tokens=300,  # Aumentado de 150 a 300
@@ -113,8 +141,9 @@ SOLO el grado normalizado, sin explicaciones."""
             )
             
             # Actualizar contadores
-            self.tokens_usados += response.usage.input_tokens + response.usage.output_tokens
-            self.llamadas_totales += 1
+            self.metricas.observar('claude_latencia_segundos', time.perf_counter() - inicio)
+            self.metricas.incrementar('claude_tokens', response.usage.input_tokens, tipo='entrada')
+            self.metricas.incrementar('claude_tokens', response.usage.output_tokens, tipo='salida')
             
             # ⭐ NUEVO: Detectar si usó web_search
             uso_web_search = False
@@ -125,10 +154,7 @@ SOLO el grado normalizado, sin explicaciones."""
                             uso_web_search = True
                             break
             
-            if uso_web_search:
-                self.llamadas_con_web_search += 1
-            else:
-                self.llamadas_sin_web_search += 1
+            self.metricas.incrementar('claude_llamadas', web_search='si' if uso_web_search else 'no')
             
             # Extraer texto de la respuesta
             normalizado = response.content[0].text.strip()
@@ -139,15 +165,16 @@ SOLO el grado normalizado, sin explicaciones."""
             return normalizado
             
         except Exception as e:
+            self.metricas.incrementar('claude_errores')
             self.logger.log(f"❌ Error Claude: {e}")
-            return texto
+            return texto if texto_si_falla else None
     
     def validar_respuesta_claude(self, texto_original, normalizado, tipo='colegio'):
         """Valida que Claude no haya respondido con texto de sistema - VERSIÓN MEJORADA"""
         
         # Validación 1: Respuesta muy larga
         if len(normalizado) > 200:
-            self.logger.log(f"⚠️ Respuesta muy larga: '{texto_original}' → 'Otro'")
+            self.logger.debug("⚠️ Respuesta muy larga: '%s' → 'Otro'", texto_original)
             return "Otro"
         
         # Validación 2: Frases de sistema
@@ -161,12 +188,12 @@ SOLO el grado normalizado, sin explicaciones."""
         normalizado_lower = normalizado.lower()
         for frase in frases_sistema:
             if frase in normalizado_lower:
-                self.logger.log(f"⚠️ Respuesta de sistema: '{texto_original}' → 'Otro'")
+                self.logger.debug("⚠️ Respuesta de sistema: '%s' → 'Otro'", texto_original)
                 return "Otro"
         
         # Validación 3: Formato con múltiples líneas
         if normalizado.count('\n') > 2:
-            self.logger.log(f"⚠️ Respuesta con formato: '{texto_original}' → 'Otro'")
+            self.logger.debug("⚠️ Respuesta con formato: '%s' → 'Otro'", texto_original)
             return "Otro"
         
         # ⭐ NUEVA Validación 4: Respuestas de prueba deben ser "Otro"
@@ -174,7 +201,7 @@ SOLO el grado normalizado, sin explicaciones."""
             texto_lower = texto_original.lower().strip()
             respuestas_prueba = ['prueba', 'test', 'testing', 'demo', 'ejemplo']
             if texto_lower in respuestas_prueba and normalizado.lower() != "otro":
-                self.logger.log(f"⚠️ Respuesta de prueba corregida: '{texto_original}' → 'Otro'")
+                self.logger.debug("⚠️ Respuesta de prueba corregida: '%s' → 'Otro'", texto_original)
                 return "Otro"
         
         # ⭐ NUEVA Validación 5: Patrón "Liceo/Instituto" no debe convertirse en Universidad
@@ -184,7 +211,7 @@ SOLO el grado normalizado, sin explicaciones."""
             
             if any(texto_lower.startswith(patron) for patron in patrones_colegio):
                 if 'universidad' in normalizado.lower():
-                    self.logger.log(f"⚠️ Error: Colegio convertido en Universidad: '{texto_original}' → mantener formato colegio")
+                    self.logger.debug("⚠️ Error: Colegio convertido en Universidad: '%s' → mantener formato colegio", texto_original)
                     # Mantener el patrón original pero limpiar
                     return texto_original.strip().title()
         
@@ -195,7 +222,7 @@ SOLO el grado normalizado, sin explicaciones."""
             
             if texto_lower in siglas_sin_sentido:
                 if normalizado.lower() != "otro" and len(normalizado) > 10:
-                    self.logger.log(f"⚠️ Sigla sin sentido: '{texto_original}' → 'Otro'")
+                    self.logger.debug("⚠️ Sigla sin sentido: '%s' → 'Otro'", texto_original)
                     return "Otro"
         
         # ⭐ NUEVA Validación 7: Verificar que no cambió números en nombres
@@ -205,7 +232,7 @@ SOLO el grado normalizado, sin explicaciones."""
         
         if numeros_original and numeros_normalizado:
             if numeros_original != numeros_normalizado:
-                self.logger.log(f"⚠️ Advertencia: Números cambiados de {numeros_original} a {numeros_normalizado}")
+                self.logger.debug("⚠️ Advertencia: Números cambiados de %s a %s", numeros_original, numeros_normalizado)
                 # No forzar cambio, solo advertir
         
         return normalizado
@@ -222,12 +249,12 @@ SOLO el grado normalizado, sin explicaciones."""
         print("3. Omitir (mantener original)")
         
         while True:
-            opcion = input("\nSelecciona (1-3): ").strip()
+            opcion = pedir_entrada("\nSelecciona (1-3): ").strip()
             
             if opcion == '1':
                 return propuesta
             elif opcion == '2':
-                manual = input("Ingresa el valor correcto: ").strip()
+                manual = pedir_entrada("Ingresa el valor correcto: ").strip()
                 if manual:
                     return manual
                 print("⚠️ No puede estar vacío")
@@ -251,7 +278,7 @@ SOLO el grado normalizado, sin explicaciones."""
         print("6. Sin especificar")
         
         while True:
-            respuesta = input("\nSelecciona (1-6): ").strip()
+            respuesta = pedir_entrada("\nSelecciona (1-6): ").strip()
             
             carreras = {
                 '1': 'Administración de Empresas',
@@ -278,7 +305,7 @@ SOLO el grado normalizado, sin explicaciones."""
     
     def get_tokens_usados(self):
         """Retorna el total de tokens usados - FUNCIONALIDAD ORIGINAL"""
-        return self.tokens_usados
+        return self.metricas.total('claude_tokens')
     
     def get_estadisticas(self):
         """
@@ -287,14 +314,20 @@ SOLO el grado normalizado, sin explicaciones."""
         Returns:
             dict: Diccionario con métricas de uso
         """
+        llamadas_con_web_search = self.metricas.valor('claude_llamadas', web_search='si')
+        llamadas_sin_web_search = self.metricas.valor('claude_llamadas', web_search='no')
+        llamadas_totales = llamadas_con_web_search + llamadas_sin_web_search
+        
         porcentaje_web = 0
-        if self.llamadas_totales > 0:
-            porcentaje_web = (self.llamadas_con_web_search / self.llamadas_totales) * 100
+        if llamadas_totales > 0:
+            porcentaje_web = (llamadas_con_web_search / llamadas_totales) * 100
         
         return {
-            'tokens_totales': self.tokens_usados,
-            'llamadas_totales': self.llamadas_totales,
-            'llamadas_con_web_search': self.llamadas_con_web_search,
-            'llamadas_sin_web_search': self.llamadas_sin_web_search,
-            'porcentaje_web_search': round(porcentaje_web, 1)
+            'tokens_totales': self.get_tokens_usados(),
+            'llamadas_totales': llamadas_totales,
+            'llamadas_con_web_search': llamadas_con_web_search,
+            'llamadas_sin_web_search': llamadas_sin_web_search,
+            'porcentaje_web_search': round(porcentaje_web, 1),
+            'errores': self.metricas.valor('claude_errores'),
+            'latencia': self.metricas.resumen_histograma('claude_latencia_segundos')
         }
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+resolucion_paralela.py
+Resolución local de los colegios únicos repartida en varios procesos.
+Cada proceso recibe una copia de solo lectura de la sección de colegios y
+aplica las reglas del config y el fuzzy match; el proceso principal recorre
+los resultados en el orden original y completa lo que falte (diccionario
+actualizado, Claude y validación manual), así que el resultado y las
+estadísticas son los mismos que resolviendo en serie.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+from . import config
+from .validadores import Validadores
+
+
+# Lotes por proceso: más de uno para repartir mejor los colegios que llegan al fuzzy match
+LOTES_POR_PROCESO = 4
+
+# Estado de cada proceso del pool (lo arma _inicializar_proceso)
+_validadores = None
+_registro = None
+_seccion = None
+
+
+class RegistroDiferido:
+    """
+    Logger de los procesos del pool: guarda los mensajes para que el proceso
+    principal los escriba en su lugar (mismo API que src.logger.Logger)
+    """
+
+    def __init__(self):
+        self.mensajes = []
+
+    def log(self, mensaje):
+        """Guarda un mensaje"""
+        self.mensajes.append((mensaje, ()))
+
+    def debug(self, mensaje, *args):
+        """Guarda un mensaje de debug sin formatearlo"""
+        self.mensajes.append((mensaje, args))
+
+    def extraer(self):
+        """Mensajes guardados desde la última extracción"""
+        mensajes, self.mensajes = self.mensajes, []
+        return mensajes
+
+
+def _inicializar_proceso(seccion):
+    """Validadores e índice fuzzy de cada proceso, sobre su copia de la sección"""
+    global _validadores, _registro, _seccion
+    _registro = RegistroDiferido()
+    _validadores = Validadores(config, _registro)
+    _seccion = seccion
+    _validadores.obtener_indice('colegios', seccion)
+
+
+def resolver_localmente(validadores, seccion, registro, colegio_str):
+    """
+    Reglas locales y fuzzy match de un colegio contra una sección fija
+
+    Returns:
+        None si el colegio ya está en la sección; si no, tupla
+        (valor, metodo, previo_fuzzy, mensajes) para
+        NormalizadorLeads.validar_colegio_localmente. previo_fuzzy es None
+        cuando resolvió una regla.
+    """
+    if colegio_str in seccion:
+        return None
+
+    valor, metodo = validadores.clasificar_colegio(colegio_str)
+    previo = None
+    if valor is None:
+        previo = validadores.buscar_fuzzy(colegio_str, 'colegios', seccion)
+
+    return valor, metodo, previo, registro.extraer()
+
+
+def _resolver_lote(colegios):
+    """Resuelve un lote de colegios en un proceso del pool"""
+    return [resolver_localmente(_validadores, _seccion, _registro, colegio) for colegio in colegios]
+
+
+def resolver_en_procesos(colegios, seccion, procesos):
+    """
+    Resolución local de colegios en un pool de procesos
+
+    Args:
+        colegios: Colegios ya limpios (str sin espacios al borde), sin repetir
+        seccion: Sección de colegios del diccionario (se copia a cada proceso)
+        procesos: Cantidad de procesos
+
+    Returns:
+        {colegio: resultado de resolver_localmente}
+    """
+    tamanio = max(1, -(-len(colegios) // (procesos * LOTES_POR_PROCESO)))
+    lotes = [colegios[i:i + tamanio] for i in range(0, len(colegios), tamanio)]
+
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_inicializar_proceso,
+                             initargs=(dict(seccion),)) as pool:
+        resultados = {}
+        for lote, resueltos in zip(lotes, pool.map(_resolver_lote, lotes)):
+            resultados.update(zip(lote, resueltos))
+
+    return resultados
+
+
+def resolver_en_serie(colegios, seccion):
+    """
+    Lo mismo que resolver_en_procesos, en el hilo actual (la sección no
+    puede cambiar mientras tanto)
+    """
+    registro = RegistroDiferido()
+    validadores = Validadores(config, registro)
+    return {colegio: resolver_localmente(validadores, seccion, registro, colegio) for colegio in colegios}
@@ -0,0 +1,144 @@
+"""
+seccion_diccionario.py
+Sección del diccionario que registra las entradas nuevas o modificadas
+"""
+
+
+class TablaValores:
+    """
+    Tabla de valores canónicos compartida por las secciones del diccionario.
+    Muchas claves distintas apuntan al mismo puñado de valores ('Otro', las
+    carreras, los colegios canónicos): se guarda un solo objeto por valor.
+    """
+
+    def __init__(self):
+        self.valores = {}
+
+    def internar(self, valor):
+        """Devuelve el objeto compartido para el valor (lo registra si es nuevo)"""
+        if type(valor) is not str:
+            return valor
+        return self.valores.setdefault(valor, valor)
+
+    def internar_entradas(self, entradas):
+        """Copia de las entradas con los valores internados"""
+        compartir = self.valores.setdefault
+        return dict(zip(entradas, [
+            compartir(valor, valor) if type(valor) is str else valor
+            for valor in entradas.values()
+        ]))
+
+    def __len__(self):
+        return len(self.valores)
+
+
+class SeccionDiccionario(dict):
+    """
+    dict que recuerda qué claves cambiaron en esta ejecución (cambios / eliminadas)
+    y, si tiene journal, registra cada cambio en cuanto ocurre.
+    `modificaciones` cuenta los cambios de valor y eliminaciones de claves que
+    ya existían (las claves nuevas no cuentan): quien guarde algo derivado de
+    los valores (p. ej. IndiceCanonico) lo usa para saber si quedó viejo.
+    """
+
+    def __init__(self, nombre, datos=None, journal=None, tabla=None):
+        """
+        Args:
+            nombre: Nombre de la sección ('colegios', 'grados', 'urls', 'formularios')
+            datos: Entradas iniciales (no cuentan como cambios)
+            journal: Instancia opcional de JournalDiccionario
+            tabla: Instancia opcional de TablaValores para compartir los valores repetidos
+        """
+        if tabla is not None and datos:
+            datos = tabla.internar_entradas(datos)
+        super().__init__(datos or {})
+        self.nombre = nombre
+        self.journal = journal
+        self.tabla = tabla
+        self.cambios = {}
+        self.eliminadas = set()
+        self.originales = {}
+        self.modificaciones = 0
+
+    def aplicar(self, clave, valor):
+        """Aplica un cambio ya registrado (p. ej. al reproducir el journal) sin volver a escribirlo"""
+        if self.tabla is not None:
+            valor = self.tabla.internar(valor)
+        if clave not in self.originales:
+            self.originales[clave] = dict.get(self, clave)
+        if clave in self and dict.__getitem__(self, clave) != valor:
+            self.modificaciones += 1
+        dict.__setitem__(self, clave, valor)
+        self.cambios[clave] = valor
+        self.eliminadas.discard(clave)
+
+    def aplicar_eliminacion(self, clave):
+        """Aplica una eliminación ya registrada sin volver a escribirla"""
+        if clave in self:
+            if clave not in self.originales:
+                self.originales[clave] = dict.__getitem__(self, clave)
+            dict.__delitem__(self, clave)
+            self.eliminadas.add(clave)
+            self.modificaciones += 1
+        self.cambios.pop(clave, None)
+
+    def __setitem__(self, clave, valor):
+        if clave in self and dict.__getitem__(self, clave) == valor:
+            return
+        if self.journal is not None:
+            self.journal.registrar(self.nombre, clave, valor)
+        self.aplicar(clave, valor)
+
+    def __delitem__(self, clave):
+        if clave not in self:
+            raise KeyError(clave)
+        if self.journal is not None:
+            self.journal.registrar_eliminacion(self.nombre, clave)
+        self.aplicar_eliminacion(clave)
+
+    def update(self, *args, **kwargs):
+        for clave, valor in dict(*args, **kwargs).items():
+            self[clave] = valor
+
+    def setdefault(self, clave, valor=None):
+        if clave not in self:
+            self[clave] = valor
+        return self[clave]
+
+    def pop(self, clave, *default):
+        if clave in self:
+            valor = dict.__getitem__(self, clave)
+            del self[clave]
+            return valor
+        if default:
+            return default[0]
+        raise KeyError(clave)
+
+    def popitem(self):
+        if not self:
+            raise KeyError('popitem(): la sección está vacía')
+        clave = next(reversed(self))
+        return clave, self.pop(clave)
+
+    def clear(self):
+        for clave in list(self):
+            del self[clave]
+
+    def recargar(self, entradas):
+        """
+        Reemplaza el contenido por el del archivo ya guardado (sin registrar cambios).
+        Las claves que siguen conservan su posición y las nuevas quedan al final.
+        """
+        for clave in [c for c in self if c not in entradas]:
+            dict.__delitem__(self, clave)
+        if self.tabla is not None:
+            entradas = self.tabla.internar_entradas(entradas)
+        dict.update(self, entradas)
+        self.modificaciones += 1
+        self.marcar_guardado()
+
+    def marcar_guardado(self):
+        """Olvida los cambios pendientes una vez escritos en el archivo base"""
+        self.cambios = {}
+        self.eliminadas = set()
+        self.originales = {}
@@ -5,25 +5,242 @@ Categorización de URLs por palabras clave y patrones
 
 import pandas as pd
 import re
-from urllib.parse import unquote
+from urllib.parse import unquote, urlsplit
+
+from .instrumentacion import pedir_entrada
+from .metricas import RegistroMetricas
 
 
 class URLCategorizer:
     """Categorizador de URLs para leads"""
     
-    def __init__(self, config, logger):
+    def __init__(self, config, logger, metricas=None):
         """
         Inicializa el categorizador de URLs
         
         Args:
             config: Módulo de configuración con constantes
             logger: Instancia de Logger para registrar mensajes
+            metricas: RegistroMetricas donde contar aciertos de diccionario y caché
         """
         self.config = config
         self.logger = logger
+        self.metricas = metricas if metricas is not None else RegistroMetricas()
+        self.nivel_diccionario = self.metricas.nivel_cache('urls_diccionario')
+        self.nivel_clasificacion = self.metricas.nivel_cache('urls_clasificacion')
+        
+        self.tabla_patrones = self.compilar_patrones()
+        self.re_bridge_principal = re.compile(r'uvgbridge\.gt/?(\?|$)')
+        
+        self.prefijos_tracking = tuple(config.URL_PREFIJOS_TRACKING)
+        self.parametros_tracking = frozenset(config.URL_PARAMETROS_TRACKING)
+        self.parametros_conservar = frozenset(config.URL_PARAMETROS_CONSERVAR)
+        
+        # Resultado automático por URL (incluye los que no coinciden con nada)
+        self.cache = {}
+        self.cache_canonicas = {}
+        
+        # Sección de URLs ya migrada a claves canónicas en esta ejecución
+        self.seccion_migrada = None
+    
+    def es_parametro_tracking(self, nombre):
+        """Indica si un parámetro del query string es solo de tracking"""
+        if nombre in self.parametros_conservar:
+            return False
+        return nombre in self.parametros_tracking or nombre.startswith(self.prefijos_tracking)
+    
+    def canonicalizar_url(self, url_str):
+        """
+        Convierte una URL (ya en minúsculas) en la clave canónica del diccionario:
+        - quita parámetros de tracking (utm_*, hsa_*, fbclid, _hsenc, ...) y el fragmento
+        - normaliza el host (sin 'www.' ni puerto por defecto) y el esquema (https)
+        - la ruta siempre termina en '/' (salvo archivos como '.html')
+        - ordena los parámetros restantes
+        Los valores se mantienen sin decodificar.
+        """
+        canonica = self.cache_canonicas.get(url_str)
+        if canonica is not None:
+            return canonica
+        
+        try:
+            partes = urlsplit(url_str if '://' in url_str else '//' + url_str)
+            host = partes.hostname or ''
+            puerto = partes.port
+        except ValueError:
+            # URL malformada (puerto inválido, corchetes, etc.): se usa tal cual
+            self.cache_canonicas[url_str] = url_str
+            return url_str
+        
+        if host.startswith('www.'):
+            host = host[4:]
+        if puerto and puerto not in (80, 443):
+            host = f"{host}:{puerto}"
+        
+        ruta = partes.path or '/'
+        if not ruta.endswith('/') and '.' not in ruta.rsplit('/', 1)[-1]:
+            ruta += '/'
+        
+        parametros = sorted(
+            parametro for parametro in partes.query.split('&')
+            if parametro and not self.es_parametro_tracking(parametro.split('=', 1)[0])
+        )
+        
+        canonica = f"https://{host}{ruta}"
+        if parametros:
+            canonica += '?' + '&'.join(parametros)
+        
+        self.cache_canonicas[url_str] = canonica
+        return canonica
+    
+    def migrar_diccionario(self, diccionario):
+        """
+        Colapsa las claves existentes de diccionario['urls'] a su forma canónica.
+        Las URLs que las reglas ya resuelven se descartan: esas entradas las
+        guardaban versiones anteriores con el resultado del patrón, y bajo la
+        clave canónica responderían por otras URLs de la misma página cuyo
+        texto no tiene ese patrón. Solo se conservan las respuestas manuales.
+        
+        Returns:
+            Tupla (claves_antes, claves_despues, conflictos) donde conflictos es
+            la lista de (clave_canonica, valor_conservado, valor_descartado)
+        """
+        urls = diccionario.get('urls', {})
+        migradas = {}
+        conflictos = []
+        
+        for url_str, categoria in urls.items():
+            if self.resuelve_por_reglas(url_str):
+                continue
+            
+            canonica = self.canonicalizar_url(url_str)
+            
+            if canonica not in migradas:
+                migradas[canonica] = categoria
+            elif migradas[canonica] != categoria:
+                conflictos.append((canonica, migradas[canonica], categoria))
+        
+        antes = len(urls)
+        if antes != len(migradas) or any(clave not in migradas for clave in urls):
+            # Cambios mínimos en el lugar: si la sección tiene journal,
+            # solo se registran las claves que realmente cambian
+            for clave in [c for c in urls if c not in migradas]:
+                del urls[clave]
+            for canonica, categoria in migradas.items():
+                urls[canonica] = categoria
+            diccionario['urls'] = urls
+        
+        return antes, len(migradas), conflictos
+    
+    def urls_diccionario(self, diccionario):
+        """
+        Sección de URLs del diccionario, migrada a claves canónicas la primera
+        vez que se consulta (así la sección se sigue cargando recién cuando
+        hace falta). None si el diccionario no tiene sección de URLs.
+        """
+        if 'urls' not in diccionario:
+            return None
+        
+        urls = diccionario['urls']
+        if urls is self.seccion_migrada:
+            return urls
+        
+        antes, despues, conflictos = self.migrar_diccionario(diccionario)
+        if antes != despues:
+            self.logger.log(f"🔗 URLs del diccionario canonicalizadas: {antes} → {despues}")
+        for canonica, conservado, descartado in conflictos:
+            self.logger.log(f"⚠️ Conflicto en URL '{canonica}': se conserva '{conservado}' (descartado: '{descartado}')")
+        
+        self.seccion_migrada = diccionario['urls']
+        return self.seccion_migrada
+    
+    def compilar_patrones(self):
+        """
+        Aplana URL_PATTERNS y URL_CASOS_OTRO en una sola tabla ordenada por precedencia:
+        primero las carreras (en el orden del config) y al final los casos "Otro".
+        
+        Returns:
+            Tupla de (patron, carrera) donde carrera es None para los casos "Otro"
+        """
+        tabla = []
+        vistos = set()
+        
+        for carrera, patrones_carrera in self.config.URL_PATTERNS.items():
+            for patron in patrones_carrera:
+                if patron not in vistos:
+                    vistos.add(patron)
+                    tabla.append((patron, carrera))
+        
+        for caso in self.config.URL_CASOS_OTRO:
+            tabla.append((caso, None))
+        
+        return tuple(tabla)
+    
+    def clasificar_automatico(self, url_str):
+        """
+        Clasifica una URL (ya en minúsculas) sin diccionario ni preguntas.
+        Decodifica una sola vez y recorre la tabla de patrones en una pasada.
+        
+        Returns:
+            Tupla (categoria, patron, es_bridge):
+            - categoria es None si ninguna regla aplica
+            - patron es el patrón de carrera encontrado (None en otro caso)
+            - es_bridge indica si la URL decodificada es de uvgbridge.gt
+        """
+        resultado = self.cache.get(url_str)
+        self.nivel_clasificacion[resultado is not None]()
+        if resultado is not None:
+            return resultado
+        
+        return self.aplicar_reglas(url_str)
+    
+    def resuelve_por_reglas(self, url_str):
+        """Si alguna regla automática categoriza la URL (sin contar en las métricas de caché)"""
+        resultado = self.cache.get(url_str)
+        if resultado is None:
+            resultado = self.aplicar_reglas(url_str)
+        return resultado[0] is not None
+    
+    def aplicar_reglas(self, url_str):
+        """Recorre la tabla de patrones para una URL que no está en la caché y guarda el resultado"""
+        # Decodificar URL (convertir %2B a +, %25C3%25B1 a ñ, etc.)
+        url_decoded = unquote(url_str)
+        
+        # Las carreras se buscan en la URL original Y en la decodificada
+        if url_decoded == url_str:
+            texto_carreras = url_str
+        else:
+            texto_carreras = url_str + '\n' + url_decoded
+        
+        es_bridge = 'uvgbridge.gt' in url_decoded
+        resultado = (None, None, es_bridge)
+        
+        for patron, carrera in self.tabla_patrones:
+            if carrera is not None:
+                if patron in texto_carreras:
+                    resultado = (carrera, patron, es_bridge)
+                    break
+            elif patron in url_decoded:
+                # Casos especiales "Otro" (solo si NO se encontró carrera)
+                resultado = ('Otro', None, es_bridge)
+                break
+        else:
+            # Bridge Principal: la página de inicio sin carrera
+            if es_bridge and self.re_bridge_principal.search(url_decoded):
+                resultado = ('Bridge Principal', None, es_bridge)
+        
+        self.cache[url_str] = resultado
+        return resultado
     
     def categorizar_url(self, url, diccionario, urls_nuevas, modo_interactivo=True):
-        """Categoriza URL por palabras clave - VERSIÓN MEJORADA con decodificación"""
+        """
+        Categoriza URL por palabras clave - VERSIÓN COMPILADA con caché por URL
+        
+        Los patrones se buscan en la URL tal como llegó (en minúsculas): los
+        parámetros de tracking y el fragmento también pueden nombrar la carrera.
+        La forma canónica solo es la clave del diccionario, que guarda las
+        respuestas manuales de las URLs sin regla (compartidas por todas las
+        variantes de tracking de la misma página).
+        """
         if not url or pd.isna(url):
             return "Otro"
         
@@ -32,51 +249,69 @@ class URLCategorizer:
         if not url_str:
             return "Otro"
         
-        # 1. Buscar en diccionario
-        if 'urls' in diccionario and url_str in diccionario['urls']:
-            return diccionario['urls'][url_str]
+        # 1. Carreras → casos "Otro" → Bridge Principal (una pasada, con caché)
+        categoria, patron, es_bridge = self.clasificar_automatico(url_str)
         
-        # 2. DECODIFICAR URL (convertir %2B a +, %25C3%25B1 a ñ, etc.)
-        url_decoded = unquote(url_str)
+        if patron is not None:
+            self.logger.debug("🔗 URL categorizada: '%s' (patrón: '%s')", categoria, patron)
+            return categoria
         
-        # ⭐ 3. PRIMERO buscar coincidencias de carreras (ANTES de verificar "Otro")
-        patterns = self.config.URL_PATTERNS
+        if categoria is not None:
+            return categoria
         
-        for carrera, patrones_carrera in patterns.items():
-            for patron in patrones_carrera:
-                # Buscar en URL original Y en URL decodificada
-                if patron in url_str or patron in url_decoded:
-                    if 'urls' not in diccionario:
-                        diccionario['urls'] = {}
-                    diccionario['urls'][url_str] = carrera
-                    self.logger.log(f"🔗 URL categorizada: '{carrera}' (patrón: '{patron}')")
-                    return carrera
-        
-        # 4. AHORA SÍ verificar casos especiales "Otro" (solo si NO se encontró carrera)
-        casos_otro = self.config.URL_CASOS_OTRO
-        
-        for caso in casos_otro:
-            if caso in url_decoded:
-                return 'Otro'
-        
-        # 5. Bridge Principal
-        if 'uvgbridge.gt' in url_decoded:
-            tiene_carrera = False
-            for patrones_carrera in patterns.values():
-                if any(patron in url_decoded for patron in patrones_carrera):
-                    tiene_carrera = True
-                    break
-            
-            if not tiene_carrera:
-                if re.search(r'uvgbridge\.gt/?(\?|$)', url_decoded):
-                    return 'Bridge Principal'
+        # 2. Buscar en diccionario (clave canónica, sin parámetros de tracking)
+        clave = self.canonicalizar_url(url_str)
+        urls = self.urls_diccionario(diccionario)
+        en_diccionario = urls is not None and clave in urls
+        self.nivel_diccionario[en_diccionario]()
+        if en_diccionario:
+            return urls[clave]
         
-        # 6. Modo interactivo
-        if modo_interactivo and 'uvgbridge.gt' in url_decoded:
-            return self.preguntar_categoria_url(url_str, diccionario, urls_nuevas)
+        # 3. Modo interactivo
+        if modo_interactivo and es_bridge:
+            return self.preguntar_categoria_url(clave, diccionario, urls_nuevas)
         
         return 'Otro'
     
+    def categorizar_columnas(self, columnas, diccionario, urls_nuevas, modo_interactivo=True):
+        """
+        Categoriza varias columnas de URLs resolviendo cada URL distinta una sola vez
+        
+        Args:
+            columnas: Lista de Series con URLs (p. ej. First y Last Page Seen)
+            diccionario: Diccionario de normalizaciones
+            urls_nuevas: Lista donde registrar las URLs nuevas
+            modo_interactivo: Si True, pregunta por las URLs de uvgbridge.gt no reconocidas
+            
+        Returns:
+            Lista de Series categorizadas, en el mismo orden y con los mismos índices
+        """
+        if not columnas:
+            return []
+        
+        todas = pd.concat(columnas, ignore_index=True)
+        codigos, unicas = pd.factorize(todas)
+        
+        self.logger.log(f"URLs únicas encontradas: {len(unicas)}")
+        
+        # Los nulos quedan con código -1: se agrega "Otro" al final de la tabla
+        categorias = [
+            self.categorizar_url(url, diccionario, urls_nuevas, modo_interactivo=modo_interactivo)
+            for url in unicas
+        ]
+        categorias.append("Otro")
+        
+        resultado = pd.Series(categorias, dtype=object).take(codigos).to_numpy()
+        
+        salida = []
+        inicio = 0
+        for columna in columnas:
+            fin = inicio + len(columna)
+            salida.append(pd.Series(resultado[inicio:fin], index=columna.index, dtype=object))
+            inicio = fin
+        
+        return salida
+    
     def preguntar_categoria_url(self, url, diccionario, urls_nuevas):
         """Pregunta al usuario a qué categoría pertenece una URL"""
         print(f"\n{'='*60}")
@@ -93,7 +328,7 @@ class URLCategorizer:
         print("7. Otro")
         
         while True:
-            respuesta = input("\nSelecciona (1-7): ").strip()
+            respuesta = pedir_entrada("\nSelecciona (1-7): ").strip()
             
             categorias = {
                 '1': 'Administración de Empresas',
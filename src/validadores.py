@@ -6,6 +6,9 @@ Funciones de validación y detección para normalización de datos
 import pandas as pd
 from rapidfuzz import fuzz
 
+from .indice_canonico import IndiceCanonico
+from .instrumentacion import pedir_entrada
+
 
 class Validadores:
     """Validadores para colegios, universidades y respuestas"""
@@ -20,6 +23,9 @@ class Validadores:
         """
         self.config = config
         self.logger = logger
+        
+        # Índices inversos por sección del diccionario (se crean al primer uso)
+        self.indices = {}
     
     def es_sigla_ambigua(self, texto):
         """Detecta siglas ambiguas"""
@@ -86,6 +92,40 @@ class Validadores:
         
         return False
     
+    def clasificar_colegio(self, colegio_str):
+        """
+        Reglas locales de colegios que solo dependen del config (no del diccionario):
+        respuesta inválida, título/carrera, no es colegio, colegio conocido,
+        universidad y patrón de colegio, en ese orden
+        
+        Returns:
+            Tupla (valor_normalizado, metodo) o (None, None) si ninguna regla aplica
+        """
+        texto_lower = colegio_str.lower().strip()
+        
+        if self.detectar_respuesta_invalida(colegio_str):
+            return "Otro", 'respuesta_invalida'
+        
+        if self.detectar_titulo_carrera(colegio_str):
+            return "Otro", 'titulo_carrera'
+        
+        if self.detectar_no_es_colegio(colegio_str):
+            return "Otro", 'no_es_colegio'
+        
+        if texto_lower in self.config.COLEGIOS_CONOCIDOS:
+            return self.config.COLEGIOS_CONOCIDOS[texto_lower], 'colegio_conocido'
+        
+        universidad = self.buscar_universidad_conocida(colegio_str)
+        if universidad:
+            return universidad, 'universidad'
+        
+        # Patrones de colegio (Liceo, Instituto, Escuela, etc.): se formatea el nombre
+        for patron in self.config.PATRONES_COLEGIO:
+            if texto_lower.startswith(patron):
+                return colegio_str.strip().title(), 'patron_colegio'
+        
+        return None, None
+    
     def buscar_universidad_conocida(self, texto):
         """
         Busca universidades guatemaltecas
@@ -102,12 +142,12 @@ class Validadores:
         if hasattr(self.config, 'COLEGIOS_ESPECIFICOS'):
             for colegio_key, colegio_nombre in self.config.COLEGIOS_ESPECIFICOS.items():
                 if colegio_key in texto_limpio:
-                    self.logger.log(f"🏫 Colegio específico detectado: '{texto}' → '{colegio_nombre}'")
+                    self.logger.debug("🏫 Colegio específico detectado: '%s' → '%s'", texto, colegio_nombre)
                     return colegio_nombre
         
         # ⭐ PASO 2: Verificar si es un colegio que NO es universidad
         if texto_limpio in self.config.COLEGIOS_NO_UNIVERSITARIOS:
-            self.logger.log(f"⚠️ No es universidad: '{texto}' → 'Otro'")
+            self.logger.debug("⚠️ No es universidad: '%s' → 'Otro'", texto)
             return None
         
         # PASO 3: Ahora sí buscar universidades (solo si NO es un colegio específico)
@@ -130,31 +170,83 @@ class Validadores:
         
         return mejor_match
     
-    def fuzzy_match(self, texto, categoria, diccionario):
+    def fuzzy_match(self, texto, categoria, diccionario, previo=None):
         """
         Fuzzy matching en diccionario
         ⭐ MODIFICADO: Umbral aumentado de 85 a 92 para ser más estricto
+        ⭐ MODIFICADO: Compara primero contra los valores canónicos del índice
+        inverso y solo si ninguno alcanza el umbral contra sus variantes, en
+        lugar de todas las claves. 'Otro' nunca es destino de un match.
+        
+        Args:
+            previo: Resultado de buscar_fuzzy sobre una copia anterior de la
+                    sección (ver buscar_fuzzy)
         """
         if not texto or pd.isna(texto):
             return None
             
-        texto_limpio = str(texto).strip().lower()
         diccionario_cat = diccionario.get(categoria, {})
         
-        mejor_match = None
-        mejor_score = 0
+        match, _ = self.buscar_fuzzy(texto, categoria, diccionario_cat, previo=previo)
+        if match is None:
+            return None
         
-        for key in diccionario_cat.keys():
-            score = fuzz.ratio(texto_limpio, key.lower())
-            if score > mejor_score:
-                mejor_score = score
-                mejor_match = key
+        canonico, variante, _ = match
+        
+        # Si el match fue contra una variante, devolver su valor actual
+        if variante is not None:
+            return diccionario_cat.get(variante, canonico)
+        
+        return canonico
+    
+    def buscar_fuzzy(self, texto, categoria, diccionario_cat, previo=None):
+        """
+        Mejor match del índice de una sección, sin resolver su valor actual
+        
+        Args:
+            previo: Tupla (match, candidatos) devuelta por una búsqueda anterior
+                    (p. ej. en otro proceso, sobre una copia de la sección): solo
+                    se comparan los candidatos agregados al índice después
+        
+        Returns:
+            Tupla (match, candidatos): match es (canonico, variante, score) o None,
+            candidatos es cuántos candidatos tenía el índice
+        """
+        texto_limpio = str(texto).strip().lower()
+        indice = self.obtener_indice(categoria, diccionario_cat)
         
         # ⭐ CAMBIADO: De 85 a 92 (más estricto)
-        if mejor_score > 88:
-            return diccionario_cat[mejor_match]
+        if previo is None:
+            match = indice.mejor_match(texto_limpio, umbral=88)
+        else:
+            match = indice.mejor_match(texto_limpio, umbral=88, previo=previo[0], desde=previo[1])
+        
+        return match, len(indice.candidatos)
+    
+    def obtener_indice(self, categoria, diccionario_cat):
+        """
+        Devuelve el índice inverso (canónico → variantes) de una sección,
+        sincronizado con las entradas agregadas desde la última consulta
+        """
+        indice = self.indices.get(categoria)
+        
+        if indice is None:
+            indice = IndiceCanonico(diccionario_cat)
+            self.indices[categoria] = indice
+        else:
+            indice.actualizar(diccionario_cat)
+        
+        return indice
+    
+    def reporte_variantes(self, categoria, diccionario, top=None):
+        """
+        Reporte de cuántas variantes apuntan a cada valor canónico
         
-        return None
+        Returns:
+            Lista de tuplas (canonico, cantidad) ordenada de mayor a menor
+        """
+        indice = self.obtener_indice(categoria, diccionario.get(categoria, {}))
+        return indice.reporte_variantes(top=top)
     
     def detectar_no_es_colegio(self, texto):
         """Detecta si NO es un colegio"""
@@ -173,75 +265,6 @@ class Validadores:
 # ⭐ NUEVAS FUNCIONES PARA NORMALIZACIÓN DE GRADOS ACADÉMICOS
 # ============================================================
 
-def es_valor_basura(texto, config):
-    """
-    Detecta si un valor es basura/prueba sin sentido
-    
-    Args:
-        texto: Texto a validar
-        config: Módulo de configuración con PATRONES_BASURA
-        
-    Returns:
-        True si es basura, False si no
-    """
-    if not texto or pd.isna(texto):
-        return False
-    
-    texto_str = str(texto).strip().lower()
-    
-    # Verificar si está vacío después de limpiar
-    if not texto_str or len(texto_str) < 1:
-        return False
-    
-    # 1. Verificar patrones de basura del config
-    for patron in config.PATRONES_BASURA:
-        if patron in texto_str:
-            return True
-    
-    # 2. Detectar códigos alfanuméricos sin sentido (ABC123, XYZ999)
-    import re
-    if re.match(r'^[a-z]{2,}[0-9]{2,}$', texto_str):
-        return True
-    
-    # 3. Detectar letras repetidas (aaa, xxx, asdf)
-    if len(set(texto_str)) <= 2 and len(texto_str) >= 3:
-        return True
-    
-    # 4. Detectar números largos sin sentido (más de 4 dígitos)
-    if texto_str.isdigit() and len(texto_str) > 4:
-        return True
-    
-    # 5. Solo símbolos
-    if all(c in '-._ /\\|()[]{}' for c in texto_str):
-        return True
-    
-    return False
-
-
-def detectar_graduacion_implicita(texto, config):
-    """
-    Detecta si el texto implica que la persona ya se graduó
-    
-    Args:
-        texto: Texto normalizado (minúsculas, sin tildes)
-        config: Módulo de configuración con KEYWORDS_GRADUADO
-        
-    Returns:
-        True si implica graduación, False si no
-    """
-    if not texto or pd.isna(texto):
-        return False
-    
-    texto_str = str(texto).strip().lower()
-    
-    # Buscar keywords de graduación
-    for keyword in config.KEYWORDS_GRADUADO:
-        if keyword in texto_str:
-            return True
-    
-    return False
-
-
 def validar_grado_manual(grado_original, grados_opciones, logger):
     """
     Muestra menú interactivo para clasificar manualmente un grado académico
@@ -266,7 +289,7 @@ def validar_grado_manual(grado_original, grados_opciones, logger):
     # Solicitar input del usuario
     while True:
         try:
-            respuesta = input(f"\nElige una opción (1-{len(grados_opciones)}): ").strip()
+            respuesta = pedir_entrada(f"\nElige una opción (1-{len(grados_opciones)}): ").strip()
             
             # Validar que sea un número
             opcion_num = int(respuesta)
@@ -0,0 +1,7 @@
+"""
+tests
+Pruebas del Normalizador de Leads
+
+Ejecutar desde la raíz del proyecto:
+    python -m pytest -q
+"""
@@ -0,0 +1,44 @@
+"""
+conftest.py
+Fixtures compartidas por las pruebas
+"""
+
+import pytest
+
+
+class RegistroPrueba:
+    """Logger que guarda los mensajes ya formateados (mismo API que src.logger.Logger)"""
+
+    def __init__(self):
+        self.mensajes = []
+
+    def log(self, mensaje):
+        """Guarda el mensaje"""
+        self.mensajes.append(mensaje)
+
+    def debug(self, mensaje, *args):
+        """Guarda el mensaje formateado"""
+        self.mensajes.append(mensaje % args if args else mensaje)
+
+
+@pytest.fixture
+def logger():
+    return RegistroPrueba()
+
+
+def pytest_addoption(parser):
+    parser.addoption('--regresion', action='store_true',
+                     help="Correr también los micro-benchmarks de regresión (tests marcados 'regresion')")
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', "regresion: micro-benchmark de regresión (opcional, ver --regresion)")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--regresion'):
+        return
+    omitir = pytest.mark.skip(reason="micro-benchmark de regresión: correr con --regresion")
+    for item in items:
+        if 'regresion' in item.keywords:
+            item.add_marker(omitir)
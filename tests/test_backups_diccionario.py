@@ -0,0 +1,140 @@
+"""
+test_backups_diccionario.py
+Backups incrementales: ida y vuelta de la cadena base + deltas y deltas
+armados solo con las secciones que cambiaron
+"""
+
+import json
+
+from src.backups_diccionario import BackupsDiccionario
+from src.diccionario_manager import DiccionarioManager
+
+
+def nuevo_manager(carpeta, logger):
+    return DiccionarioManager(str(carpeta / 'diccionario.json'), str(carpeta / 'backups'), logger)
+
+
+def escribir_diccionario(carpeta, contenido):
+    with open(carpeta / 'diccionario.json', 'w', encoding='utf-8') as f:
+        json.dump(contenido, f, indent=2, ensure_ascii=False)
+
+
+def leer_diccionario(carpeta):
+    with open(carpeta / 'diccionario.json', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_cada_version_se_restaura_igual_al_archivo(tmp_path, logger):
+    escribir_diccionario(tmp_path, {
+        'colegios': {'liceo javier': 'Liceo Javier'},
+        'grados': {'4to bach': '4to. Diversificado'},
+        'urls': {},
+    })
+    guardados = []
+
+    ediciones = [
+        lambda d: d['colegios'].__setitem__('colegio el roble', 'Colegio El Roble'),
+        lambda d: d['colegios'].__setitem__('liceo javier', 'Liceo Javier Zona 16'),
+        lambda d: d['grados'].__delitem__('4to bach'),
+        lambda d: d['urls'].__setitem__('https://uvgbridge.gt/eventos/', 'Maestrías'),
+    ]
+    for editar in ediciones:
+        manager = nuevo_manager(tmp_path, logger)
+        diccionario = manager.cargar_diccionario()
+        editar(diccionario)
+        manager.guardar_diccionario(diccionario)
+        guardados.append(leer_diccionario(tmp_path))
+
+    backups = BackupsDiccionario(str(tmp_path / 'backups'), logger)
+    versiones = backups.cargar_indice()
+    assert [v['tipo'] for v in versiones] == ['base', 'delta', 'delta', 'delta', 'delta']
+    assert [v['cambios'] for v in versiones[1:]] == [1, 1, 1, 1]
+
+    for posicion, esperado in enumerate(guardados, start=1):
+        assert backups.reconstruir(versiones, posicion) == esperado
+    assert backups.restaurar()[0] == guardados[-1]
+    assert backups.verificar() == []
+
+
+def test_el_backup_no_carga_las_secciones_sin_cambios(tmp_path, logger):
+    escribir_diccionario(tmp_path, {
+        'colegios': {'liceo javier': 'Liceo Javier'},
+        'urls': {'https://uvgbridge.gt/eventos/': 'Maestrías'},
+    })
+    manager = nuevo_manager(tmp_path, logger)
+    manager.guardar_diccionario(manager.cargar_diccionario())
+
+    manager = nuevo_manager(tmp_path, logger)
+    diccionario = manager.cargar_diccionario()
+    diccionario['colegios']['colegio el roble'] = 'Colegio El Roble'
+    manager.guardar_diccionario(diccionario)
+
+    assert 'urls' not in diccionario.secciones
+    backups = BackupsDiccionario(str(tmp_path / 'backups'), logger)
+    assert backups.restaurar()[0] == leer_diccionario(tmp_path)
+
+
+def test_edicion_manual_guarda_una_base_nueva(tmp_path, logger):
+    escribir_diccionario(tmp_path, {'colegios': {}})
+    manager = nuevo_manager(tmp_path, logger)
+    diccionario = manager.cargar_diccionario()
+    diccionario['colegios']['liceo javier'] = 'Liceo Javier'
+    manager.guardar_diccionario(diccionario)
+
+    # Alguien edita el archivo a mano entre dos ejecuciones
+    escribir_diccionario(tmp_path, {'colegios': {'liceo javier': 'Liceo Javier', 'colegio austriaco': 'Colegio Austriaco'}})
+
+    manager = nuevo_manager(tmp_path, logger)
+    diccionario = manager.cargar_diccionario()
+    diccionario['colegios']['colegio el roble'] = 'Colegio El Roble'
+    manager.guardar_diccionario(diccionario)
+
+    backups = BackupsDiccionario(str(tmp_path / 'backups'), logger)
+    versiones = backups.cargar_indice()
+    assert versiones[-2]['tipo'] == 'base'
+    assert backups.reconstruir(versiones, len(versiones) - 2)['colegios'] == {
+        'liceo javier': 'Liceo Javier', 'colegio austriaco': 'Colegio Austriaco'}
+    assert backups.restaurar()[0] == leer_diccionario(tmp_path)
+    assert backups.verificar() == []
+
+
+def test_archivo_danado_se_restaura_del_backup(tmp_path, logger):
+    escribir_diccionario(tmp_path, {'colegios': {}})
+    manager = nuevo_manager(tmp_path, logger)
+    diccionario = manager.cargar_diccionario()
+    diccionario['colegios']['liceo javier'] = 'Liceo Javier'
+    manager.guardar_diccionario(diccionario)
+    guardado = leer_diccionario(tmp_path)
+
+    # Archivo a medio escribir
+    danado = (tmp_path / 'diccionario.json').read_bytes()[:-20]
+    (tmp_path / 'diccionario.json').write_bytes(danado)
+
+    manager = nuevo_manager(tmp_path, logger)
+    diccionario = manager.cargar_diccionario()
+    assert dict(diccionario['colegios']) == guardado['colegios']
+    assert any(mensaje.startswith('♻️ Diccionario restaurado del backup') for mensaje in logger.mensajes)
+
+    diccionario['colegios']['colegio el roble'] = 'Colegio El Roble'
+    manager.guardar_diccionario(diccionario)
+
+    assert leer_diccionario(tmp_path)['colegios'] == {'liceo javier': 'Liceo Javier', 'colegio el roble': 'Colegio El Roble'}
+    assert (tmp_path / 'diccionario.json.danado').read_bytes() == danado
+    backups = BackupsDiccionario(str(tmp_path / 'backups'), logger)
+    assert backups.restaurar()[0] == leer_diccionario(tmp_path)
+    assert backups.verificar() == []
+
+
+def test_archivo_danado_sin_backup_no_se_sobrescribe(tmp_path, logger):
+    (tmp_path / 'diccionario.json').write_text('{\n  "colegios": {\n    "liceo', encoding='utf-8')
+
+    manager = nuevo_manager(tmp_path, logger)
+    diccionario = manager.cargar_diccionario()
+    assert len(diccionario['colegios']) == 0
+    diccionario['colegios']['colegio el roble'] = 'Colegio El Roble'
+    manager.guardar_diccionario(diccionario)
+
+    assert (tmp_path / 'diccionario.json').read_text(encoding='utf-8') == '{\n  "colegios": {\n    "liceo'
+    with open(tmp_path / 'diccionario.json.nuevo', encoding='utf-8') as f:
+        assert json.load(f)['colegios'] == {'colegio el roble': 'Colegio El Roble'}
+    assert any(mensaje.startswith('❌') for mensaje in logger.mensajes)
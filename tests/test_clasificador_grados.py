@@ -0,0 +1,57 @@
+"""
+test_clasificador_grados.py
+Grados vacíos y números sin contexto del clasificador de grados
+"""
+
+import pandas as pd
+
+from src import clasificador_grados, config
+from src.clasificador_grados import ClasificadorGrados
+
+
+def nuevo_diccionario():
+    return {'grados': {}}
+
+
+def test_vacio_sin_validacion_es_sin_especificar(logger):
+    clasificador = ClasificadorGrados(config, logger)
+    # Con la respuesta de los vacíos guardada: sin validación no se lee
+    diccionario = {'grados': {'(vacío)': '4to. Diversificado'}}
+
+    for vacio in (None, '', '   ', float('nan')):
+        assert clasificador.normalizar(vacio, diccionario, [], modo_validacion=False) == 'Sin especificar'
+
+
+def test_vacio_con_validacion_pregunta_una_vez_y_se_guarda(logger, monkeypatch):
+    preguntas = []
+
+    def validar(grado, opciones, registro):
+        preguntas.append(grado)
+        return '1ro. Básico'
+
+    monkeypatch.setattr(clasificador_grados, 'validar_grado_manual', validar)
+    clasificador = ClasificadorGrados(config, logger)
+    diccionario = nuevo_diccionario()
+    normalizaciones = []
+
+    serie = clasificador.normalizar_serie(pd.Series(['', None, '  ']), diccionario, normalizaciones)
+    assert list(serie) == ['1ro. Básico'] * 3
+    assert clasificador.normalizar('', diccionario, normalizaciones) == '1ro. Básico'
+
+    assert preguntas == ['(vacío)']
+    assert diccionario == {'grados': {'(vacío)': '1ro. Básico'}}
+    assert normalizaciones == ['Grado: (vacío) → 1ro. Básico']
+    assert clasificador.normalizar('', diccionario, [], modo_validacion=False) == 'Sin especificar'
+
+    # Otra ejecución sobre el mismo diccionario no vuelve a preguntar
+    otro = ClasificadorGrados(config, logger)
+    assert otro.normalizar(None, diccionario, [], modo_validacion=True) == '1ro. Básico'
+    assert preguntas == ['(vacío)']
+
+
+def test_numero_sin_contexto_conserva_el_mensaje(logger, monkeypatch):
+    monkeypatch.setattr(clasificador_grados, 'validar_grado_manual', lambda grado, opciones, registro: '2do. Básico')
+    clasificador = ClasificadorGrados(config, logger)
+
+    assert clasificador.normalizar('2', nuevo_diccionario(), []) == '2do. Básico'
+    assert "⚠️ Número 2 sin contexto - solicitando clasificación manual" in logger.mensajes
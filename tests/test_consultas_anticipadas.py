@@ -0,0 +1,66 @@
+"""
+test_consultas_anticipadas.py
+Consultas a Claude de los colegios: una llamada que falla no deja el texto
+crudo en el diccionario, ni anticipada ni hecha en su turno
+"""
+
+import pytest
+
+from src import config
+from src.consultas_anticipadas import ConsultasAnticipadas
+from src.normalizador import NormalizadorLeads
+
+
+class ClienteCaido:
+    """Cliente de Anthropic cuya API siempre falla"""
+
+    def __init__(self):
+        self.llamadas = 0
+        self.messages = self
+
+    def create(self, **kwargs):
+        self.llamadas += 1
+        raise ConnectionError('API no disponible')
+
+
+@pytest.fixture
+def normalizador(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config, 'API_KEY', None)
+    normalizador = NormalizadorLeads()
+    normalizador.normalizador_claude.client = ClienteCaido()
+    yield normalizador
+    normalizador.logger.cerrar()
+
+
+@pytest.mark.parametrize('hilos', [None, 0, 2])
+def test_fallo_de_claude_no_se_guarda(normalizador, hilos):
+    colegio = 'Academia Xq Zeta'
+    anticipadas = None
+    if hilos is not None:
+        anticipadas = ConsultasAnticipadas(normalizador.normalizador_claude, normalizador.validadores,
+                                           normalizador.logger, hilos)
+        anticipadas.iniciar([colegio], normalizador.diccionario['colegios'])
+    normalizador.normalizar_colegios_unicos([colegio], False, anticipadas)
+
+    # Las filas del mismo colegio no vuelven a llamar a la API
+    assert normalizador.normalizar_colegio(colegio, modo_validacion=False) == colegio
+    assert normalizador.normalizador_claude.client.llamadas == 1
+    assert colegio not in normalizador.diccionario['colegios']
+    assert normalizador.normalizaciones_nuevas == []
+    assert normalizador.metricas.valor('claude_errores') == 1
+
+
+def test_sin_anticipar_por_defecto_ni_con_profile(normalizador, monkeypatch):
+    # Por defecto la etapa 'Resolución anticipada' no se declara
+    assert config.CLAUDE_HILOS == 0
+    assert not normalizador.conviene_anticipar(1)
+
+    monkeypatch.setattr(config, 'CLAUDE_HILOS', 4)
+    assert normalizador.conviene_anticipar(1)
+
+    normalizador.instrumentacion.perfil_dir = config.PERFIL_DIR
+    assert not normalizador.conviene_anticipar(1)
+    anticipadas = normalizador.anticipar_colegios(['Academia Xq Zeta'])
+    assert anticipadas.consultas == {}
+    assert normalizador.normalizador_claude.client.llamadas == 0
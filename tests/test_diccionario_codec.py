@@ -0,0 +1,82 @@
+"""
+test_diccionario_codec.py
+Ida y vuelta del formato del diccionario, carga perezosa de secciones y
+primera carga concurrente
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.diccionario_codec import DiccionarioPerezoso, serializar_diccionario, ubicar_secciones
+from src.seccion_diccionario import SeccionDiccionario
+
+
+CONTENIDO = {
+    'colegios': {'liceo javier': 'Liceo Javier', 'colegio san josé': 'Colegio San José', 'a "b"': 'c\\nd'},
+    'grados': {},
+    'urls': {'https://uvgbridge.gt/eventos/': 'Maestrías'},
+    'formularios': {'Form Ñandú': 'Licenciatura en Diseño'},
+}
+
+
+def json_dump(contenido):
+    return json.dumps(contenido, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def abrir(datos, fabrica=SeccionDiccionario):
+    return DiccionarioPerezoso(datos, ubicar_secciones(datos), fabrica)
+
+
+def test_serializar_igual_que_json_dump():
+    assert serializar_diccionario(CONTENIDO) == json_dump(CONTENIDO)
+    assert serializar_diccionario({'colegios': {}}) == json_dump({'colegios': {}})
+
+
+def test_ida_y_vuelta_perezosa():
+    datos = json_dump(CONTENIDO)
+    diccionario = abrir(datos)
+
+    # Sin tocar nada sale el mismo archivo, sin cargar ninguna sección
+    assert serializar_diccionario(diccionario) == datos
+    assert diccionario.secciones == {}
+    assert [diccionario.cantidad(nombre) for nombre in diccionario] == [3, 0, 1, 1]
+
+    diccionario['colegios']['colegio el roble'] = 'Colegio El Roble'
+    del diccionario['urls']['https://uvgbridge.gt/eventos/']
+    esperado = json.loads(datos)
+    esperado['colegios']['colegio el roble'] = 'Colegio El Roble'
+    esperado['urls'] = {}
+
+    assert serializar_diccionario(diccionario) == json_dump(esperado)
+    assert set(diccionario.secciones) == {'colegios', 'urls'}
+    assert diccionario.bytes_originales('formularios') == json_dump(CONTENIDO['formularios']).replace(b'\n', b'\n  ')
+
+
+def test_formato_no_reconocido_se_parsea_completo():
+    assert ubicar_secciones(json_dump(CONTENIDO).replace(b'\n', b'\r\n')) is None
+    assert ubicar_secciones(json.dumps(CONTENIDO).encode('utf-8')) is None
+
+
+def test_primera_carga_concurrente_una_sola_vez():
+    cargas = []
+
+    def fabrica(nombre, entradas):
+        cargas.append(nombre)
+        time.sleep(0.01)
+        return SeccionDiccionario(nombre, entradas)
+
+    diccionario = abrir(json_dump(CONTENIDO), fabrica)
+    inicio = threading.Barrier(8)
+
+    def leer(_):
+        inicio.wait()
+        return diccionario['colegios']
+
+    with ThreadPoolExecutor(max_workers=8) as hilos:
+        secciones = list(hilos.map(leer, range(8)))
+
+    assert cargas == ['colegios']
+    assert all(seccion is secciones[0] for seccion in secciones)
+    assert dict(secciones[0]) == CONTENIDO['colegios']
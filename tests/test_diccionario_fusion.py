@@ -0,0 +1,95 @@
+"""
+test_diccionario_fusion.py
+Dos ejecuciones que guardan el mismo diccionario: merge-on-write con fusionar
+"""
+
+import json
+
+from src.backups_diccionario import BackupsDiccionario
+from src.diccionario_manager import DiccionarioManager
+
+
+def nuevo_manager(carpeta, logger):
+    return DiccionarioManager(str(carpeta / 'diccionario.json'), str(carpeta / 'backups'), logger)
+
+
+def escribir_diccionario(carpeta, contenido):
+    with open(carpeta / 'diccionario.json', 'w', encoding='utf-8') as f:
+        json.dump(contenido, f, indent=2, ensure_ascii=False)
+
+
+def leer_diccionario(carpeta):
+    with open(carpeta / 'diccionario.json', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_dos_ejecuciones_conservan_los_cambios_de_ambas(tmp_path, logger):
+    escribir_diccionario(tmp_path, {
+        'colegios': {'liceo javier': 'Liceo Javier', 'colegio austriaco': 'Colegio Austriaco'},
+        'grados': {'4to bach': '4to. Diversificado'},
+        'urls': {'https://uvgbridge.gt/eventos/': 'Maestrías'},
+    })
+
+    # Las dos ejecuciones cargan el mismo archivo antes de que alguna guarde
+    manager_a, manager_b = nuevo_manager(tmp_path, logger), nuevo_manager(tmp_path, logger)
+    diccionario_a, diccionario_b = manager_a.cargar_diccionario(), manager_b.cargar_diccionario()
+
+    diccionario_a['colegios']['colegio el roble'] = 'Colegio El Roble'
+    diccionario_a['grados']['5to bach'] = '5to. Diversificado'
+    manager_a.guardar_diccionario(diccionario_a)
+
+    diccionario_b['colegios']['liceo guatemala'] = 'Liceo Guatemala'
+    del diccionario_b['colegios']['colegio austriaco']
+    manager_b.guardar_diccionario(diccionario_b)
+
+    assert "🔀 El diccionario cambió en disco desde la carga: combinando con los cambios de esta ejecución" in logger.mensajes
+    esperado = {
+        'colegios': {
+            'liceo javier': 'Liceo Javier',
+            'colegio el roble': 'Colegio El Roble',
+            'liceo guatemala': 'Liceo Guatemala',
+        },
+        'grados': {'4to bach': '4to. Diversificado', '5to bach': '5to. Diversificado'},
+        'urls': {'https://uvgbridge.gt/eventos/': 'Maestrías'},
+        'formularios': {},
+    }
+    assert leer_diccionario(tmp_path) == esperado
+
+    # La segunda ejecución ve en memoria lo que guardó la primera
+    assert dict(diccionario_b['colegios']) == esperado['colegios']
+    assert diccionario_b['colegios'].cambios == {}
+
+    # Los backups siguen la cadena aunque el archivo haya cambiado entre carga y guardado
+    backups = BackupsDiccionario(str(tmp_path / 'backups'), logger)
+    assert backups.restaurar()[0] == esperado
+    assert backups.verificar() == []
+
+
+def test_conflicto_conserva_el_valor_de_esta_ejecucion(tmp_path, logger):
+    escribir_diccionario(tmp_path, {'colegios': {'liceo javier': 'Liceo Javier'}})
+    manager_a, manager_b = nuevo_manager(tmp_path, logger), nuevo_manager(tmp_path, logger)
+    diccionario_a, diccionario_b = manager_a.cargar_diccionario(), manager_b.cargar_diccionario()
+
+    diccionario_a['colegios']['liceo javier'] = 'Liceo Javier Zona 16'
+    manager_a.guardar_diccionario(diccionario_a)
+    diccionario_b['colegios']['liceo javier'] = 'Liceo Javier Zona 1'
+    manager_b.guardar_diccionario(diccionario_b)
+
+    assert leer_diccionario(tmp_path)['colegios'] == {'liceo javier': 'Liceo Javier Zona 1'}
+    assert ("⚠️ Conflicto en colegios 'liceo javier': otra ejecución guardó 'Liceo Javier Zona 16', "
+            "se conserva 'Liceo Javier Zona 1'") in logger.mensajes
+
+
+def test_fusionar_sin_cambios_propios_no_toca_el_archivo(tmp_path, logger):
+    escribir_diccionario(tmp_path, {'colegios': {'liceo javier': 'Liceo Javier'}})
+    manager_a, manager_b = nuevo_manager(tmp_path, logger), nuevo_manager(tmp_path, logger)
+    diccionario_a, diccionario_b = manager_a.cargar_diccionario(), manager_b.cargar_diccionario()
+
+    diccionario_a['colegios']['colegio el roble'] = 'Colegio El Roble'
+    manager_a.guardar_diccionario(diccionario_a)
+    guardado_a = leer_diccionario(tmp_path)
+
+    # Solo leyó: no debe pisar lo que guardó la otra ejecución
+    diccionario_b['colegios'].get('liceo javier')
+    manager_b.guardar_diccionario(diccionario_b)
+    assert leer_diccionario(tmp_path) == guardado_a
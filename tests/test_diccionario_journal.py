@@ -0,0 +1,121 @@
+"""
+test_diccionario_journal.py
+Journal del diccionario: recuperación después de un corte, compactación al
+terminar y fsync por tandas
+"""
+
+import glob
+import json
+import os
+
+from src.diccionario_manager import DiccionarioManager
+
+
+def nuevo_manager(carpeta, logger, **kwargs):
+    return DiccionarioManager(str(carpeta / 'diccionario.json'), str(carpeta / 'backups'), logger,
+                              journal_file=str(carpeta / 'diccionario.journal'), **kwargs)
+
+
+def escribir_diccionario(carpeta, contenido):
+    with open(carpeta / 'diccionario.json', 'w', encoding='utf-8') as f:
+        json.dump(contenido, f, indent=2, ensure_ascii=False)
+
+
+def leer_diccionario(carpeta):
+    with open(carpeta / 'diccionario.json', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def journals(carpeta):
+    return glob.glob(str(carpeta / 'diccionario.journal*'))
+
+
+def simular_corte(manager):
+    """
+    La ejecución se corta sin guardar: el proceso suelta el bloqueo del journal
+    (y se renombra como si fuera de otro pid, que es lo que vería la próxima ejecución)
+    """
+    journal = manager.journal
+    journal.cerrar()
+    os.replace(journal.journal_file, journal.journal_base + '.99999')
+
+
+def test_corte_y_recuperacion(tmp_path, logger):
+    escribir_diccionario(tmp_path, {'colegios': {'liceo javier': 'Liceo Javier'}, 'grados': {}})
+
+    manager = nuevo_manager(tmp_path, logger)
+    diccionario = manager.cargar_diccionario()
+    diccionario['colegios']['colegio el roble'] = 'Colegio El Roble'
+    diccionario['colegios']['liceo javier'] = 'Liceo Javier Zona 16'
+    diccionario['grados']['4to bach'] = '4to. Diversificado'
+    del diccionario['colegios']['colegio el roble']
+    diccionario['colegios']['colegio austriaco'] = 'Colegio Austriaco'
+    simular_corte(manager)
+
+    # El archivo base sigue como estaba: lo nuevo solo está en el journal
+    assert leer_diccionario(tmp_path)['colegios'] == {'liceo javier': 'Liceo Javier'}
+
+    manager = nuevo_manager(tmp_path, logger)
+    diccionario = manager.cargar_diccionario()
+    assert dict(diccionario['colegios']) == {
+        'liceo javier': 'Liceo Javier Zona 16',
+        'colegio austriaco': 'Colegio Austriaco',
+    }
+    assert dict(diccionario['grados']) == {'4to bach': '4to. Diversificado'}
+    assert "♻️ Journal: 5 entradas recuperadas de una ejecución anterior" in logger.mensajes
+
+    # Al terminar bien se compacta todo en el archivo base y no queda journal
+    manager.guardar_diccionario(diccionario)
+    manager.journal.cerrar()
+    assert leer_diccionario(tmp_path)['colegios'] == {
+        'liceo javier': 'Liceo Javier Zona 16',
+        'colegio austriaco': 'Colegio Austriaco',
+    }
+    assert journals(tmp_path) == []
+
+
+def test_linea_a_medio_escribir_se_descarta(tmp_path, logger):
+    escribir_diccionario(tmp_path, {'colegios': {}})
+    manager = nuevo_manager(tmp_path, logger)
+    diccionario = manager.cargar_diccionario()
+    diccionario['colegios']['colegio el roble'] = 'Colegio El Roble'
+    simular_corte(manager)
+
+    with open(str(tmp_path / 'diccionario.journal.99999'), 'a', encoding='utf-8') as f:
+        f.write('{"s": "colegios", "k": "a medio')
+
+    diccionario = nuevo_manager(tmp_path, logger).cargar_diccionario()
+    assert dict(diccionario['colegios']) == {'colegio el roble': 'Colegio El Roble'}
+    with open(str(tmp_path / 'diccionario.journal.99999'), encoding='utf-8') as f:
+        assert f.read().endswith('"Colegio El Roble"}\n')
+
+
+def test_guardar_compacta_en_el_archivo_base(tmp_path, logger):
+    escribir_diccionario(tmp_path, {'colegios': {}})
+    manager = nuevo_manager(tmp_path, logger)
+    diccionario = manager.cargar_diccionario()
+    diccionario['colegios']['colegio el roble'] = 'Colegio El Roble'
+
+    manager.guardar_diccionario(diccionario)
+
+    assert leer_diccionario(tmp_path)['colegios'] == {'colegio el roble': 'Colegio El Roble'}
+    assert journals(tmp_path) == []
+
+
+def test_fsync_por_tandas(tmp_path, logger, monkeypatch):
+    llamadas = []
+    fsync = os.fsync
+    monkeypatch.setattr(os, 'fsync', lambda descriptor: (llamadas.append(descriptor), fsync(descriptor)))
+
+    escribir_diccionario(tmp_path, {'colegios': {}})
+    manager = nuevo_manager(tmp_path, logger, journal_fsync_entradas=100, journal_fsync_segundos=3600)
+    diccionario = manager.cargar_diccionario()
+    for i in range(250):
+        diccionario['colegios'][f'colegio {i}'] = f'Colegio {i}'
+
+    assert len(llamadas) == 2
+    assert manager.journal.sin_sincronizar == 50
+
+    manager.journal.sincronizar()
+    assert len(llamadas) == 3
+    manager.journal.cerrar()
@@ -0,0 +1,109 @@
+"""
+test_diccionario_sqlite.py
+Sección SQLite: recorrido con una sola consulta, cola incremental para el
+índice canónico y backup de la base al guardar
+"""
+
+import os
+import sqlite3
+
+import pytest
+
+from src.diccionario_manager import DiccionarioManager
+from src.diccionario_sqlite import DiccionarioSQLite, SeccionSQLite
+from src.indice_canonico import IndiceCanonico
+
+
+@pytest.fixture
+def almacen(tmp_path, logger):
+    almacen = DiccionarioSQLite(str(tmp_path / 'diccionario.db'), logger)
+    almacen.guardar_cambios({'colegios': {
+        'liceo javier zona 16': 'Liceo Javier',
+        'colegio el roble': 'Colegio El Roble',
+        'colegio austriaco': 'Colegio Austriaco',
+    }})
+    yield almacen
+    almacen.cerrar()
+
+
+def contar_consultas(almacen, monkeypatch):
+    """Cuenta las búsquedas puntuales y los recorridos completos de la base"""
+    consultas = {'obtener': 0, 'items': 0}
+    obtener, items = almacen.obtener, almacen.items
+
+    def contar_obtener(*args):
+        consultas['obtener'] += 1
+        return obtener(*args)
+
+    def contar_items(*args):
+        consultas['items'] += 1
+        return items(*args)
+
+    monkeypatch.setattr(almacen, 'obtener', contar_obtener)
+    monkeypatch.setattr(almacen, 'items', contar_items)
+    return consultas
+
+
+def test_items_con_una_sola_consulta(almacen, monkeypatch):
+    seccion = SeccionSQLite(almacen, 'colegios')
+    seccion['colegio el roble'] = 'El Roble'
+    seccion['colegio nuevo'] = 'Colegio Nuevo'
+    del seccion['colegio austriaco']
+    consultas = contar_consultas(almacen, monkeypatch)
+
+    assert list(seccion.items()) == [
+        ('colegio el roble', 'El Roble'),
+        ('liceo javier zona 16', 'Liceo Javier'),
+        ('colegio nuevo', 'Colegio Nuevo'),
+    ]
+    assert list(seccion) == [clave for clave, _ in seccion.items()]
+    assert len(seccion) == 3
+    assert consultas['obtener'] == 0
+
+
+def test_indice_solo_lee_las_claves_nuevas(almacen, monkeypatch):
+    seccion = SeccionSQLite(almacen, 'colegios')
+    indice = IndiceCanonico(seccion)
+    consultas = contar_consultas(almacen, monkeypatch)
+
+    for i in range(5):
+        seccion[f'instituto nuevo {i}'] = f'Instituto Nuevo {i}'
+        indice.actualizar(seccion)
+
+    assert consultas['items'] == 0
+    assert indice.contar_variantes('Instituto Nuevo 4') == 1
+    assert indice.mejor_match('instituto nuevo 4', umbral=88)[0] == 'Instituto Nuevo 4'
+
+
+def test_indice_se_reconstruye_si_cambia_un_valor(almacen):
+    seccion = SeccionSQLite(almacen, 'colegios')
+    indice = IndiceCanonico(seccion)
+
+    seccion['liceo javier zona 16'] = 'Liceo Javier Zona 16'
+    indice.actualizar(seccion)
+
+    assert indice.contar_variantes('Liceo Javier') == 0
+    assert indice.mejor_match('liceo javier zona 16', umbral=88)[0] == 'Liceo Javier Zona 16'
+
+
+def test_guardar_crea_un_backup_de_la_base(tmp_path, logger):
+    manager = DiccionarioManager(str(tmp_path / 'diccionario.json'), str(tmp_path / 'backups'), logger,
+                                 backend='sqlite', db_file=str(tmp_path / 'diccionario.db'))
+    diccionario = manager.cargar_diccionario()
+    diccionario['colegios']['liceo javier'] = 'Liceo Javier'
+    manager.guardar_diccionario(diccionario)
+
+    # Sin cambios no hay backup nuevo
+    manager.guardar_diccionario(diccionario)
+    diccionario['colegios']['colegio el roble'] = 'Colegio El Roble'
+    manager.guardar_diccionario(diccionario)
+
+    backups = sorted(os.listdir(tmp_path / 'backups'))
+    assert backups and all(nombre.startswith('diccionario_backup_') and nombre.endswith('.sqlite') for nombre in backups)
+
+    # El backup más reciente es la base antes del último guardado
+    copia = sqlite3.connect(tmp_path / 'backups' / backups[-1])
+    try:
+        assert copia.execute('SELECT clave, valor FROM colegios').fetchall() == [('liceo javier', 'Liceo Javier')]
+    finally:
+        copia.close()
@@ -0,0 +1,78 @@
+"""
+test_etapas.py
+Plan de etapas: orden de las dependencias, etapas del hilo principal y totales
+de la ejecución cuando las etapas corren a la vez
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.etapas import HILOS, PRINCIPAL, PlanEtapas
+from src.instrumentacion import Instrumentacion
+
+
+def plan_diamante(plan, registro):
+    """
+    a -> b, c -> d (b y c en paralelo) y e, del hilo principal, que depende de b
+    """
+    def etapa(nombre, demora):
+        def correr(*previos):
+            registro.append(('inicio', nombre, threading.current_thread() is threading.main_thread()))
+            time.sleep(demora)
+            registro.append(('fin', nombre, None))
+            return nombre + ''.join(previos)
+        return correr
+
+    plan.agregar('a', etapa('a', 0.02))
+    plan.agregar('b', etapa('b', 0.05), depende=['a'])
+    plan.agregar('c', etapa('c', 0.01), depende=['a'])
+    plan.agregar('d', etapa('d', 0.0), depende=['c', 'b'])
+    plan.agregar('e', etapa('e', 0.0), depende=['b'], en=PRINCIPAL)
+
+
+@pytest.mark.parametrize('hilos', [0, 4])
+def test_cada_etapa_arranca_despues_de_sus_dependencias(logger, hilos):
+    registro = []
+    plan = PlanEtapas(Instrumentacion(logger), hilos=hilos)
+    plan_diamante(plan, registro)
+
+    resultados = plan.ejecutar()
+
+    # Cada etapa recibe los resultados de sus dependencias en el orden de depende
+    assert resultados == {'a': 'a', 'b': 'ba', 'c': 'ca', 'd': 'dcaba', 'e': 'eba'}
+    posicion = {(evento, nombre): i for i, (evento, nombre, _) in enumerate(registro)}
+    for etapa in plan.etapas:
+        for dependencia in etapa.depende:
+            assert posicion[('fin', dependencia)] < posicion[('inicio', etapa.nombre)]
+
+    en_principal = {nombre: principal for evento, nombre, principal in registro if evento == 'inicio'}
+    assert en_principal['e']
+    if hilos:
+        assert not any(en_principal[nombre] for nombre in 'abcd')
+
+
+def test_dependencia_no_declarada(logger):
+    plan = PlanEtapas(Instrumentacion(logger))
+    plan.agregar('a', lambda: None)
+    with pytest.raises(ValueError):
+        plan.agregar('b', lambda a: None, depende=['c'])
+    with pytest.raises(ValueError):
+        plan.agregar('a', lambda: None)
+
+
+def test_total_de_la_ejecucion_no_suma_etapas_concurrentes(logger):
+    instrumentacion = Instrumentacion(logger)
+    plan = PlanEtapas(instrumentacion, hilos=4)
+    for nombre in 'abcd':
+        plan.agregar(nombre, time.sleep, 0.1, en=HILOS)
+
+    instrumentacion.iniciar_ejecucion()
+    plan.ejecutar()
+    total = instrumentacion.terminar_ejecucion(filas=10)
+
+    suma = sum(etapa.reloj for etapa in instrumentacion.etapas)
+    assert suma >= 0.4
+    assert 0.1 <= total.reloj < suma
+    assert instrumentacion.totales() == (total.reloj, total.cpu, total.espera)
@@ -0,0 +1,86 @@
+"""
+test_form_mapper.py
+Mapeo de formularios: misma precedencia que el recorrido en orden de
+MAPEO_FORMULARIOS, formularios de bridge y caché de aciertos y fallos
+"""
+
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+from src import config
+from src.form_mapper import FormMapper
+
+
+# Claves que se solapan entre sí y dentro del texto del formulario
+MAPEO_SOLAPADO = {
+    'form lic marketing digital': 'Maestrías',
+    'lic marketing': 'International Marketing and Business Analytics',
+    'marketing digital': 'Comunicación Estratégica',
+    'form lic': 'Administración de Empresas',
+    'ing dig': 'Ciencia de la Administración',
+}
+
+
+def mapeo_secuencial(form_str, mapeo):
+    """Recorrido original: la primera clave del config contenida en el formulario"""
+    for clave, carrera in mapeo.items():
+        if clave in form_str:
+            return carrera
+    return None
+
+
+def formularios_combinados(mapeo):
+    """Formularios con una, dos o tres claves, en todos los órdenes y pegadas o separadas"""
+    claves = list(mapeo)
+    for cantidad in (1, 2, 3):
+        for combinacion in itertools.permutations(claves, cantidad):
+            for separador in (' ', ' - ', ''):
+                yield 'webinar ' + separador.join(combinacion) + ' 2025'
+
+
+@pytest.mark.parametrize('mapeo', [MAPEO_SOLAPADO, config.MAPEO_FORMULARIOS])
+def test_varias_carreras_gana_el_orden_del_config(logger, mapeo):
+    mapper = FormMapper(SimpleNamespace(MAPEO_FORMULARIOS=mapeo), logger)
+
+    for form_str in formularios_combinados(mapeo):
+        assert mapper.buscar_en_mapeo(form_str) == mapeo_secuencial(form_str, mapeo), form_str
+    assert mapper.buscar_en_mapeo('formulario sin carrera') is None
+
+
+def test_bridge_sin_clave_no_pregunta(logger, monkeypatch):
+    mapper = FormMapper(config, logger)
+    monkeypatch.setattr(mapper, 'preguntar_carrera_form', lambda *args: pytest.fail('no debe preguntar'))
+    diccionario = {}
+
+    assert mapper.mapear_form_a_carrera('Form UVG Bridge Eventos', diccionario, [], modo_interactivo=True) is None
+    # Con una clave del mapeo la carrera gana aunque sea de bridge
+    assert mapper.mapear_form_a_carrera('Form Lic Marketing UVG Bridge', diccionario, [], modo_interactivo=True) == \
+        'International Marketing and Business Analytics'
+    assert diccionario == {'formularios': {'form lic marketing uvg bridge': 'International Marketing and Business Analytics'}}
+
+
+def test_fallo_en_cache_igual_que_una_busqueda_nueva(logger, monkeypatch):
+    mapper = FormMapper(config, logger)
+    formularios = ['Formulario Desconocido', 'Form UVG Bridge Eventos', 'Form Lic Administracion Junio']
+
+    for form in formularios:
+        mapper.mapear_form_a_carrera(form, {}, [], modo_interactivo=False)
+
+    preguntas = []
+    monkeypatch.setattr(mapper, 'preguntar_carrera_form', lambda form, diccionario, nuevos: preguntas.append(form) or 'Maestrías')
+    nuevo = FormMapper(config, logger)
+    monkeypatch.setattr(nuevo, 'preguntar_carrera_form', lambda form, diccionario, nuevos: preguntas.append(form) or 'Maestrías')
+
+    for form in formularios:
+        for modo_interactivo in (False, True):
+            en_cache = mapper.mapear_form_a_carrera(form, {}, [], modo_interactivo=modo_interactivo)
+            sin_cache = nuevo.mapear_form_a_carrera(form, {}, [], modo_interactivo=modo_interactivo)
+            nuevo.cache.clear()
+            assert en_cache == sin_cache, (form, modo_interactivo)
+
+    # Solo el formulario desconocido pregunta, tanto desde la caché como sin ella
+    assert preguntas == ['Formulario Desconocido'] * 2
+    aciertos = mapper.metricas.valor('cache_consultas', nivel='formularios_clasificacion', resultado='acierto')
+    assert aciertos == 2 * len(formularios)
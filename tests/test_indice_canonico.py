@@ -0,0 +1,137 @@
+"""
+test_indice_canonico.py
+Índice inverso del fuzzy match: mismas coincidencias que la búsqueda original
+contra todas las claves, y sincronización cuando cambia un valor existente
+"""
+
+import random
+import string
+
+from rapidfuzz import fuzz
+
+from src.indice_canonico import IndiceCanonico
+from src.seccion_diccionario import SeccionDiccionario
+
+
+UMBRAL = 88
+
+
+def fuzzy_original(texto, seccion):
+    """fuzzy_match anterior al índice: compara contra todas las claves"""
+    texto_limpio = texto.strip().lower()
+    mejor_match = None
+    mejor_score = 0
+    for key in seccion:
+        score = fuzz.ratio(texto_limpio, key.lower())
+        if score > mejor_score:
+            mejor_score = score
+            mejor_match = key
+    if mejor_score > UMBRAL:
+        return seccion[mejor_match]
+    return None
+
+
+def fuzzy_indice(texto, seccion, indice):
+    """Mismo resultado que Validadores.fuzzy_match con el índice"""
+    indice.actualizar(seccion)
+    match = indice.mejor_match(texto.strip().lower(), umbral=UMBRAL)
+    if match is None:
+        return None
+    canonico, variante, _ = match
+    return seccion.get(variante, canonico) if variante is not None else canonico
+
+
+def nombre_aleatorio(azar):
+    """Nombre de colegio inventado (poco parecido a los demás)"""
+    palabras = [''.join(azar.choices(string.ascii_lowercase, k=azar.randint(4, 9))) for _ in range(3)]
+    return 'colegio ' + ' '.join(palabras)
+
+
+def con_error(texto, azar):
+    """Texto con una letra cambiada (typo)"""
+    posicion = azar.randrange(len('colegio '), len(texto))
+    return texto[:posicion] + ('x' if texto[posicion] != 'x' else 'y') + texto[posicion + 1:]
+
+
+def test_variantes_despues_de_la_25_siguen_encontrandose():
+    azar = random.Random(26)
+    variantes = [nombre_aleatorio(azar) for _ in range(40)]
+    seccion = SeccionDiccionario('colegios', {variante: 'Colegio Canónico' for variante in variantes})
+    indice = IndiceCanonico(seccion)
+
+    for variante in variantes:
+        assert fuzzy_indice(con_error(variante, azar), seccion, indice) == 'Colegio Canónico'
+
+
+def test_mismas_coincidencias_que_la_busqueda_original():
+    azar = random.Random(2026)
+    canonicos = [f"Colegio {i}" for i in range(30)] + ['Otro']
+    entradas = {nombre_aleatorio(azar): azar.choice(canonicos) for _ in range(600)}
+    seccion = SeccionDiccionario('colegios', entradas)
+    indice = IndiceCanonico(seccion)
+
+    for clave, valor in entradas.items():
+        consulta = con_error(clave, azar)
+        original = fuzzy_original(consulta, entradas)
+        # 'Otro' dejó de ser destino de un fuzzy match (a propósito)
+        esperado = None if original == 'Otro' else original
+        assert fuzzy_indice(consulta, seccion, indice) == esperado, clave
+
+
+def test_reasignar_una_clave_actualiza_el_indice():
+    seccion = SeccionDiccionario('colegios', {
+        'colegio san jose de calasanz': 'Colegio San José',
+        'liceo javier zona 16': 'Liceo Javier',
+    })
+    indice = IndiceCanonico(seccion)
+    assert fuzzy_indice('colegio san jose de calasans', seccion, indice) == 'Colegio San José'
+
+    # Corrección manual: la variante pasa a otro canónico
+    seccion['colegio san jose de calasanz'] = 'Colegio Calasanz'
+
+    assert fuzzy_indice('colegio san jose de calasans', seccion, indice) == 'Colegio Calasanz'
+    assert indice.contar_variantes('Colegio San José') == 0
+    assert indice.contar_variantes('Colegio Calasanz') == 1
+    # El nombre canónico viejo ya no es destino de ningún match
+    assert fuzzy_indice('colegio san josé', seccion, indice) is None
+
+
+def test_eliminar_una_clave_actualiza_el_indice():
+    seccion = SeccionDiccionario('colegios', {
+        'colegio la salle antigua': 'Colegio La Salle',
+        'liceo javier zona 16': 'Liceo Javier',
+    })
+    indice = IndiceCanonico(seccion)
+    assert fuzzy_indice('colegio la sale antigua', seccion, indice) == 'Colegio La Salle'
+
+    del seccion['colegio la salle antigua']
+
+    assert fuzzy_indice('colegio la sale antigua', seccion, indice) is None
+    assert fuzzy_indice('liceo javier zona 15', seccion, indice) == 'Liceo Javier'
+
+
+def test_claves_nuevas_se_indexan_sin_reconstruir():
+    seccion = SeccionDiccionario('colegios', {'liceo javier zona 16': 'Liceo Javier'})
+    indice = IndiceCanonico(seccion)
+    candidatos = indice.candidatos
+
+    seccion['colegio el roble zona 10'] = 'Colegio El Roble'
+
+    assert fuzzy_indice('colegio el roble zona 11', seccion, indice) == 'Colegio El Roble'
+    assert indice.candidatos is candidatos
+
+
+def test_los_nombres_canonicos_se_comparan_antes_que_las_variantes():
+    seccion = SeccionDiccionario('colegios', {
+        'liceo javier z16': 'Liceo Javier',
+        'colegio javiera': 'Colegio Javiera Carrera',
+    })
+    indice = IndiceCanonico(seccion)
+    assert indice.nombres == ['liceo javier', 'colegio javiera carrera']
+    assert indice.candidatos == ['liceo javier z16', 'colegio javiera']
+
+    # Supera el umbral contra un nombre canónico: no se miran las variantes
+    assert indice.mejor_match('liceo javierr', umbral=UMBRAL)[:2] == ('Liceo Javier', None)
+
+    # Ningún nombre canónico alcanza: gana la variante
+    assert indice.mejor_match('colegio javierra', umbral=UMBRAL)[:2] == ('Colegio Javiera Carrera', 'colegio javiera')
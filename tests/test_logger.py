@@ -0,0 +1,57 @@
+"""
+test_logger.py
+Niveles por defecto del logger, modo silencioso y errores de formato en el hilo escritor
+"""
+
+from src import config
+from src.logger import Logger
+
+
+def leer(ruta):
+    with open(ruta, encoding='utf-8') as f:
+        return f.read()
+
+
+def test_por_defecto_la_consola_solo_muestra_info(tmp_path, capsys):
+    logger = Logger(str(tmp_path / 'ejecucion.log'), nivel=config.LOG_NIVEL, nivel_consola=config.LOG_NIVEL_CONSOLA)
+    logger.debug("🔍 Colegio '%s' → %s", 'liceo javier', 'Liceo Javier')
+    logger.log("✅ Leído: 1 leads")
+    logger.cerrar()
+
+    assert capsys.readouterr().out == "✅ Leído: 1 leads\n"
+    contenido = leer(tmp_path / 'ejecucion.log')
+    assert "DEBUG 🔍 Colegio 'liceo javier' → Liceo Javier" in contenido
+    assert "✅ Leído: 1 leads" in contenido
+
+
+def test_error_de_formato_no_detiene_el_hilo_escritor(tmp_path):
+    logger = Logger(str(tmp_path / 'ejecucion.log'), nivel='DEBUG', nivel_consola='INFO')
+    logger.debug("Colegio %s → %s", 'liceo javier')
+    logger.debug("Grado %d", 'cuarto')
+    logger.log("✅ Después del error")
+    logger.flush()
+
+    assert logger.hilo.is_alive()
+    contenido = leer(tmp_path / 'ejecucion.log')
+    assert "⚠️ Error al formatear mensaje de log (not enough arguments for format string): " \
+           "'Colegio %s → %s' % ('liceo javier',)" in contenido
+    assert "'Grado %d' % ('cuarto',)" in contenido
+    assert "✅ Después del error" in contenido
+    logger.cerrar()
+
+
+def test_modo_silencioso_solo_avisos_en_consola(tmp_path, capsys):
+    logger = Logger(str(tmp_path / 'ejecucion.log'), nivel='DEBUG', nivel_consola='INFO')
+    assert logger.silenciar()
+    logger.log("🏫 Normalizando colegios...")
+    logger.debug("🔍 Colegio '%s' → %s", 'liceo javier', 'Liceo Javier')
+    logger.log("⚠️ No se encontró First Page Seen")
+    logger.restaurar_consola()
+    logger.log("📊 Resumen")
+    logger.cerrar()
+
+    assert capsys.readouterr().out == "⚠️ No se encontró First Page Seen\n📊 Resumen\n"
+    contenido = leer(tmp_path / 'ejecucion.log')
+    for linea in ("🏫 Normalizando colegios...", "DEBUG 🔍 Colegio 'liceo javier' → Liceo Javier",
+                  "⚠️ No se encontró First Page Seen", "📊 Resumen"):
+        assert linea in contenido
@@ -0,0 +1,30 @@
+"""
+test_metricas.py
+Contadores del registro de métricas actualizados desde varios hilos
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from src.metricas import RegistroMetricas
+
+
+def test_contadores_desde_varios_hilos():
+    metricas = RegistroMetricas()
+    registrar_fallo, registrar_acierto = metricas.nivel_cache('diccionario')
+
+    def trabajar(_):
+        for _ in range(20000):
+            registrar_acierto()
+        registrar_fallo()
+        metricas.incrementar('claude_tokens', 150, tipo='entrada')
+
+    with ThreadPoolExecutor(max_workers=8) as hilos:
+        list(hilos.map(trabajar, range(8)))
+
+    assert metricas.valor('cache_consultas', nivel='diccionario', resultado='acierto') == 160000
+    assert metricas.valor('cache_consultas', nivel='diccionario', resultado='fallo') == 8
+    assert metricas.valor('claude_tokens', tipo='entrada') == 1200
+
+    # Leer no cambia el valor
+    assert metricas.valores_contadores() == metricas.valores_contadores()
+    assert metricas.valor('claude_llamadas') == 0
@@ -0,0 +1,24 @@
+"""
+test_regresion.py
+Micro-benchmarks de regresión (benchmarks/bench_regresion.py) contra las
+líneas base de lineas_base.json. Opcional: solo corre con --regresion
+"""
+
+import pytest
+
+from benchmarks import bench_regresion
+
+
+@pytest.mark.regresion
+def test_sin_regresiones_contra_las_lineas_base():
+    lineas_base = bench_regresion.cargar_lineas_base().get('casos', {})
+    nombres = [nombre for nombre in bench_regresion.CASOS if nombre in lineas_base]
+    assert nombres, f"No hay líneas base en {bench_regresion.LINEAS_BASE_FILE}"
+
+    _, comparacion, _ = bench_regresion.verificar(nombres)
+
+    regresiones = {
+        nombre: f"x{ratio:.2f}" for nombre, (_, _, ratio) in comparacion.items()
+        if ratio > bench_regresion.TOLERANCIA
+    }
+    assert regresiones == {}
@@ -0,0 +1,131 @@
+"""
+test_resolucion_paralela.py
+Resolución local de colegios en procesos: mismo resultado que en serie,
+continuación del fuzzy match desde el resultado anticipado y una sola
+resolución por colegio aunque la sección cambie
+"""
+
+import random
+import string
+
+import pytest
+
+from src import config
+from src.consultas_anticipadas import ConsultasAnticipadas
+from src.normalizador import NormalizadorLeads
+from src.resolucion_paralela import resolver_en_procesos, resolver_en_serie
+from src.seccion_diccionario import SeccionDiccionario
+from src.validadores import Validadores
+
+
+def nombre_aleatorio(azar):
+    """Nombre de colegio inventado que no cae en ninguna regla del config"""
+    palabras = [''.join(azar.choices(string.ascii_lowercase, k=azar.randint(5, 9))) for _ in range(3)]
+    return 'academia ' + ' '.join(palabras)
+
+
+def con_error(texto, azar):
+    """Texto con una letra cambiada (typo)"""
+    posicion = azar.randrange(len('academia '), len(texto))
+    return texto[:posicion] + ('x' if texto[posicion] != 'x' else 'y') + texto[posicion + 1:]
+
+
+@pytest.fixture
+def datos():
+    """Sección chica y colegios que caen en cada camino: diccionario, reglas, fuzzy y sin resolver"""
+    azar = random.Random(48)
+    nombres = [nombre_aleatorio(azar) for _ in range(20)]
+    seccion = SeccionDiccionario('colegios', {nombre: f"Academia {i}" for i, nombre in enumerate(nombres)})
+    colegios = (
+        nombres[:3]
+        + [con_error(nombre, azar) for nombre in nombres[3:12]]
+        + [nombre_aleatorio(azar) for _ in range(6)]
+        + ['Liceo Xq Zeta', 'Universidad Rafael Landívar', 'ninguno', 'Ingeniería en Sistemas']
+    )
+    return azar, seccion, colegios
+
+
+def test_procesos_y_serie_dan_lo_mismo(datos):
+    _, seccion, colegios = datos
+
+    en_procesos = resolver_en_procesos(colegios, seccion, 2)
+    en_serie = resolver_en_serie(colegios, seccion)
+
+    assert list(en_procesos) == colegios
+    assert en_procesos == en_serie
+    # Hay de todo: ya en la sección, resueltos por reglas, por fuzzy y pendientes
+    assert any(local is None for local in en_serie.values())
+    assert any(local is not None and local[1] is not None for local in en_serie.values())
+    assert any(local is not None and local[2][0] is not None for local in en_serie.values())
+    assert any(ConsultasAnticipadas.sin_resolver(local) for local in en_serie.values())
+
+
+def test_el_fuzzy_continua_desde_el_resultado_anticipado(datos, logger):
+    azar, seccion, colegios = datos
+    pendientes = colegios[12:18]
+    locales = resolver_en_procesos(pendientes, dict(seccion), 2)
+
+    # Después de anticipar se agregan entradas: variantes de la mitad de los pendientes
+    for i, colegio in enumerate(pendientes[:3]):
+        seccion[con_error(colegio, azar)] = f"Academia nueva {i}"
+    diccionario = {'colegios': seccion}
+
+    validadores = Validadores(config, logger)
+    validadores.obtener_indice('colegios', dict(seccion))
+    for colegio in pendientes:
+        desde_previo = validadores.fuzzy_match(colegio, 'colegios', diccionario, previo=locales[colegio][2])
+        completo = Validadores(config, logger).fuzzy_match(colegio, 'colegios', diccionario)
+        assert desde_previo == completo, colegio
+    assert [validadores.fuzzy_match(c, 'colegios', diccionario) for c in pendientes[:3]] == [
+        f"Academia nueva {i}" for i in range(3)
+    ]
+
+
+def test_una_sola_resolucion_por_colegio_aunque_cambie_la_seccion(datos, logger, monkeypatch):
+    _, seccion, colegios = datos
+    validadores = Validadores(config, logger)
+    anticipadas = ConsultasAnticipadas(None, validadores, logger, 0)
+    anticipadas.iniciar(colegios, seccion, procesos=2, min_paralelo=1)
+    assert "⚙️ Resolución local en 2 procesos" in logger.mensajes
+
+    reglas = []
+    monkeypatch.setattr(validadores, 'clasificar_colegio', lambda colegio: reglas.append(colegio))
+    assert anticipadas.local('Liceo Xq Zeta')[:2] == ('Liceo Xq Zeta', 'patron_colegio')
+
+    # Cambia un valor existente: el fuzzy anticipado se descarta, las reglas no se repiten
+    seccion[colegios[0]] = 'Academia renombrada'
+    for colegio in colegios:
+        local = anticipadas.local(colegio)
+        assert local is None or local[2] is None
+    assert anticipadas.local('Liceo Xq Zeta')[:2] == ('Liceo Xq Zeta', 'patron_colegio')
+    assert reglas == []
+
+
+def test_normalizador_con_procesos_igual_que_en_serie(datos, tmp_path, monkeypatch):
+    _, seccion, colegios = datos
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config, 'API_KEY', None)
+    monkeypatch.setattr(config, 'COLEGIOS_PROCESOS', 2)
+    monkeypatch.setattr(config, 'COLEGIOS_MIN_PARALELO', 1)
+
+    resultados = []
+    for procesos in (None, 0):
+        normalizador = NormalizadorLeads(procesos=procesos)
+        assert normalizador.procesos == (2 if procesos is None else 0)
+        try:
+            normalizador.diccionario['colegios'].update(seccion)
+            # Igual que el plan de procesar_leads: sin pool ni Claude no hay etapa anticipada
+            anticipar = normalizador.conviene_anticipar(len(colegios))
+            assert anticipar == (procesos is None)
+            anticipadas = normalizador.anticipar_colegios(colegios) if anticipar else None
+            normalizador.normalizar_colegios_unicos(colegios, False, anticipadas)
+            resultados.append((
+                dict(normalizador.diccionario['colegios']),
+                list(normalizador.normalizaciones_nuevas),
+                normalizador.metricas.total('colegios_resueltos', metodo='fuzzy_match'),
+            ))
+        finally:
+            normalizador.logger.cerrar()
+
+    en_procesos, en_serie = resultados
+    assert en_procesos == en_serie
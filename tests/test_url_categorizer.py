@@ -0,0 +1,90 @@
+"""
+test_url_categorizer.py
+Categorías de URLs iguales a la implementación original y claves canónicas
+solo para el diccionario
+"""
+
+import copy
+
+import pytest
+
+from src import config
+from src.url_categorizer import URLCategorizer
+from benchmarks.corpus import generar_urls
+from benchmarks.referencia import categorizar_url_referencia
+
+
+@pytest.mark.parametrize('url', [
+    'https://uvgbridge.gt/?utm_content=lic-marketing',
+    'https://uvgbridge.gt/comunicacion',
+    'https://uvgbridge.gt/#maestria',
+    'https://uvgbridge.gt/?hsa_src=form_uvg_bridge',
+    'https://uvgbridge.gt/lp?_hsenc=licenciatura-marketing',
+    'https://www.uvgbridge.gt/?utm_source=facebook',
+])
+def test_patrones_sobre_la_url_original(url, logger):
+    categorizador = URLCategorizer(config, logger)
+    esperado = categorizar_url_referencia(url, {'urls': {}}, config)
+    assert categorizador.categorizar_url(url, {'urls': {}}, [], modo_interactivo=False) == esperado
+
+
+def test_mismas_categorias_que_la_referencia_en_el_corpus(logger):
+    categorizador = URLCategorizer(config, logger)
+    diccionario_referencia = {'urls': {}}
+    diccionario = {'urls': {}}
+
+    for url in generar_urls(5000):
+        esperado = categorizar_url_referencia(url, diccionario_referencia, config)
+        assert categorizador.categorizar_url(url, diccionario, [], modo_interactivo=False) == esperado, url
+
+
+def test_respuesta_manual_compartida_entre_variantes_de_tracking(logger, monkeypatch):
+    categorizador = URLCategorizer(config, logger)
+    diccionario = {'urls': {}}
+    respuestas = iter(['5'])
+    monkeypatch.setattr('src.url_categorizer.pedir_entrada', lambda mensaje='': next(respuestas))
+    monkeypatch.setattr('builtins.print', lambda *args, **kwargs: None)
+
+    url = 'https://uvgbridge.gt/eventos?utm_source=facebook'
+    assert categorizador.categorizar_url(url, diccionario, [], modo_interactivo=True) == 'Maestrías'
+    assert diccionario['urls'] == {'https://uvgbridge.gt/eventos/': 'Maestrías'}
+
+    # Otra variante de tracking de la misma página: sale del diccionario, sin preguntar
+    variante = 'https://www.uvgbridge.gt/eventos/?utm_medium=cpc&fbclid=abc#inicio'
+    assert categorizador.categorizar_url(variante, diccionario, [], modo_interactivo=True) == 'Maestrías'
+
+
+def test_migracion_al_consultar_el_diccionario(logger):
+    categorizador = URLCategorizer(config, logger)
+    diccionario = {'urls': {
+        'https://www.uvgbridge.gt/eventos?utm_source=x': 'Maestrías',
+        'https://uvgbridge.gt/eventos/': 'Maestrías',
+    }}
+
+    # Una URL resuelta por patrón no necesita la sección de URLs
+    categorizador.categorizar_url('https://uvgbridge.gt/maestria', diccionario, [], modo_interactivo=False)
+    assert len(diccionario['urls']) == 2
+
+    original = copy.deepcopy(diccionario)
+    assert categorizador.categorizar_url('https://uvgbridge.gt/eventos', diccionario, [], modo_interactivo=False) == 'Maestrías'
+    assert diccionario['urls'] == {'https://uvgbridge.gt/eventos/': 'Maestrías'}
+    assert original != diccionario
+
+
+def test_migracion_descarta_las_entradas_que_resuelve_un_patron(logger):
+    categorizador = URLCategorizer(config, logger)
+    # Dos URLs de la misma página (misma clave canónica): la primera la guardó
+    # una versión anterior con el resultado del patrón, la segunda es manual
+    diccionario = {'urls': {
+        'https://uvgbridge.gt/eventos?utm_content=lic-marketing': 'International Marketing and Business Analytics',
+        'https://uvgbridge.gt/eventos?utm_source=fb': 'Maestrías',
+    }}
+
+    assert categorizador.categorizar_url('https://uvgbridge.gt/eventos', diccionario, [], modo_interactivo=False) == 'Maestrías'
+    assert diccionario['urls'] == {'https://uvgbridge.gt/eventos/': 'Maestrías'}
+    assert not any(mensaje.startswith('⚠️ Conflicto') for mensaje in logger.mensajes)
+
+    # La URL con patrón sigue saliendo del patrón, no de la clave colapsada
+    url = 'https://uvgbridge.gt/eventos?utm_content=lic-marketing'
+    assert categorizador.categorizar_url(url, diccionario, [], modo_interactivo=False) == \
+        'International Marketing and Business Analytics'